@@ -3,12 +3,14 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers.root_app import router as root_router
 from app.routers.health_check import router as health_check_router
+from app.utils.extraction_pool import extraction_pool
+from app.utils.logging_config import configure_logging
 import logging
 import uvicorn
 
 
-# Configuration des logs
-logging.basicConfig(level=logging.INFO)
+# Configuration des logs (LOG_LEVEL, LOG_FORMAT, LOG_LEVELS, LOG_ASYNC)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -32,6 +34,10 @@ app.add_middleware(
 app.include_router(root_router, prefix="/api", tags=["Fournisseurs"])
 app.include_router(health_check_router, prefix="/api", tags=["Health"])
 
+@app.on_event("shutdown")
+def shutdown_extraction_pool():
+    extraction_pool.shutdown(wait=False)
+
 @app.get("/")
 def root():
     return {"message": "Bienvenue dans l'API de gestion des Packing Lists"}
\ No newline at end of file
@@ -1,77 +1,71 @@
-from fastapi import APIRouter, UploadFile, HTTPException, Depends
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, HTTPException, Depends, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
+import asyncio
+import logging
 import os
+import shutil
+import time
 import uuid
-import pandas as pd
-from fastapi import File, Form
-from ..services.southern_fruit_alliance.southern_fruit_alliance_service import SFAService
-from ..services.sunny.sunny_service import SunnyService
-from ..services.safpro.safpro_service import SafproService
-from ..services.alg.alg_service import AlgService
-from ..services.langplaas.langplaas_service import LangplaasService
-from ..services.athos.athos_service import AthosService
-from ..services.athosv2.athosv2_service import AthosV2Service
-from ..services.asica.asica_service import AsicaService
-from ..services.laran.laran_service import LaranService
-from ..services.angon.angon_service import AngonService
-from ..services.gh.gh_service import GHService
-from ..services.cpf.cpf_service import CpfService
-from ..services.unifruitti.unifruitti_service import UnifruittiService
-from ..services.jaguacy.jaguacy_service import JaguacyService
-from ..services.sasini.sasini_service import SasiniService
-from ..services.mavuno.mavuno_service import MavunoService
-from ..services.jorie.jorie_service import JorieService
-from ..services.kakuzi.kakuzi_service import KakuziService
-from ..services.viru.viru_service import ViruService
-from ..services.hnp.hnp_service import HnpService
-from ..services.swellen.swellen_service import SwellenService
-from ..services.shalimar.shalimar_service import ShalimarService
-from ..services.ingophase.ingophase_service import IngophaseService
-
-
+from urllib.parse import quote
+from typing import Dict, List, Optional
+from fastapi import File, Form, Header
+from starlette.concurrency import run_in_threadpool
+from ..utils.csv_editor import CSVEditor, CSVPatchError, CSVVersionMismatchError, DEFAULT_KEY_COLUMN, replace_file
+from ..utils.extraction_pool import extraction_pool, PoolSaturatedError
+from ..utils.extraction_registry import extraction_registry, track_progress
+from ..utils.file_handler import save_upload_stream, UploadTooLargeError
+from ..utils.http_cache import (
+    CACHE_CONTROL, MIN_COMPRESS_SIZE, compressed_chunks, etag_matches, negotiate_encoding, representation_etag,
+)
+from ..utils.metrics import metrics, CONTENT_TYPE, instrument_service, observe_stage, timed_extraction
+from ..utils.result_cache import result_cache
+from ..utils.supplier_registry import SupplierRegistry
+from ..utils.zip_stream import bundle_entries, stream_zip
+
+
+logger = logging.getLogger(__name__)
 router = APIRouter()
 OUTPUT_DIR = "/outputs" 
 BASE_EXPORT_DIR = os.getenv("EXPORT_DIR", "outputs")  # configurable depuis .env
-
-extraction_records = {}
-
-FOURNISSEURS_SUPPORTES = {
-    "Komati": SFAService,
-    "Grosa": SFAService,
-    "ZestFruit": SFAService,
-    "Mahela": SFAService,
-    "Sunny": SunnyService,
-    "Safpro": SafproService,
-    "ALG": AlgService,
-    "Langplaas": LangplaasService,
-    "Exportadora Fruticola Athos": AthosService,
-    "Exportadora Fruticola Athos V2": AthosV2Service,
-    "Asica": AsicaService,
-    "Laran": LaranService,
-    "Jaguacy": JaguacyService,
-    "Angon": AngonService,
-    "Agualima": AsicaService,
-    "Camposol": AsicaService,
-    "CPF": CpfService,
-    "Mosqueta": UnifruittiService,
-    "Pirona": UnifruittiService,
-    "Hefei": UnifruittiService,
-    "Sasini": SasiniService,
-    "Mavuno": MavunoService,
-    "Jorie": JorieService,
-    "Kakuzi": KakuziService,
-    "Viru": ViruService,
-    "Avaleza": ViruService,
-    "HNP": HnpService,
-    "Swellen" : SwellenService,
-    "Shalimar" : ShalimarService,
-    "Ingophase" : IngophaseService,
-    "Mountain Avocado" : JaguacyService,
-}
-
-# Dictionnaire pour stocker temporairement les paramètres CSV
-csv_settings_store = {}
+# Classeurs reçus, le temps de leur extraction (supprimés ensuite, voir _remove_upload)
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join("data", "uploads"))
+
+
+# Services chargés à la demande (voir SupplierRegistry)
+FOURNISSEURS_SUPPORTES = SupplierRegistry({
+    "Komati": "app.services.southern_fruit_alliance.southern_fruit_alliance_service.SFAService",
+    "Grosa": "app.services.southern_fruit_alliance.southern_fruit_alliance_service.SFAService",
+    "ZestFruit": "app.services.southern_fruit_alliance.southern_fruit_alliance_service.SFAService",
+    "Mahela": "app.services.southern_fruit_alliance.southern_fruit_alliance_service.SFAService",
+    "Sunny": "app.services.sunny.sunny_service.SunnyService",
+    "Safpro": "app.services.safpro.safpro_service.SafproService",
+    "ALG": "app.services.alg.alg_service.AlgService",
+    "Langplaas": "app.services.langplaas.langplaas_service.LangplaasService",
+    "Exportadora Fruticola Athos": "app.services.athos.athos_service.AthosService",
+    "Exportadora Fruticola Athos V2": "app.services.athosv2.athosv2_service.AthosV2Service",
+    "Asica": "app.services.asica.asica_service.AsicaService",
+    "Laran": "app.services.laran.laran_service.LaranService",
+    "Jaguacy": "app.services.jaguacy.jaguacy_service.JaguacyService",
+    "Angon": "app.services.angon.angon_service.AngonService",
+    "Agualima": "app.services.asica.asica_service.AsicaService",
+    "Camposol": "app.services.asica.asica_service.AsicaService",
+    "CPF": "app.services.cpf.cpf_service.CpfService",
+    "Mosqueta": "app.services.unifruitti.unifruitti_service.UnifruittiService",
+    "Pirona": "app.services.unifruitti.unifruitti_service.UnifruittiService",
+    "Hefei": "app.services.unifruitti.unifruitti_service.UnifruittiService",
+    "Sasini": "app.services.sasini.sasini_service.SasiniService",
+    "Mavuno": "app.services.mavuno.mavuno_service.MavunoService",
+    "Jorie": "app.services.jorie.jorie_service.JorieService",
+    "Kakuzi": "app.services.kakuzi.kakuzi_service.KakuziService",
+    "Viru": "app.services.viru.viru_service.ViruService",
+    "Avaleza": "app.services.viru.viru_service.ViruService",
+    "HNP": "app.services.hnp.hnp_service.HnpService",
+    "Swellen" : "app.services.swellen.swellen_service.SwellenService",
+    "Shalimar" : "app.services.shalimar.shalimar_service.ShalimarService",
+    "Ingophase" : "app.services.ingophase.ingophase_service.IngophaseService",
+    "Mountain Avocado" : "app.services.jaguacy.jaguacy_service.JaguacyService",
+})
 
 class CSVSettings(BaseModel):
     country_of_origin: str
@@ -84,8 +78,8 @@ async def save_csv_settings(settings: CSVSettings):
     """
     Enregistre les paramètres CSV envoyés par le front.
     """
-    csv_settings_store["settings"] = settings.dict()
-    print("📌 Paramètres CSV enregistrés après correction :", csv_settings_store["settings"]) 
+    extraction_registry.save_settings(settings.dict())
+    print("📌 Paramètres CSV enregistrés après correction :", settings.dict())
     return {"message": "Paramètres enregistrés avec succès"}
 
 
@@ -94,78 +88,408 @@ async def get_csv_settings():
     """
     Récupère les paramètres CSV enregistrés.
     """
-    if "settings" not in csv_settings_store:
+    settings = extraction_registry.get_settings()
+    if settings is None:
         raise HTTPException(status_code=404, detail="Aucun paramètre trouvé")
-    return csv_settings_store["settings"]
+    return settings
+
+
+@router.get("/suppliers/import-report/")
+async def get_import_report(preload: bool = False):
+    """
+    Rapport de chargement des services fournisseurs.
+    - preload=true : importe tous les services avant le rapport (durée d'import de chacun)
+    Le coût de démarrage de l'API (python -X importtime) se mesure en ligne de commande :
+    `python -m app.utils.supplier_registry`.
+    """
+    return await run_in_threadpool(FOURNISSEURS_SUPPORTES.import_report, preload)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Métriques des extractions au format texte Prometheus : durées et volumes par fournisseur
+    et par étape (upload, prepare, group, extract, write, container).
+    """
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
+def run_extraction(fournisseur, file_location, output_dir, settings=None, extraction_id=None):
+    """
+    Instancie le service du fournisseur et traite le fichier.
+    Exécutée dans le pool d'extraction (thread ou process), hors de la boucle asyncio.
+    Si `extraction_id` est fourni, le statut et la progression sont suivis dans le registre.
+    """
+    service_class = FOURNISSEURS_SUPPORTES[fournisseur]()
+    instrument_service(service_class, fournisseur)
+
+    if settings is not None:
+        # Copie : certains services modifient le dictionnaire reçu (pop)
+        service_class.apply_csv_settings(dict(settings))
+        service_class.csv_settings["Fournisseur"] = fournisseur
+
+    if extraction_id is not None:
+        extraction_registry.update(extraction_id, status="running")
+        track_progress(service_class, extraction_registry, extraction_id)
+
+    with timed_extraction(fournisseur):
+        return service_class.process_file(file_location, output_dir)
+
+
+def rerender_extraction(fournisseur, generated_files, settings, extraction_id=None, shared_files=()):
+    """
+    Applique de nouveaux paramètres CSV aux fichiers d'une extraction terminée, sans relire le classeur :
+    seules les colonnes issues des paramètres (`SETTINGS_COLUMNS` du service) sont réécrites.
+    Les paramètres sont validés et adaptés par le service du fournisseur, comme pour une extraction.
+
+    Un fichier de `shared_files` (servi aussi à une autre extraction ou par le cache de résultats)
+    n'est pas modifié : il est d'abord copié dans `{dossier}/{extraction_id}/`, et la copie est réécrite.
+    Retourne {fichier: {"etag", "updated_rows", "updated_cells"}}, avec les chemins éventuellement copiés.
+    """
+    service_class = FOURNISSEURS_SUPPORTES[fournisseur]()
+    service_class.apply_csv_settings(dict(settings))
+
+    empty_values = getattr(service_class, "SETTINGS_EMPTY_VALUES", ())
+    values = {}
+    for column in service_class.SETTINGS_COLUMNS:
+        value = service_class.csv_settings.get(column)
+        if value is not None:
+            values[column] = "" if value in empty_values else value
+
+    results = {}
+    for file_path in generated_files:
+        if file_path in shared_files:
+            own_path = os.path.join(os.path.dirname(file_path), extraction_id, os.path.basename(file_path))
+            os.makedirs(os.path.dirname(own_path), exist_ok=True)
+            shutil.copyfile(file_path, own_path)
+            print(f"📄 {file_path} partagé : copie réécrite dans {own_path}")
+            file_path = own_path
+        results[file_path] = CSVEditor.fill_columns(file_path, values)
+    return results
+
+
+async def _save_upload(file, file_location, fournisseur):
+    """
+    Enregistre le fichier reçu sur disque (hors boucle asyncio) et mesure l'étape "upload".
+    """
+    start = time.perf_counter()
+    saved = await run_in_threadpool(save_upload_stream, file, file_location)
+    observe_stage(fournisseur, "upload", time.perf_counter() - start, size=saved[2])
+    return saved
+
+
+def _remove_upload(upload_dir):
+    """
+    Supprime le dossier d'un envoi une fois son extraction terminée : seuls les CSV générés sont conservés.
+    """
+    shutil.rmtree(upload_dir, ignore_errors=True)
+
+
+def _finalize_job(extraction_id, future, fournisseur=None, cache_key=None, upload_dir=None):
+    """
+    Enregistre le résultat d'une extraction asynchrone terminée et supprime le classeur reçu.
+    Exécutée hors de la boucle asyncio (registre, cache de résultats et disque).
+    """
+    if upload_dir is not None:
+        _remove_upload(upload_dir)
+
+    if future.cancelled():
+        extraction_registry.update(extraction_id, status="failed", error="Extraction annulée.")
+        return
+
+    error = future.exception()
+    if error is not None:
+        print(f"❌ Extraction {extraction_id} en échec : {error}")
+        extraction_registry.update(extraction_id, status="failed", error=str(error))
+        return
+
+    generated_files = future.result()
+    if not isinstance(generated_files, list):
+        print(f"❌ ERREUR: `generated_files` n'est pas une liste valide pour {extraction_id} !")
+        extraction_registry.update(extraction_id, status="failed", error="Erreur interne: format des fichiers invalides.")
+        return
+
+    extraction_registry.update(extraction_id, status="done", generated_files=generated_files)
+    if cache_key is not None:
+        result_cache.store(cache_key, fournisseur, generated_files)
+    print(f"✅ Extraction {extraction_id} terminée : {generated_files}")
+
+
+def _lookup_cached_extraction(extraction_id, fournisseur, settings, file_sha256, file_size):
+    """
+    Même classeur, même fournisseur, mêmes paramètres : enregistre l'extraction comme terminée
+    avec les CSV déjà générés. Retourne (cache_key, fichiers en cache ou None).
+    Requêtes SQLite et os.stat par fichier : à appeler hors de la boucle asyncio (run_in_threadpool).
+    """
+    cache_key = result_cache.make_key(file_sha256, fournisseur, settings)
+    cached_files = result_cache.lookup(cache_key)
+    if cached_files is not None:
+        extraction_registry.create(
+            extraction_id, fournisseur, status="done", generated_files=cached_files,
+            file_sha256=file_sha256, file_size=file_size, cached=True,
+        )
+        print(f"♻️ Extraction {extraction_id} servie depuis le cache : {cached_files}")
+    return cache_key, cached_files
+
+
+async def _run_recorded_extraction(extraction_id, fournisseur, file_location, output_dir, settings,
+                                   cache_key, file_sha256, file_size, wait_for_slot=False):
+    """
+    Exécute une extraction dans le pool en attendant son résultat, et la trace dans le registre.
+    Avec `wait_for_slot`, attend une place libre au lieu de lever PoolSaturatedError.
+    Le registre et le cache de résultats (purge, éviction) sont mis à jour hors de la boucle asyncio.
+    """
+    await run_in_threadpool(
+        extraction_registry.create,
+        extraction_id, fournisseur, status="running", file_sha256=file_sha256, file_size=file_size,
+    )
+    run = extraction_pool.run_when_available if wait_for_slot else extraction_pool.run
+    try:
+        generated_files = await run(run_extraction, fournisseur, file_location, output_dir, settings)
+    except PoolSaturatedError:
+        extraction_registry.delete(extraction_id)
+        raise
+    except Exception as e:
+        extraction_registry.update(extraction_id, status="failed", error=str(e))
+        raise
+
+    # ✅ Vérifie que `generated_files` est bien une liste
+    if not isinstance(generated_files, list):
+        print("❌ ERREUR: `generated_files` n'est pas une liste valide !")
+        extraction_registry.update(extraction_id, status="failed", error="Format des fichiers invalides.")
+        raise HTTPException(status_code=500, detail="Erreur interne: format des fichiers invalides.")
+
+    # ✅ Stocker les fichiers avec leur extraction_id
+    await run_in_threadpool(_record_generated_files, extraction_id, fournisseur, cache_key, generated_files)
+    return generated_files
+
+
+def _record_generated_files(extraction_id, fournisseur, cache_key, generated_files):
+    """
+    Marque l'extraction comme terminée et met ses fichiers en cache (éviction LRU comprise).
+    """
+    extraction_registry.update(
+        extraction_id, status="done", generated_files=generated_files,
+        progress={"done": len(generated_files), "total": len(generated_files)},
+    )
+    result_cache.store(cache_key, fournisseur, generated_files)
+
+
+def _shared_files(extraction_id, generated_files):
+    """
+    Fichiers de l'extraction également listés par une autre extraction ou servis par le cache de résultats
+    (parcours complet du registre et du cache : à appeler hors de la boucle asyncio).
+    """
+    shared = extraction_registry.referenced_files(exclude=extraction_id) | result_cache.cached_files()
+    return shared.intersection(generated_files)
+
 
 @router.post("/archives-file/{fournisseur}/")
-async def process_file(fournisseur: str, file: UploadFile):
-    """Traite un fichier et génère un identifiant d’extraction unique."""
+async def process_file(fournisseur: str, file: UploadFile, mode: str = "sync"):
+    """
+    Traite un fichier et génère un identifiant d’extraction unique.
+    - mode=sync  : attend la fin de l'extraction et retourne les fichiers générés
+    - mode=async : retourne immédiatement l'extraction_id (statut via /get-extraction-files/{id}/)
+    """
     print(f"📂 Requête reçue pour extraction - Fournisseur : {fournisseur}")
 
     if fournisseur not in FOURNISSEURS_SUPPORTES:
         raise HTTPException(status_code=400, detail=f"Fournisseur '{fournisseur}' non pris en charge.")
 
+    if mode not in ("sync", "async"):
+        raise HTTPException(status_code=400, detail=f"Mode '{mode}' invalide (sync ou async).")
+
+    upload_dir, remove_upload = None, True
     try:
-        os.makedirs("archives", exist_ok=True)
+        # ✅ Générer un identifiant unique pour l’extraction
+        extraction_id = str(uuid.uuid4())
 
-        file_location = f"archives/{file.filename}"
-        with open(file_location, "wb") as buffer:
-            buffer.write(file.file.read())
-        print(f"📥 Fichier enregistré à {file_location}")
+        # Un sous-dossier par extraction : deux envois simultanés d'un fichier de même nom
+        # ne s'écrasent pas (l'extraction lit exactement le fichier dont le SHA-256 a été calculé)
+        upload_dir = os.path.join(UPLOAD_DIR, extraction_id)
+        file_location = os.path.join(upload_dir, os.path.basename(file.filename))
+        _, file_sha256, file_size = await _save_upload(file, file_location, fournisseur)
+        print(f"📥 Fichier enregistré à {file_location} ({file_size} octets, sha256={file_sha256})")
 
         output_dir = "outputs/"
         os.makedirs(output_dir, exist_ok=True)
 
-        service_class = FOURNISSEURS_SUPPORTES[fournisseur]()
-        
-        if "settings" in csv_settings_store:
-            service_class.apply_csv_settings(csv_settings_store["settings"])
-            service_class.csv_settings["Fournisseur"] = fournisseur
-
-        
-        # ✅ Générer un identifiant unique pour l’extraction
-        extraction_id = str(uuid.uuid4())
+        settings = extraction_registry.get_settings()
+
+        cache_key, cached_files = await run_in_threadpool(
+            _lookup_cached_extraction, extraction_id, fournisseur, settings, file_sha256, file_size
+        )
+        if cached_files is not None:
+            return {
+                "extraction_id": extraction_id,
+                "status": "done",
+                "cached": True,
+                "message": f"Extraction terminée pour {fournisseur} (cache).",
+                "generated_files": cached_files
+            }
+
+        if mode == "async":
+            await run_in_threadpool(
+                extraction_registry.create, extraction_id, fournisseur, file_sha256=file_sha256, file_size=file_size
+            )
+            try:
+                future = extraction_pool.submit(
+                    run_extraction, fournisseur, file_location, output_dir, settings, extraction_id
+                )
+            except PoolSaturatedError:
+                extraction_registry.delete(extraction_id)
+                raise
+            loop = asyncio.get_running_loop()
+            future.add_done_callback(lambda f: loop.run_in_executor(
+                None, _finalize_job, extraction_id, f, fournisseur, cache_key, upload_dir
+            ))
+            # Le classeur est supprimé par _finalize_job, à la fin de l'extraction
+            remove_upload = False
+
+            print(f"🕒 Extraction {extraction_id} mise en file d'attente")
+            return JSONResponse(status_code=202, content={
+                "extraction_id": extraction_id,
+                "status": "queued",
+                "message": f"Extraction en file d'attente pour {fournisseur}.",
+            })
 
         # ✅ Traitement du fichier et récupération des fichiers générés
-        generated_files = service_class.process_file(file_location, output_dir)
-
-        # ✅ Vérifie que `generated_files` est bien une liste
-        if not isinstance(generated_files, list):
-            print("❌ ERREUR: `generated_files` n'est pas une liste valide !")
-            raise HTTPException(status_code=500, detail="Erreur interne: format des fichiers invalides.")
-
-        # ✅ Stocker les fichiers avec leur extraction_id
-        extraction_records[extraction_id] = generated_files
+        generated_files = await _run_recorded_extraction(
+            extraction_id, fournisseur, file_location, output_dir, settings,
+            cache_key, file_sha256, file_size,
+        )
 
         print(f"✅ Extraction ID enregistré : {extraction_id}")
-        print(f"✅ Fichiers associés : {extraction_records[extraction_id]}")
+        print(f"✅ Fichiers associés : {generated_files}")
 
         return {
             "extraction_id": extraction_id,
             "message": f"Extraction terminée pour {fournisseur}.",
-            "generated_files": extraction_records[extraction_id]
+            "generated_files": generated_files
         }
 
+    except UploadTooLargeError as e:
+        print(f"❌ {e}")
+        raise HTTPException(status_code=413, detail=str(e))
+
+    except PoolSaturatedError as e:
+        print(f"⏳ {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
     except Exception as e:
         print(f"❌ Erreur: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur lors du traitement du fichier : {str(e)}")
- 
-    
+
+    finally:
+        if remove_upload and upload_dir is not None:
+            await run_in_threadpool(_remove_upload, upload_dir)
+
+
+@router.post("/archives-batch/")
+async def process_batch(files: List[UploadFile] = File(...), fournisseurs: List[str] = Form(...)):
+    """
+    Traite un lot de fichiers en parallèle dans le pool d'extraction.
+    `fournisseurs[i]` est le fournisseur de `files[i]`. Chaque fichier obtient son propre
+    extraction_id ; un échec n'interrompt pas le reste du lot.
+    """
+    print(f"📦 Requête reçue pour un lot de {len(files)} fichier(s)")
+
+    if len(files) != len(fournisseurs):
+        raise HTTPException(
+            status_code=400,
+            detail=f"{len(files)} fichier(s) pour {len(fournisseurs)} fournisseur(s) : un fournisseur par fichier attendu.",
+        )
+
+    batch_id = str(uuid.uuid4())
+    # Un sous-dossier par lot : deux fournisseurs peuvent envoyer des fichiers de même nom
+    batch_dir = os.path.join(UPLOAD_DIR, f"batch_{batch_id}")
+    output_dir = "outputs/"
+    os.makedirs(output_dir, exist_ok=True)
+    settings = extraction_registry.get_settings()
+
+    async def process_one(index, file, fournisseur):
+        result = {
+            "filename": file.filename,
+            "fournisseur": fournisseur,
+            "extraction_id": None,
+            "status": "failed",
+            "cached": False,
+            "generated_files": [],
+            "error": None,
+        }
+        try:
+            if fournisseur not in FOURNISSEURS_SUPPORTES:
+                raise ValueError(f"Fournisseur '{fournisseur}' non pris en charge.")
+
+            file_location = os.path.join(batch_dir, f"{index:03d}_{os.path.basename(file.filename)}")
+            _, file_sha256, file_size = await _save_upload(file, file_location, fournisseur)
+
+            extraction_id = str(uuid.uuid4())
+            result["extraction_id"] = extraction_id
+            cache_key, generated_files = await run_in_threadpool(
+                _lookup_cached_extraction, extraction_id, fournisseur, settings, file_sha256, file_size
+            )
+            result["cached"] = generated_files is not None
+
+            if generated_files is None:
+                # Au plus extraction_pool.background_limit extractions de lots à la fois, tous lots confondus
+                generated_files = await _run_recorded_extraction(
+                    extraction_id, fournisseur, file_location, output_dir, settings,
+                    cache_key, file_sha256, file_size, wait_for_slot=True,
+                )
+
+            result["status"] = "done"
+            result["generated_files"] = generated_files
+        except HTTPException as e:
+            result["error"] = e.detail
+        except Exception as e:
+            result["error"] = str(e)
+
+        if result["error"]:
+            print(f"❌ Lot {batch_id} - {file.filename} ({fournisseur}) : {result['error']}")
+        return result
+
+    try:
+        results = await asyncio.gather(
+            *(process_one(index, file, fournisseur) for index, (file, fournisseur) in enumerate(zip(files, fournisseurs)))
+        )
+    finally:
+        await run_in_threadpool(_remove_upload, batch_dir)
+    failed = sum(1 for result in results if result["status"] == "failed")
+    print(f"✅ Lot {batch_id} terminé : {len(results) - failed} succès, {failed} échec(s)")
+
+    return {
+        "batch_id": batch_id,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
 @router.get("/get-extraction-files/{extraction_id}/")
 async def get_extraction_files(extraction_id: str):
     """
-    Retourne la liste des fichiers générés pour une extraction spécifique.
+    Retourne le statut (queued/running/done/failed), la progression par container
+    et la liste des fichiers générés pour une extraction spécifique.
     """
-    if extraction_id not in extraction_records:
+    record = extraction_registry.get(extraction_id)
+    if record is None:
         print(f"❌ Aucun fichier trouvé pour extraction_id={extraction_id}")
         raise HTTPException(status_code=404, detail="Aucun fichier trouvé pour cet extraction_id.")
 
     # 🔹 Supprime un éventuel double préfixe "/outputs/" en normalisant les chemins
-    normalized_files = [os.path.relpath(f, start="outputs") for f in extraction_records[extraction_id]]
+    normalized_files = [os.path.relpath(f, start="outputs") for f in record["generated_files"]]
 
     print(f"📡 Fichiers trouvés pour extraction_id={extraction_id}: {normalized_files}")
-    return {"extraction_id": extraction_id, "files": normalized_files}
+    return {
+        "extraction_id": extraction_id,
+        "status": record["status"],
+        "progress": record["progress"],
+        "error": record["error"],
+        "timings": {key: record.get(key) for key in ("created_at", "started_at", "finished_at", "duration")},
+        "files": normalized_files,
+    }
 
 
 
@@ -174,14 +498,21 @@ async def get_csv(extraction_id: str):
     print(f"📌 DEBUG API: Requête reçue pour extraction_id={extraction_id}")
 
     # ✅ Vérifie que l'extraction_id existe
-    if extraction_id not in extraction_records:
+    record = extraction_registry.get(extraction_id)
+    if record is None:
         print(f"❌ Aucun fichier trouvé pour extraction_id={extraction_id}")
         raise HTTPException(status_code=404, detail="Aucun fichier trouvé.")
 
-    # ✅ Vérifie que `extraction_records[extraction_id]` est une liste non vide
-    csv_files = extraction_records[extraction_id]
-    if not csv_files or not isinstance(csv_files, list):
-        print(f"❌ ERREUR: `extraction_records[{extraction_id}]` est vide ou mal formaté.")
+    if record["status"] in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Extraction en cours ({record['status']}).")
+
+    if record["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Extraction en échec : {record['error']}")
+
+    # ✅ Vérifie que la liste des fichiers est non vide
+    csv_files = record["generated_files"]
+    if not csv_files:
+        print(f"❌ ERREUR: aucun fichier enregistré pour extraction_id={extraction_id}.")
         raise HTTPException(status_code=500, detail="Erreur interne: aucune liste de fichiers disponible.")
 
     print(f"✅ DEBUG: Fichiers retournés pour extraction_id={extraction_id}: {csv_files}")
@@ -190,11 +521,101 @@ async def get_csv(extraction_id: str):
 
 
 
+@router.get("/extractions/{extraction_id}/bundle.zip")
+async def download_bundle(extraction_id: str):
+    """
+    📦 Télécharge en une seule requête tous les fichiers générés d'une extraction,
+    dans une archive ZIP (deflate) produite à la volée pendant l'envoi.
+    """
+    record = extraction_registry.get(extraction_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Aucun fichier trouvé pour cet extraction_id.")
+
+    if record["status"] in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Extraction en cours ({record['status']}).")
+
+    if record["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Extraction en échec : {record['error']}")
+
+    generated_files = record["generated_files"]
+    if not generated_files:
+        raise HTTPException(status_code=404, detail="Aucun fichier généré pour cette extraction.")
+
+    missing = [f for f in generated_files if not os.path.isfile(f)]
+    if missing:
+        print(f"❌ Fichiers introuvables pour extraction_id={extraction_id}: {missing}")
+        raise HTTPException(status_code=410, detail=f"Fichier(s) supprimé(s) depuis l'extraction : {missing}")
+
+    print(f"📦 Archive de {len(generated_files)} fichier(s) pour extraction_id={extraction_id}")
+    return StreamingResponse(
+        stream_zip(bundle_entries(generated_files, BASE_EXPORT_DIR)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="extraction_{extraction_id}.zip"'},
+    )
+
+
+@router.post("/extractions/{extraction_id}/rerender")
+async def rerender_extraction_files(extraction_id: str, settings: CSVSettings):
+    """
+    Corrige les paramètres CSV (pays d'origine, transitaire...) d'une extraction terminée sans renvoyer
+    le classeur : les colonnes concernées sont réécrites dans les CSV existants, le reste est inchangé.
+    Retourne le nouvel ETag de chaque fichier.
+    """
+    record = extraction_registry.get(extraction_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Aucun fichier trouvé pour cet extraction_id.")
+
+    if record["status"] in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Extraction en cours ({record['status']}).")
+
+    if record["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Extraction en échec : {record['error']}")
+
+    generated_files = record["generated_files"]
+    if not generated_files:
+        raise HTTPException(status_code=404, detail="Aucun fichier généré pour cette extraction.")
+
+    missing = [f for f in generated_files if not os.path.isfile(f)]
+    if missing:
+        print(f"❌ Fichiers introuvables pour extraction_id={extraction_id}: {missing}")
+        raise HTTPException(status_code=410, detail=f"Fichier(s) supprimé(s) depuis l'extraction : {missing}")
+
+    # Fichiers d'un succès du cache : partagés avec l'extraction d'origine et l'entrée du cache
+    shared_files = await run_in_threadpool(_shared_files, extraction_id, generated_files)
+
+    start = time.perf_counter()
+    try:
+        results = await run_in_threadpool(
+            rerender_extraction, record["fournisseur"], generated_files, settings.dict(),
+            extraction_id, shared_files,
+        )
+    except ValueError as e:
+        # Paramètres refusés par le service (champ obligatoire vide...)
+        raise HTTPException(status_code=400, detail=str(e))
+    duration = time.perf_counter() - start
+    observe_stage(record["fournisseur"], "rerender", duration,
+                  rows=sum(result["updated_rows"] for result in results.values()))
+
+    extraction_registry.update(extraction_id, settings=settings.dict(), generated_files=list(results))
+    print(f"🔁 Extraction {extraction_id} : {len(results)} fichier(s) réécrit(s) en {duration:.3f} s")
+    return {
+        "extraction_id": extraction_id,
+        "settings": settings.dict(),
+        "files": results,
+        "duration": round(duration, 4),
+    }
+
+
 @router.get("/download-csv/")
-async def download_csv(file_path: str):
+async def download_csv(file_path: str, request: Request):
     """
     📥 Télécharge un fichier CSV depuis le serveur via HTTP.
     Le file_path est relatif au dossier d'export configuré.
+
+    - ETag fort (SHA-256 du contenu) : If-None-Match → 304 si le fichier n'a pas changé
+      (un fichier réécrit par /update-csv/ change d'ETag)
+    - Range / If-Range : téléchargement partiel (206), sur le fichier non compressé
+    - Accept-Encoding gzip/deflate : fichier compressé à la volée
     """
     # 🔹 Nettoyage du chemin reçu
     file_path = file_path.replace("\\", "/").strip()
@@ -212,57 +633,134 @@ async def download_csv(file_path: str):
     filename = os.path.basename(file_path)
 
     # 📥 Vérification et réponse
-    if os.path.exists(full_path):
-        print(f"📌 Téléchargement du fichier : {full_path}")
-        return FileResponse(full_path, filename=filename)
+    if not os.path.isfile(full_path):
+        print(f"❌ Erreur: Le fichier {full_path} est introuvable.")
+        raise HTTPException(status_code=404, detail="Fichier introuvable")
+
+    # Compression uniquement sans Range (les plages portent sur le fichier tel qu'il est sur disque)
+    encoding = None
+    if "range" not in request.headers and os.path.getsize(full_path) >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+    identity_etag = await run_in_threadpool(representation_etag, full_path)
+    etag = representation_etag(full_path, encoding)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    if etag_matches(request.headers.get("if-none-match"), {etag, identity_etag}):
+        return Response(status_code=304, headers=headers)
+
+    print(f"📌 Téléchargement du fichier : {full_path}" + (f" ({encoding})" if encoding else ""))
+    if encoding is None:
+        return FileResponse(full_path, filename=filename, headers=headers)
+
+    quoted = quote(filename)
+    disposition = f'attachment; filename="{filename}"' if quoted == filename else f"attachment; filename*=utf-8''{quoted}"
+    return StreamingResponse(
+        compressed_chunks(full_path, encoding),
+        media_type="text/csv; charset=utf-8",
+        headers={**headers, "Content-Encoding": encoding, "Content-Disposition": disposition},
+    )
+
+
+def _editable_csv_path(csv_path):
+    """
+    Chemin d'un CSV modifiable : dans outputs/, sans remontée de dossier, existant.
+    """
+    csv_path = csv_path.replace("\\", "/").strip()
 
-    print(f"❌ Erreur: Le fichier {full_path} est introuvable.")
-    raise HTTPException(status_code=404, detail="Fichier introuvable")
+    if not csv_path.startswith("outputs/") or ".." in csv_path.split("/"):
+        print(f"❌ ERREUR: Chemin invalide reçu, mise à jour interdite -> {csv_path}")
+        raise HTTPException(status_code=400, detail="Mise à jour interdite en dehors de outputs/")
+
+    if not os.path.exists(csv_path):
+        print(f"❌ ERREUR: Fichier introuvable - {csv_path}")
+        raise HTTPException(status_code=404, detail=f"Fichier introuvable : {csv_path}")
+
+    return csv_path
 
 
 @router.put("/update-csv/")
-async def update_csv(file: UploadFile = File(...), csv_path: str = Form(...)):
+async def update_csv(file: UploadFile = File(...), csv_path: str = Form(...),
+                     if_match: Optional[str] = Header(None)):
+    import pandas as pd  # import différé : pandas n'est pas chargé au démarrage de l'API
+
     print(f"📌 DEBUG: Chemin reçu pour mise à jour : {csv_path}")
 
     try:
-        csv_path = csv_path.replace("\\", "/").strip()
-
-        if not csv_path.startswith("outputs/"):
-            print(f"❌ ERREUR: Chemin invalide reçu, mise à jour interdite -> {csv_path}")
-            raise HTTPException(status_code=400, detail="Mise à jour interdite en dehors de outputs/")
-
-        if not os.path.exists(csv_path):
-            print(f"❌ ERREUR: Fichier introuvable - {csv_path}")
-            raise HTTPException(status_code=404, detail=f"Fichier introuvable : {csv_path}")
+        csv_path = _editable_csv_path(csv_path)
 
         # 📥 Lecture du CSV envoyé
         df = pd.read_csv(file.file, sep=";", encoding="utf-8")
         print(f"📊 Fichier reçu - lignes : {len(df)}")
 
-        for idx, row in df.iterrows():
-            if row.isnull().all() or all(str(c).strip() == '' for c in row):
-                print(f"⚠️ Ligne {idx} vide")
-            else:
-                print(f"➡️ [{idx}] {row.values}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, row in df.iterrows():
+                if row.isnull().all() or all(str(c).strip() == '' for c in row):
+                    logger.debug("⚠️ Ligne %s vide", idx)
+                else:
+                    logger.debug("➡️ [%s] %s", idx, row.values)
 
         if df.empty:
             raise HTTPException(status_code=400, detail="Le fichier CSV envoyé est vide.")
 
         os.chmod(csv_path, 0o777)
 
-        with open(csv_path, "w", encoding="utf-8", newline="") as f:
-            df.to_csv(f, sep=";", index=False, lineterminator="\n")
-            f.flush()
-            os.fsync(f.fileno())
+        # Remplacement atomique ; le SHA-256 calculé à l'écriture sert d'ETag (pas de relecture)
+        content = df.to_csv(sep=";", index=False, lineterminator="\n").encode("utf-8")
+        etag = await run_in_threadpool(replace_file, csv_path, content, if_match)
+
+        return JSONResponse(
+            content={"message": "Fichier CSV mis à jour avec succès", "etag": etag},
+            headers={"ETag": etag},
+        )
 
-        # 📄 Vérification post-écriture
-        df_check = pd.read_csv(csv_path, sep=";", encoding="utf-8")
-        print(f"📄 Après écriture : {len(df_check)} lignes")
-        for i, row in df_check.iterrows():
-            print(f"✔️ ligne {i} : {row.values}")
+    except HTTPException:
+        raise
 
-        return {"message": "Fichier CSV mis à jour avec succès"}
+    except CSVVersionMismatchError as e:
+        print(f"⚠️ {e}")
+        raise HTTPException(status_code=412, detail=str(e))
 
     except Exception as e:
         print(f"❌ ERREUR lors de la mise à jour : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur lors de la mise à jour : {str(e)}")
+
+
+class CSVRowPatch(BaseModel):
+    row: Optional[int] = None  # index de la ligne de données (0 = première ligne après l'en-tête)
+    key: Optional[str] = None  # ou valeur de `key_column` : toutes les lignes de la palette
+    changes: Dict[str, Optional[str]]
+
+
+class CSVPatchRequest(BaseModel):
+    csv_path: str
+    key_column: str = DEFAULT_KEY_COLUMN
+    patches: List[CSVRowPatch]
+
+
+@router.patch("/update-csv/")
+async def patch_csv(request: CSVPatchRequest, if_match: Optional[str] = Header(None)):
+    """
+    Modifie quelques cellules d'un CSV généré, sans renvoyer ni relire tout le fichier.
+    - patches : [{"row": 3, "changes": {"Brand": "X"}}, {"key": "<Pallet no>", "changes": {...}}]
+    - If-Match (optionnel) : ETag connu ; 412 si le fichier a été modifié depuis
+    Retourne le nouvel ETag (également en en-tête).
+    """
+    csv_path = _editable_csv_path(request.csv_path)
+    patches = [patch.dict() for patch in request.patches]
+
+    try:
+        result = await run_in_threadpool(
+            CSVEditor.apply_patches, csv_path, patches, request.key_column, if_match
+        )
+    except CSVPatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CSVVersionMismatchError as e:
+        print(f"⚠️ {e}")
+        raise HTTPException(status_code=412, detail=str(e))
+
+    print(f"✏️ {csv_path} : {result['updated_cells']} cellule(s) modifiée(s) sur {result['updated_rows']} ligne(s)")
+    return JSONResponse(
+        content={"message": "Fichier CSV mis à jour avec succès", **result},
+        headers={"ETag": result["etag"]},
+    )
@@ -13,8 +13,7 @@ class BaseAlgService:
         containers = self._group_containers(dataframe)
         generated_files = []
 
-        for index, container in enumerate(containers, start=1):
-            container_dataframe = self._filter_container(dataframe, container)
+        for index, (container, container_dataframe) in enumerate(self._split_containers(dataframe, containers), start=1):
             output_csv_path = self._process_container(container_dataframe, output_dir, index, len(containers) == 1)
             if output_csv_path:
                 generated_files.append(output_csv_path)
@@ -23,7 +22,7 @@ class BaseAlgService:
         return generated_files
 
     def _prepare_dataframe(self, file_path):
-        dataframe = AlgLoader.load_excel_file(file_path, sheet_name="Sheet1")
+        dataframe = AlgLoader.load_excel_file(file_path, sheet_name="Sheet1", column_mapping=self.pl_column_mapping)
         AlgDataframeManager.normalize_columns(dataframe)
         AlgDataframeManager.validate_columns(dataframe, self.pl_column_mapping)
         AlgDataframeManager.add_missing_columns(dataframe, self.pl_column_mapping)
@@ -33,16 +32,15 @@ class BaseAlgService:
     def _group_containers(self, dataframe):
         return AlgContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
-        return AlgContainerManager.filter_by_container(dataframe, "Container No", container)
+    def _split_containers(self, dataframe, containers):
+        return AlgContainerManager.split_by_container(dataframe, "Container No", containers)
 
     def _process_container(self, container_dataframe, output_dir, index, single_container):
         extracted_data = self._extract_data(container_dataframe)
         exporter_ref = self._get_exporter_ref(container_dataframe)
         full_exporter_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_exporter_ref
+        extracted_data["Exporter Ref"] = full_exporter_ref
 
         output_csv_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_csv_path, extracted_data)
@@ -61,13 +59,8 @@ class BaseAlgService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, output_csv_path, extracted_data):
-        if not extracted_data:
+        if extracted_data is None or len(extracted_data) == 0:
             print("⚠️ Aucune donnée extraite ! Vérifie ton extraction.")
             return
-        clean_data = []
-        for row in extracted_data:
-            clean_row = {key.strip(): value for key, value in row.items()}
-            clean_data.append(clean_row)
-
-        CSVManager.write_csv(output_csv_path, clean_data)
+        CSVManager.write_csv(output_csv_path, extracted_data)
         print(f"✅ CSV généré : {output_csv_path}")
@@ -1,14 +1,19 @@
 from .alg_base import BaseAlgService
 from ...utils.alg.alg_calculation import AlgCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 import pandas as pd
 
 class AlgService(BaseAlgService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Barcode"],
             "Exporter Name": [""],
@@ -74,70 +79,33 @@ class AlgService(BaseAlgService):
             self.csv_settings[field] = self.csv_settings.get(field, None)
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row)) 
-        return extracted_data
-
-
-    def _extract_row_data(self, row):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-
-                if csv_field == "Exporter Name":
-                    value = "ALG"
-
-                elif csv_field == "Box tare (kg)":
-                    value = AlgCalculations.box_tare(
-                        row.get("Gross Weight", 0),
-                        row.get("Nett Weight", 0),
-                        row.get("No Cartons", 0)
-                    )
-
-                elif csv_field == "Net weight per box (kg)":
-                    value = AlgCalculations.net_weight_per_box(
-                        row.get("Nett Weight", 0),
-                        row.get("No Cartons", 0)
-                    )
-
-                elif csv_field == "Nb of fruits per box":
-                    species = row.get("Commodity Code", "").strip()
-                    caliber = row.get("Count Code", "")
-                    if species == "SC":
-                        value = AlgCalculations.nb_fruits_mandarines(caliber)
-                    else:
-                        value = caliber
-                elif csv_field == "Nb of pallets":
-                    record[csv_field] = self._get_field_value(row, ["Nb of pallets"])
-
-                elif csv_field in date_fields:
-                    value = self._process_date_field(row, excel_columns)
-
-                record[csv_field] = value if value not in [None, "", "Non spécifié"] else ""
-
-        return record
-
-
-
-
-    def _get_field_value(self, row, excel_columns):
-        for excel_column in excel_columns:
-            if excel_column in row.index and pd.notna(row[excel_column]):
-                return row[excel_column]
-        return ""
-
-    def _process_date_field(self, row, excel_columns):
-        for excel_column in excel_columns:
-            value = row.get(excel_column, "")
-            try:
-                if pd.notnull(value) and value != "":
-                    return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-            except Exception as e:
-                print(f"⚠️ Erreur conversion date `{excel_column}`: {e}")
-        return ""
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Exporter Name": lambda df, excel_columns: "ALG",
+                "Box tare (kg)": lambda df, excel_columns: ColumnMapper.combine(
+                    AlgCalculations.box_tare,
+                    ColumnMapper.column(df, "Gross Weight", 0),
+                    ColumnMapper.column(df, "Nett Weight", 0),
+                    ColumnMapper.column(df, "No Cartons", 0),
+                ),
+                "Net weight per box (kg)": lambda df, excel_columns: ColumnMapper.combine(
+                    AlgCalculations.net_weight_per_box,
+                    ColumnMapper.column(df, "Nett Weight", 0),
+                    ColumnMapper.column(df, "No Cartons", 0),
+                ),
+                "Nb of fruits per box": self._nb_of_fruits_per_box,
+            },
+            date_getter=ColumnMapper.first_date,
+            empty_values=[None, "", "Non spécifié"],
+            normalize_special=True,
+        )
+        return extracted
+
+    def _nb_of_fruits_per_box(self, container_df, excel_columns):
+        species = ColumnMapper.column(container_df, "Commodity Code").map(lambda value: value.strip())
+        caliber = ColumnMapper.column(container_df, "Count Code")
+        return ColumnMapper.combine(
+            lambda species_code, count: AlgCalculations.nb_fruits_mandarines(count) if species_code == "SC" else count,
+            species, caliber,
+        )
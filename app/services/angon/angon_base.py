@@ -14,8 +14,7 @@ class BaseAngonService:
         containers = self._group_containers(df)
 
         generated_files = []
-        for index, container in enumerate(containers, start=1):
-            container_df = self._filter_container(df, container)
+        for index, (container, container_df) in enumerate(self._split_containers(df, containers), start=1):
             output_path = self._process_container(container_df, output_dir, index, len(containers) == 1)
             if output_path:
                 generated_files.append(output_path)
@@ -24,7 +23,7 @@ class BaseAngonService:
         return generated_files
 
     def _prepare_dataframe(self, file_path):
-        df = AngonLoader.load_excel_file(file_path)
+        df = AngonLoader.load_excel_file(file_path, column_mapping=self.pl_column_mapping)
         AngonDataframeManager.normalize_columns(df)
         AngonDataframeManager.validate_columns(df, self.pl_column_mapping)
         AngonDataframeManager.add_missing_columns(df, self.pl_column_mapping)
@@ -33,16 +32,15 @@ class BaseAngonService:
     def _group_containers(self, df):
         return AngonContainerManager.group_by_container(df)
 
-    def _filter_container(self, df, container):
-        return AngonContainerManager.filter_by_container(df, "Container", container)
+    def _split_containers(self, df, containers):
+        return AngonContainerManager.split_by_container(df, "Container", containers)
 
     def _process_container(self, df, output_dir, index, single_container):
         extracted_data = self._extract_data(df)
         exporter_ref = self._get_exporter_ref(df)
         full_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_ref
+        extracted_data["Exporter Ref"] = full_ref
 
         output_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_path, extracted_data)
@@ -64,9 +62,8 @@ class BaseAngonService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, path, data):
-        if not data:
+        if data is None or len(data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean = [{k.strip(): v for k, v in row.items()} for row in data]
-        CSVManager.write_csv(path, clean)
+        CSVManager.write_csv(path, data)
         print(f"✅ CSV généré : {path}")
\ No newline at end of file
@@ -3,15 +3,20 @@ import os
 import pandas as pd
 from .angon_base import BaseAngonService
 from ...utils.angon.angon_calculations import AngonCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class AngonService(BaseAngonService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet"],  
             "Exporter Name": ["sender_ref"],
@@ -69,57 +74,29 @@ class AngonService(BaseAngonService):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))
-        return extracted_data
-    
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-
-                # ➕ Gestion Box tare (kg)
-                if csv_field == "Box tare (kg)":
-                    if value in [None, "", "Non spécifié"]:
-                        value = AngonCalculations.box_tare(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={"Box tare (kg)": self._box_tare},
+            normalize_special=True,
+        )
 
         # ➕ Calcul Nb of fruits per box (si vide ou non numérique)
-        caliber = self._get_field_value(row, ["Count"])
-        weight = self._get_field_value(row, ["Net weight per box (kg)"])
-        existing = record.get("Nb of fruits per box", "")
-        if not str(existing).isdigit():
-            record["Nb of fruits per box"] = AngonCalculations.nb_of_fruits_per_box(caliber, weight)
+        caliber = ColumnMapper.first_value(container_df, ["Count"])
+        weight = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        computed = ColumnMapper.combine(AngonCalculations.nb_of_fruits_per_box, caliber, weight)
+        if "Nb of fruits per box" in extracted:
+            existing = extracted["Nb of fruits per box"]
+            extracted["Nb of fruits per box"] = existing.where(existing.map(lambda v: str(v).isdigit()).astype(bool), computed)
+        else:
+            extracted["Nb of fruits per box"] = computed
 
         # ➕ Calcul Nb of pallets (si vide)
-        pallet = self._get_field_value(row, ["Pallet"])
-        boxes = self._get_field_value(row, ["Carton"])
-        current_nb = self._get_field_value(row, ["Nb of pallets"])
-        record["Nb of pallets"] = AngonCalculations.nb_of_pallets_by_palletnum(pallet, boxes, df, current_value=current_nb)
-
-        return record
-
+        current_nb = ColumnMapper.first_value(container_df, ["Nb of pallets"])
+        extracted["Nb of pallets"] = AngonCalculations.nb_of_pallets_by_palletnum(container_df, current_nb)
 
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        return extracted
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+    def _box_tare(self, container_df, excel_columns):
+        # ➕ Gestion Box tare (kg) : valeur par défaut si absente
+        values = ColumnMapper.first_value(container_df, excel_columns)
+        return values.map(lambda v: AngonCalculations.box_tare(v) if v in [None, "", "Non spécifié"] else v)
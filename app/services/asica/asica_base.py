@@ -15,8 +15,7 @@ class BaseAsicaService:
         containers = self._group_containers(dataframe)
 
         generated_files = []
-        for index, container in enumerate(containers, start=1):
-            container_df = self._filter_container(dataframe, container)
+        for index, (container, container_df) in enumerate(self._split_containers(dataframe, containers), start=1):
             output_csv = self._process_container(container_df, output_dir, index, len(containers) == 1)
             if output_csv:
                 generated_files.append(output_csv)
@@ -25,7 +24,7 @@ class BaseAsicaService:
         return generated_files
 
     def _prepare_dataframe(self, file_path):
-        dataframe = AsicaLoader.load_excel_file(file_path)
+        dataframe = AsicaLoader.load_excel_file(file_path, column_mapping=self.pl_column_mapping)
         AsicaDataframeManager.normalize_columns(dataframe)
         AsicaDataframeManager.validate_columns(dataframe, self.pl_column_mapping)
         AsicaDataframeManager.add_missing_columns(dataframe, self.pl_column_mapping)
@@ -35,16 +34,15 @@ class BaseAsicaService:
     def _group_containers(self, dataframe):
         return AsicaContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
-        return AsicaContainerManager.filter_by_container(dataframe, "Container n°", container)
+    def _split_containers(self, dataframe, containers):
+        return AsicaContainerManager.split_by_container(dataframe, "Container n°", containers)
 
     def _process_container(self, container_df, output_dir, index, single_container):
         extracted_data = self._extract_data(container_df)
         exporter_ref = self._get_exporter_ref(container_df)
         full_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_ref
+        extracted_data["Exporter Ref"] = full_ref
 
         output_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_path, extracted_data)
@@ -83,9 +81,8 @@ class BaseAsicaService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, path, data):
-        if not data:
+        if data is None or len(data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean = [{k.strip(): v for k, v in row.items()} for row in data]
-        CSVManager.write_csv(path, clean)
+        CSVManager.write_csv(path, data)
         print(f"✅ CSV généré : {path}")
\ No newline at end of file
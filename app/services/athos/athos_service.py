@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .athos_base import BaseAthosService
 from ...utils.athos.athos_calculations import AthosCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class AthosService(BaseAthosService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet n°"],
             "Exporter Name": ["Exporter name"],
@@ -67,59 +72,28 @@ class AthosService(BaseAthosService):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        extracted = ColumnMapper.map_columns(container_df, self.pl_column_mapping, self.csv_settings)
 
         # 🔢 Caliber et poids brut
-        caliber = self._get_field_value(row, self.pl_column_mapping.get("Size_caliber_count", []))
-        raw_weight = self._get_field_value(row, self.pl_column_mapping.get("Net weight per box (kg)", []))
-        
+        caliber = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Size_caliber_count", []))
+        raw_weight = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Net weight per box (kg)", []))
+
         # ✅ Nettoyage du poids
-        clean_weight = AthosCalculations.clean_weight_value(raw_weight)
-        record["Net weight per box (kg)"] = clean_weight
+        clean_weight = raw_weight.map(AthosCalculations.clean_weight_value)
+        extracted["Net weight per box (kg)"] = clean_weight
 
         # ✅ Fruits / box
-        record["Nb of fruits per box"] = AthosCalculations.nb_of_fruits_per_box(caliber, clean_weight)
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(AthosCalculations.nb_of_fruits_per_box, caliber, clean_weight)
 
         # ✅ Packaging type
-        record["Packaging type"] = AthosCalculations.get_packaging_type(clean_weight)
+        extracted["Packaging type"] = clean_weight.map(AthosCalculations.get_packaging_type)
 
         # ✅ Brand spécial pour CAT 1.5
-        record["Brand"] = AthosCalculations.get_brand_from_class(record.get("Class", ""), record.get("Brand", ""))
+        class_values = extracted["Class"] if "Class" in extracted else pd.Series("", index=extracted.index)
+        brands = extracted["Brand"] if "Brand" in extracted else pd.Series("", index=extracted.index)
+        extracted["Brand"] = ColumnMapper.combine(AthosCalculations.get_brand_from_class, class_values, brands)
 
         # ✅ Nb de palettes (déjà présent ou laissé vide si non défini)
-        record["Nb of pallets"] = self._get_field_value(row, ["Nb of pallets"])
-
-        return record
-
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        extracted["Nb of pallets"] = ColumnMapper.first_value(container_df, ["Nb of pallets"])
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        return extracted
@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .athosv2_base import BaseAthosV2Service
 from ...utils.athosv2.athosv2_calculations import AthosV2Calculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class AthosV2Service(BaseAthosV2Service):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet Number"],
             "Exporter Name": ["Exporter Name"],
@@ -67,65 +72,46 @@ class AthosV2Service(BaseAthosV2Service):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-
-            elif csv_field == "Packaging type":
-                weight = self._get_field_value(row, ["WEIGHT (KG)"])
-                try:
-                    weight_float = float(str(weight).replace(",", "."))
-                    value = f"COLIS {int(weight_float)}KG"
-                except Exception:
-                    value = "COLIS KG"
-                record[csv_field] = value
-            elif csv_field == "Port of departure":
-                record[csv_field] = "CALLAO"
-            elif csv_field == "Certifications":
-                record[csv_field] = "GG/GRASP"
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
-                
-        try:
-            weight_float = float(weight)
-            box_tare = 0.50 if weight_float == 4 else 0.40
-        except Exception:
-            box_tare = 0.6
-        record["Box tare (kg)"] = box_tare
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Packaging type": self._packaging_type,
+                "Port of departure": lambda df, excel_columns: "CALLAO",
+                "Certifications": lambda df, excel_columns: "GG/GRASP",
+            },
+        )
+
+        # Tare déduite du poids du colis (0.6 si le Packaging type n'est pas calculé)
+        if "Packaging type" in self.pl_column_mapping and self.csv_settings.get("Packaging type") is None:
+            weight = ColumnMapper.first_value(container_df, ["WEIGHT (KG)"])
+            extracted["Box tare (kg)"] = weight.map(self._box_tare)
+        else:
+            extracted["Box tare (kg)"] = 0.6
 
         # Calcul Nb of fruits per box
-        caliber = self._get_field_value(row, ["Size/Caliber"])
-        weight = self._get_field_value(row, ["WEIGHT (KG)"])
-        record["Nb of fruits per box"] = AthosV2Calculations.nb_of_fruits_per_box(caliber, weight)
+        caliber = ColumnMapper.first_value(container_df, ["Size/Caliber"])
+        weight = ColumnMapper.first_value(container_df, ["WEIGHT (KG)"])
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(AthosV2Calculations.nb_of_fruits_per_box, caliber, weight)
 
         # Nb of pallets (non recalculé après regroupement)
-        record["Nb of pallets"] = self._get_field_value(row, ["Nb of pallets"])
+        extracted["Nb of pallets"] = ColumnMapper.first_value(container_df, ["Nb of pallets"])
+
+        return extracted
 
-        return record
+    def _packaging_type(self, container_df, excel_columns):
+        weights = ColumnMapper.first_value(container_df, ["WEIGHT (KG)"])
+        return weights.map(self._packaging_type_from_weight)
 
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+    def _packaging_type_from_weight(self, weight):
+        try:
+            weight_float = float(str(weight).replace(",", "."))
+            return f"COLIS {int(weight_float)}KG"
+        except Exception:
+            return "COLIS KG"
 
-    def _process_date_field(self, value):
+    def _box_tare(self, weight):
         try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+            weight_float = float(weight)
+            return 0.50 if weight_float == 4 else 0.40
+        except Exception:
+            return 0.6
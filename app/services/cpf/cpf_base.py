@@ -14,8 +14,7 @@ class BaseCpfService:
         containers = self._group_containers(df)
 
         generated_files = []
-        for index, container in enumerate(containers, start=1):
-            container_df = self._filter_container(df, container)
+        for index, (container, container_df) in enumerate(self._split_containers(df, containers), start=1):
             output_csv = self._process_container(container_df, output_dir, index, len(containers) == 1)
             if output_csv:
                 generated_files.append(output_csv)
@@ -24,7 +23,7 @@ class BaseCpfService:
         return generated_files
 
     def _prepare_dataframe(self, file_path):
-        df = CpfLoader.load_excel_file(file_path)
+        df = CpfLoader.load_excel_file(file_path, column_mapping=self.pl_column_mapping)
         CpfDataframeManager.normalize_columns(df)
         CpfDataframeManager.validate_columns(df, self.pl_column_mapping)
         CpfDataframeManager.add_missing_columns(df, self.pl_column_mapping)
@@ -35,16 +34,15 @@ class BaseCpfService:
     def _group_containers(self, df):
         return CpfContainerManager.group_by_container(df)
 
-    def _filter_container(self, df, container):
-        return CpfContainerManager.filter_by_container(df, "CONTAINER NUMBER", container)
+    def _split_containers(self, df, containers):
+        return CpfContainerManager.split_by_container(df, "CONTAINER NUMBER", containers)
 
     def _process_container(self, df, output_dir, index, single_container):
         extracted_data = self._extract_data(df)
         ref = self._get_exporter_ref(df)
         ref_full = ref if single_container else f"{ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = ref_full
+        extracted_data["Exporter Ref"] = ref_full
 
         path = self._generate_csv_filename(output_dir, ref, index)
         self._write_to_csv(path, extracted_data)
@@ -67,9 +65,8 @@ class BaseCpfService:
         return os.path.join(folder, f"PL_{ref}_{index}.csv")
 
     def _write_to_csv(self, path, data):
-        if not data:
+        if data is None or len(data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean = [{k.strip(): v for k, v in row.items()} for row in data]
-        CSVManager.write_csv(path, clean)
+        CSVManager.write_csv(path, data)
         print(f"✅ CSV CPF généré : {path}")
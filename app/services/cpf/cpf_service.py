@@ -2,14 +2,19 @@ import os
 import pandas as pd
 from .cpf_base import BaseCpfService
 from ...utils.cpf.cpf_calculations import CpfCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 class CpfService(BaseCpfService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["PALLET"],
             "Exporter Name": ["EXPORTER"],
@@ -62,86 +67,56 @@ class CpfService(BaseCpfService):
         self.csv_settings["Fournisseur"] = settings.get("Fournisseur", "CPF")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))
-        return extracted_data
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-
-            elif csv_field == "Class":
-                record[csv_field] = 1
-            elif csv_field == "Certifications":
-                record[csv_field] = "GG/SMETA"
-
-            elif csv_field == "Container No":
-                value = self._get_field_value(row, excel_columns)
-                if value:
-                    value = str(value).replace("-", "").strip()
-                record[csv_field] = value
-
-            elif csv_field == "Packaging type":
-                weight = self._get_field_value(row, ["Net weight per box (kg)"])
-                try:
-                    weight_float = float(weight)
-                    if weight_float == 10:
-                        value = f"Colis {int(weight_float)}KG Plastiques"
-                    elif weight_float == 4:
-                        value = f"Colis {int(weight_float)}KG"
-                    else:
-                        value = "Colis KG"
-                except Exception:
-                    value = "Colis KG"
-                record[csv_field] = value
-
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
-
-        net_per_box = self._get_field_value(row, ["NET WEIGHT"])
-        try:
-            weight_float = float(net_per_box)
-            box_tare = 0.32 if weight_float == 4 else 0.31
-        except Exception:
-            box_tare = 0.6
-        record["Box tare (kg)"] = box_tare
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Class": lambda df, excel_columns: 1,
+                "Certifications": lambda df, excel_columns: "GG/SMETA",
+                "Container No": self._container_no,
+                "Packaging type": self._packaging_type,
+            },
+            dayfirst=True,
+        )
+
+        net_per_box = ColumnMapper.first_value(container_df, ["NET WEIGHT"])
+        extracted["Box tare (kg)"] = net_per_box.map(self._box_tare)
 
         # ✅ Nb de fruits par boîte
-        caliber = self._get_field_value(row, ["SIZE"])
-        record["Nb of fruits per box"] = CpfCalculations.nb_of_fruits_per_box(caliber, net_per_box)
+        caliber = ColumnMapper.first_value(container_df, ["SIZE"])
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(CpfCalculations.nb_of_fruits_per_box, caliber, net_per_box)
 
         # ✅ Net weight per pallet
-        cartons = self._get_field_value(row, ["CASES"])
-        record["Net weight per pallet (kg)"] = CpfCalculations.net_weight_per_pallet(net_per_box, cartons)
+        cartons = ColumnMapper.first_value(container_df, ["CASES"])
+        extracted["Net weight per pallet (kg)"] = ColumnMapper.combine(CpfCalculations.net_weight_per_pallet, net_per_box, cartons)
 
         # ✅ Nb de palettes
-        pallet = self._get_field_value(row, ["PALLET"])
-        existing = self._get_field_value(row, ["Nb of pallets"])
-        record["Nb of pallets"] = CpfCalculations.nb_of_pallets_by_palletnum(pallet, cartons, df, current_value=existing)
-
-        return record
+        existing = ColumnMapper.first_value(container_df, ["Nb of pallets"])
+        extracted["Nb of pallets"] = CpfCalculations.nb_of_pallets_by_palletnum(container_df, existing)
 
+        return extracted
 
+    def _container_no(self, container_df, excel_columns):
+        values = ColumnMapper.first_value(container_df, excel_columns)
+        return values.map(lambda value: str(value).replace("-", "").strip() if value else value)
 
+    def _packaging_type(self, container_df, excel_columns):
+        weights = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        return weights.map(self._packaging_type_from_weight)
 
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+    def _packaging_type_from_weight(self, weight):
+        try:
+            weight_float = float(weight)
+            if weight_float == 10:
+                return f"Colis {int(weight_float)}KG Plastiques"
+            elif weight_float == 4:
+                return f"Colis {int(weight_float)}KG"
+            return "Colis KG"
+        except Exception:
+            return "Colis KG"
 
-    def _process_date_field(self, value):
+    def _box_tare(self, net_per_box):
         try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, dayfirst=True, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+            weight_float = float(net_per_box)
+            return 0.32 if weight_float == 4 else 0.31
+        except Exception:
+            return 0.6
@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .gh_base import BaseGHService
 from ...utils.gh.gh_calculations import GHCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class GHService(BaseGHService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet n°"],
             "Exporter Name": ["Exporter name"],
@@ -66,41 +71,12 @@ class GHService(BaseGHService):
         self.csv_settings["Importer"] = settings.get("importer", "Non spécifié")
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
-    def _extract_data(self, df):
-        extracted_data = []
-        for _, row in df.iterrows():
-            extracted_data.append(self._extract_row_data(row))
-        return extracted_data
-
-    def _extract_row_data(self, row):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
-        # ➕ Calcul Nb of fruits per box si vide
-        caliber = self._get_field_value(row, ["Size"])
-        weight = self._get_field_value(row, ["Net weight per box (kg)"])
-        record["Nb of fruits per box"] = GHCalculations.nb_of_fruits_per_box(caliber, weight)
-
-        return record
+    def _extract_data(self, container_df):
+        extracted = ColumnMapper.map_columns(container_df, self.pl_column_mapping, self.csv_settings)
 
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        # ➕ Calcul Nb of fruits per box
+        caliber = ColumnMapper.first_value(container_df, ["Size"])
+        weight = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(GHCalculations.nb_of_fruits_per_box, caliber, weight)
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        return extracted
@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .hnp_base import BaseHnpService
 from ...utils.hnp.hnp_calculations import HnpCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class HnpService(BaseHnpService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet Ref. Nr."],
             "Exporter Name": ["Exporter Name"],
@@ -67,53 +72,22 @@ class HnpService(BaseHnpService):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            elif csv_field == "Certifications":
-                value = self._get_field_value(row, excel_columns)
-                record[csv_field] = value if value not in [None, "", "Non spécifié"] else "GG/SMETA"
-            elif csv_field == "Exporter Name":
-                value = self._get_field_value(row, excel_columns)
-                record[csv_field] = value if value not in [None, "", "Non spécifié"] else "HNP MARKETING"
-            elif csv_field == "Port of departure":
-                value = self._get_field_value(row, excel_columns)
-                record[csv_field] = value if value not in [None, "", "Non spécifié"] else "DURBAN"
-            elif csv_field == "Port of arrival":
-                value = self._get_field_value(row, excel_columns)
-                record[csv_field] = value if value not in [None, "", "Non spécifié"] else "ROTTERDAM"
-            elif csv_field == "Net weight per box (kg)":
-                value = self._get_field_value(row, excel_columns)
-                record[csv_field] = value if value not in [None, "", "0.0"] else "0.0"
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
-        return record
-
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Certifications": self._value_or_default("GG/SMETA"),
+                "Exporter Name": self._value_or_default("HNP MARKETING"),
+                "Port of departure": self._value_or_default("DURBAN"),
+                "Port of arrival": self._value_or_default("ROTTERDAM"),
+                "Net weight per box (kg)": self._value_or_default("0.0", empty_values=[None, "", "0.0"]),
+            },
+        )
+        return extracted
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+    def _value_or_default(self, default, empty_values=(None, "", "Non spécifié")):
+        """
+        Valeur de la colonne, remplacée par `default` lorsqu'elle est vide.
+        """
+        return lambda df, excel_columns: ColumnMapper.normalize(
+            ColumnMapper.first_value(df, excel_columns), list(empty_values), default
+        )
@@ -3,15 +3,20 @@ import pandas as pd
 from .ingophase_base import BaseIngophaseService
 from ...utils.ingophase.ingophase_calculations import IngophaseCalculations
 import datetime
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class IngophaseService(BaseIngophaseService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination", "Exporter Name")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet_Id"],
             "Exporter Name": ["Cust_Name"],
@@ -69,60 +74,28 @@ class IngophaseService(BaseIngophaseService):
         self.csv_settings["Exporter Name"] = settings.get("exporter_name", "Ingophase FRUIT")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            elif csv_field == "Port of departure":
-                record[csv_field] = "DURBAN"
-            elif csv_field == "Certifications":
-                record[csv_field] = "GG/SMETA"
-            elif csv_field == "ETA":
-                record[csv_field] = datetime.datetime.now().strftime("%d/%m/%Y")
-            elif csv_field == "Brand":
-                record[csv_field] = self.csv_settings.get("Fournisseur", "Générique")
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Port of departure": lambda df, excel_columns: "DURBAN",
+                "Certifications": lambda df, excel_columns: "GG/SMETA",
+                "ETA": lambda df, excel_columns: datetime.datetime.now().strftime("%d/%m/%Y"),
+                "Brand": lambda df, excel_columns: self.csv_settings.get("Fournisseur", "Générique"),
+            },
+        )
 
         # ✅ Toujours recalculer Net weight per box (kg) depuis Mass et CtnQty
-        mass = self._get_field_value(row, ["Net weight per pallet (kg)", "PO_NettM"])
-        cartons = self._get_field_value(row, ["Cartons per pallet", "Cartons"])
-        record["Net weight per box (kg)"] = IngophaseCalculations.net_weight_per_box(mass, cartons)
+        mass = ColumnMapper.first_value(container_df, ["Net weight per pallet (kg)", "PO_NettM"])
+        cartons = ColumnMapper.first_value(container_df, ["Cartons per pallet", "Cartons"])
+        extracted["Net weight per box (kg)"] = ColumnMapper.combine(IngophaseCalculations.net_weight_per_box, mass, cartons)
 
         # ✅ Tare recalculée selon le nombre de cartons
-        cartons = self._get_field_value(row, self.pl_column_mapping.get("Cartons per pallet", []))
-        record["Box tare (kg)"] = IngophaseCalculations.box_tare(cartons)
+        cartons = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Cartons per pallet", []))
+        extracted["Box tare (kg)"] = cartons.map(IngophaseCalculations.box_tare)
 
         # ✅ Nombre de fruits par boîte selon le poids (recalculé), le calibre et l'espèce
-        caliber = self._get_field_value(row, self.pl_column_mapping.get("Size_caliber_count", []))
-        species = self._get_field_value(row, self.pl_column_mapping.get("Species", []))
-        record["Nb of fruits per box"] = IngophaseCalculations.nb_of_fruits_per_box(caliber, species)
-
-        return record
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        caliber = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Size_caliber_count", []))
+        species = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Species", []))
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(IngophaseCalculations.nb_of_fruits_per_box, caliber, species)
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        return extracted
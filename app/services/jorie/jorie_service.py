@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .jorie_base import BaseJorieService
 from ...utils.jorie.jorie_calculations import JorieCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class JorieService(BaseJorieService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["PalletId"],
             "Exporter Name": ["Orgzn"],
@@ -67,45 +72,18 @@ class JorieService(BaseJorieService):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        extracted = ColumnMapper.map_columns(container_df, self.pl_column_mapping, self.csv_settings)
 
         # ➕ Calcul Net weight per box si manquant
-        if not record.get("Net weight per box (kg)"):
-            mass = self._get_field_value(row, ["Net weight per pallet (kg)", "Mass"])
-            cartons = self._get_field_value(row, ["Cartons per pallet", "CtnQty"])
-            record["Net weight per box (kg)"] = JorieCalculations.net_weight_per_box(mass, cartons)
-
-        return record
-
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        current = extracted.get("Net weight per box (kg)")
+        missing = pd.Series(True, index=extracted.index) if current is None else current.map(lambda v: not v).astype(bool)
+        if missing.any():
+            mass = ColumnMapper.first_value(container_df[missing], ["Net weight per pallet (kg)", "Mass"])
+            cartons = ColumnMapper.first_value(container_df[missing], ["Cartons per pallet", "CtnQty"])
+            computed = ColumnMapper.combine(JorieCalculations.net_weight_per_box, mass, cartons)
+            if current is None:
+                extracted["Net weight per box (kg)"] = computed
+            else:
+                extracted["Net weight per box (kg)"] = current.astype(object).mask(missing, computed)
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        return extracted
@@ -2,21 +2,31 @@ from ...utils.kakuzi.kakuzi_loader import KakuziLoader
 from ...utils.kakuzi.kakuzi_df_manager import KakuziDataframeManager
 from ...utils.kakuzi.kakuzi_container_manager import KakuziContainerManager
 from ...utils.csv_manager import CSVManager
+from ...utils.sheet_pool import sheet_pool
 import os
 import pandas as pd
 
 
+def _extract_sheet(service_class, raw_df):
+    """
+    Extraction d'une feuille par une instance neuve du service (exécutée dans le pool de feuilles).
+    Retourne le container et les informations de la feuille (ETA, ETD, navire...).
+    """
+    return service_class()._extract_data_from_sheet(raw_df)
+
+
 class BaseKakuziService:
     def __init__(self, pl_column_mapping):
         self.pl_column_mapping = pl_column_mapping
 
     def process_file(self, file_path, output_dir):
         sheet_dfs = self._prepare_dataframe(file_path)
+        # Feuilles extraites en parallèle ; les containers sont ensuite traités dans l'ordre du classeur
+        sheets = sheet_pool.map(_extract_sheet, [type(self)] * len(sheet_dfs), sheet_dfs.values())
 
         generated_files = []
-        for index, (sheet_name, df) in enumerate(sheet_dfs.items(), start=1):
-            container_df = self._extract_data_from_sheet(df)
-            output_csv = self._process_container(container_df, output_dir, index, len(sheet_dfs) == 1)
+        for index, (container_df, sheet_info) in enumerate(sheets, start=1):
+            output_csv = self._process_container(container_df, output_dir, index, len(sheet_dfs) == 1, sheet_info)
             if output_csv:
                 generated_files.append(output_csv)
 
@@ -32,22 +42,21 @@ class BaseKakuziService:
     def _group_containers(self, dataframe):
         return KakuziContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
-        return KakuziContainerManager.filter_by_container(dataframe, "Container n°", container)
+    def _split_containers(self, dataframe, containers):
+        return KakuziContainerManager.split_by_container(dataframe, "Container n°", containers)
 
-    def _process_container(self, container_df, output_dir, index, single_container):
-        extracted_data = self._extract_data(container_df)
+    def _process_container(self, container_df, output_dir, index, single_container, sheet_info):
+        extracted_data = self._extract_data(container_df, sheet_info)
         exporter_ref = self._get_exporter_ref(container_df)
         full_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_ref
+        extracted_data["Exporter Ref"] = full_ref
 
         output_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_path, extracted_data)
         return output_path
 
-    def _extract_data(self, container_df):
+    def _extract_data(self, container_df, sheet_info):
         raise NotImplementedError()
     
 
@@ -80,9 +89,8 @@ class BaseKakuziService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, path, data):
-        if not data:
+        if data is None or len(data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean = [{k.strip(): v for k, v in row.items()} for row in data]
-        CSVManager.write_csv(path, clean)
+        CSVManager.write_csv(path, data)
         print(f"✅ CSV généré : {path}")
\ No newline at end of file
@@ -3,12 +3,19 @@ import re
 import pandas as pd
 from .kakuzi_base import BaseKakuziService
 from ...utils.kakuzi.kakuzi_calculations import KakuziCalculations
+from ...utils.column_mapper import ColumnMapper, EMPTY_VALUES
+from ...utils.supplier_template import SupplierTemplate
+from ...utils.date_normalizer import DateNormalizer
+
+# Nom du navire après "Vessel:" (cellule B10)
+VESSEL_PATTERN = re.compile(r"Vessel:\s*([^)]+)")
+# Calibre numérique en début de cellule (ligne 16)
+CALIBER_PATTERN = re.compile(r"(\d+)")
 
 
 class KakuziService(BaseKakuziService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
         
     def _extract_data_from_sheet(self, raw_df):
@@ -22,7 +29,7 @@ class KakuziService(BaseKakuziService):
         ggn = raw_df.iloc[10, 1]              # B11 (index 10,1)
         exporter_ref = raw_df.iloc[8, 1]      # B9 (index 8,1)
         vessel_raw = raw_df.iloc[9, 1]        # B10 = index (9,1)
-        match = re.search(r"Vessel:\s*([^)]+)", str(vessel_raw))
+        match = VESSEL_PATTERN.search(str(vessel_raw))
         vessel_name = match.group(1).strip() if match else str(vessel_raw).strip()
         port_of_arrival = raw_df.iloc[3, 3]   # D4 (index 3,3)
         seal_no = ""
@@ -39,7 +46,7 @@ class KakuziService(BaseKakuziService):
                 break
             
             # Extraction numérique du calibre avec regex
-            match = re.match(r"(\d+)", str(value).strip())
+            match = CALIBER_PATTERN.match(str(value).strip())
             if not match:
                 break  # Si pas de nombre au début, on stoppe la boucle
             calibre_num = int(match.group(1))
@@ -106,20 +113,29 @@ class KakuziService(BaseKakuziService):
                     "Brand": brand  # assigné dynamiquement
                 })
 
-        self.eta = eta
-        self.etd = etd
-        self.exporter_name = "KAKUZI PLC"  
-        self.vessel_name = vessel_name
-        self.seal_no = seal_no
-        self.container_no = container_no
-        self.port_of_arrival = port_of_arrival
+        # Informations d'en-tête de la feuille, reprises dans toutes les lignes du container
+        sheet_info = {
+            "eta": eta,
+            "etd": etd,
+            "exporter_name": "KAKUZI PLC",
+            "vessel_name": vessel_name,
+            "seal_no": seal_no,
+            "container_no": container_no,
+            "port_of_arrival": port_of_arrival,
+        }
+
+        return pd.DataFrame(data_rows), sheet_info
 
-        return pd.DataFrame(data_rows)
 
 
 
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+    # Valeurs de paramètres écrites vides, comme à l'extraction
+    SETTINGS_EMPTY_VALUES = EMPTY_VALUES
 
-    def _initialize_column_mapping(self):
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet n°"],
             "Exporter Name": ["Exporter name"],
@@ -175,91 +191,60 @@ class KakuziService(BaseKakuziService):
         self.csv_settings["Importer"] = settings.get("importer", "Non spécifié")
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
-    def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field == "Country of origin" and "Country of origin" in self.csv_settings:
-                value = self.csv_settings["Country of origin"]
-            elif csv_field == "Forwarder at destination" and "Forwarder at destination" in self.csv_settings:
-                value = self.csv_settings["Forwarder at destination"]
-            elif csv_field == "Species":
-                value = "Avocat"
-            elif csv_field == "Packaging type":
-                weight = self._get_field_value(row, ["Net weight per box (kg)"])
-                try:
-                    weight_float = float(weight)
-                except Exception:
-                    weight_float = None
-
-                value = f"COLIS {int(weight_float)}KG" if weight_float else "COLIS KG"
-            elif csv_field == "ETA":
-                value = self._process_date_field(self.eta)
-            elif csv_field == "ETD":
-                value = self._process_date_field(self.etd)
-            elif csv_field == "Exporter Name":
-                value = self.exporter_name
-            elif csv_field == "Vessel Name":
-                value = self.vessel_name
-            elif csv_field == "Port of departure":
-                value = "MOMBASA"
-            elif csv_field == "Shipping line":
-                value = "MAERSK"
-            elif csv_field == "Certifications":
-                record[csv_field] = "GG/SMETA"
-            elif csv_field == "Class":
-                value = 1
-            elif csv_field == "Seal No":
-                value = self.seal_no
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-
-            record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+    def _extract_data(self, container_df, sheet_info):
+        # Seuls le pays d'origine et le transitaire proviennent des paramètres CSV
+        settings = {
+            csv_field: (lambda df, excel_columns, value=self.csv_settings[csv_field]: value)
+            for csv_field in ["Country of origin", "Forwarder at destination"]
+            if csv_field in self.csv_settings
+        }
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, {},
+            special_fields={
+                **settings,
+                "Species": lambda df, excel_columns: "Avocat",
+                "Packaging type": self._packaging_type,
+                "ETA": lambda df, excel_columns: DateNormalizer.format_value(sheet_info["eta"]),
+                "ETD": lambda df, excel_columns: DateNormalizer.format_value(sheet_info["etd"]),
+                "Exporter Name": lambda df, excel_columns: sheet_info["exporter_name"],
+                "Vessel Name": lambda df, excel_columns: sheet_info["vessel_name"],
+                "Port of departure": lambda df, excel_columns: "MOMBASA",
+                "Shipping line": lambda df, excel_columns: "MAERSK",
+                # Reprend la valeur du champ précédent du mapping ("Plot"), comme historiquement
+                "Certifications": lambda df, excel_columns: ColumnMapper.first_value(df, self.pl_column_mapping["Plot"]),
+                "Class": lambda df, excel_columns: 1,
+                "Seal No": lambda df, excel_columns: sheet_info["seal_no"],
+            },
+            normalize_special=True,
+        )
 
         # Valeurs calculées spécifiques
-        weight = self._get_field_value(row, ["Net weight per box (kg)"])
-        try:
-            weight_float = float(weight)
-            box_tare = 0.31 if weight_float == 4 else 0.6
-        except Exception:
-            box_tare = 0.6
-        record["Box tare (kg)"] = box_tare
-
-        caliber = self._get_field_value(row, ["Size"])
-        record["Nb of fruits per box"] = KakuziCalculations.nb_of_fruits_per_box(caliber, weight)
-        record["Nb of pallets"] = 1
-
-        return record
-
+        weight = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        extracted["Box tare (kg)"] = weight.map(self._box_tare)
 
+        caliber = ColumnMapper.first_value(container_df, ["Size"])
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(KakuziCalculations.nb_of_fruits_per_box, caliber, weight)
+        extracted["Nb of pallets"] = 1
 
+        return extracted
 
+    def _packaging_type(self, container_df, excel_columns):
+        weights = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        return weights.map(self._packaging_type_from_weight)
 
+    def _packaging_type_from_weight(self, weight):
+        try:
+            weight_float = float(weight)
+        except Exception:
+            weight_float = None
 
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        return f"COLIS {int(weight_float)}KG" if weight_float else "COLIS KG"
 
-    def _process_date_field(self, value):
+    def _box_tare(self, weight):
         try:
-            if pd.notnull(value) and value != "":
-                parsed = pd.to_datetime(value, errors='coerce')
-                if pd.notnull(parsed):
-                    return parsed.strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+            weight_float = float(weight)
+            return 0.31 if weight_float == 4 else 0.6
+        except Exception:
+            return 0.6
 
 
@@ -1,4 +1,5 @@
 from .langplaas_parser import LangplaasParser
+from ...utils.container_splitter import ContainerSplitter
 from ...utils.csv_manager import CSVManager
 import os
 
@@ -11,8 +12,7 @@ class BaseLangplaasService:
         containers = dataframe["Container No."].dropna().unique()
 
         generated_files = []
-        for index, container in enumerate(containers, start=1):
-            container_df = dataframe[dataframe["Container No."] == container]
+        for index, (container, container_df) in enumerate(ContainerSplitter.split(dataframe, "Container No.", containers), start=1):
             output_csv_path = self._process_container(container_df, output_dir, index, len(containers) == 1)
             if output_csv_path:
                 generated_files.append(output_csv_path)
@@ -29,8 +29,7 @@ class BaseLangplaasService:
         exporter_ref = self._get_exporter_ref(container_dataframe)
         full_exporter_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_exporter_ref
+        extracted_data["Exporter Ref"] = full_exporter_ref
 
         output_csv_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_csv_path, extracted_data)
@@ -49,9 +48,8 @@ class BaseLangplaasService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, output_csv_path, extracted_data):
-        if not extracted_data:
+        if extracted_data is None or len(extracted_data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean_data = [{k.strip(): v for k, v in row.items()} for row in extracted_data]
-        CSVManager.write_csv(output_csv_path, clean_data)
+        CSVManager.write_csv(output_csv_path, extracted_data)
         print(f"✅ CSV généré : {output_csv_path}")
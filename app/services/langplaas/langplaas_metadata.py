@@ -1,8 +1,10 @@
-import openpyxl
+from ...utils.workbook import Workbook
+
+# Zone utile du modèle : colonnes A à BV (la cellule de métadonnées la plus à droite est BV23)
+MAX_COL = 74
 
 def _load_sheet(file_path, sheet_name="Sheet1"):
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    return wb[sheet_name]
+    return Workbook.of(file_path, sheet_name, max_col=MAX_COL)
 
 def extract_vessel(sheet):
     return _safe_cell(sheet, "O23")
@@ -26,5 +28,5 @@ def extract_seal_no(sheet):
     return _safe_cell(sheet, "BV23")
 
 def _safe_cell(sheet, coord):
-    value = sheet[coord].value
+    value = sheet.cell(coord)
     return str(value).strip() if value else ""
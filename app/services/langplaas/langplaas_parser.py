@@ -15,11 +15,11 @@ from .langplaas_metadata import (
 class LangplaasParser:
     @staticmethod
     def extract_dataframe(file_path, sheet_name="Sheet1"):
-        # Charger la feuille Excel
+        # Charger la feuille Excel (analysée une seule fois pour les métadonnées et le tableau)
         sheet = _load_sheet(file_path, sheet_name)
 
         # Lire le tableau sans header (on va les fixer nous-mêmes)
-        raw_df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine="openpyxl", skiprows=27)
+        raw_df = sheet.read(header=None, skiprows=27)
 
         # Définir manuellement les vrais noms de colonnes dans l'ordre
         true_columns = [
@@ -1,13 +1,18 @@
 from .langplaas_base import BaseLangplaasService
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 import pandas as pd
 
 class LangplaasService(BaseLangplaasService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet Number"],
             "Exporter Name": [""],
@@ -57,49 +62,17 @@ class LangplaasService(BaseLangplaasService):
         self.csv_settings["Archive"] = self.csv_settings.pop("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row))
-        return extracted_data
-
-    def _extract_row_data(self, row):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                if csv_field in date_fields:
-                    record[csv_field] = self._process_date_field(row, excel_columns)
-                else:
-                    value = self._get_field_value(row, excel_columns)
-                    record[csv_field] = value if value not in [None, "Non spécifié"] else ""
-        #print(f"📦 Ligne extraite [{row.name}] : {record}")
-        return record
-
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            date_getter=ColumnMapper.first_date,
+            value_getter=self._get_field_values,
+        )
+        return extracted
 
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
+    def _get_field_values(self, container_df, excel_columns):
+        present = [col for col in excel_columns if col in container_df.columns]
+        found = container_df[present].notna().any(axis=1) if present else pd.Series(False, index=container_df.index)
+        if not found.all():
             # ❌ DEBUG si aucune colonne trouvée
-        print(f"⚠️ Colonne(s) non trouvée(s) : {excel_columns} dans ligne {row.name}")
-        return ""
-
-    def _process_date_field(self, row, excel_columns):
-        """
-        Traite les champs de type date et les formate en 'dd/mm/yyyy' (sans l'heure).
-        """
-        for excel_column in excel_columns:
-            value = row.get(excel_column, "")
-
-            try:
-                if pd.notnull(value) and value != "":
-                    date = pd.to_datetime(value, errors='coerce')
-                    if not pd.isna(date):
-                        return date.strftime("%d/%m/%Y")  # ⛔ PAS d'heure ici
-            except Exception as e:
-                print(f"⚠️ Erreur conversion date `{excel_column}`: {e}")
-
-        return ""
+            print(f"⚠️ Colonne(s) non trouvée(s) : {excel_columns} dans {int((~found).sum())} ligne(s)")
+        return ColumnMapper.first_value(container_df, excel_columns)
@@ -11,12 +11,13 @@ class BaseMavunoService:
         self.pl_column_mapping = pl_column_mapping
 
     def process_file(self, file_path, output_dir):
-        self._inject_metadata_from_file(file_path)
-        dataframe = self._prepare_dataframe(file_path)
+        # Le classeur n'est analysé qu'une fois pour les métadonnées et le tableau
+        workbook = MavunoLoader.open_workbook(file_path, self.pl_column_mapping)
+        self._inject_metadata_from_file(workbook)
+        dataframe = self._prepare_dataframe(workbook)
         containers = self._group_containers(dataframe)
         generated_files = []
-        for index, container in enumerate(containers, start=1):
-            container_df = self._filter_container(dataframe, container)
+        for index, (container, container_df) in enumerate(self._split_containers(dataframe, containers), start=1):
             output_csv = self._process_container(container_df, output_dir, index, len(containers) == 1)
             if output_csv:
                 generated_files.append(output_csv)
@@ -35,16 +36,15 @@ class BaseMavunoService:
     def _group_containers(self, dataframe):
         return MavunoContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
-        return MavunoContainerManager.filter_by_container(dataframe, "Container n°", container)
+    def _split_containers(self, dataframe, containers):
+        return MavunoContainerManager.split_by_container(dataframe, "Container n°", containers)
 
     def _process_container(self, container_df, output_dir, index, single_container):
         extracted_data = self._extract_data(container_df)
         exporter_ref = self._get_exporter_ref(container_df)
         full_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_ref
+        extracted_data["Exporter Ref"] = full_ref
 
         output_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_path, extracted_data)
@@ -83,9 +83,8 @@ class BaseMavunoService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, path, data):
-        if not data:
+        if data is None or len(data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean = [{k.strip(): v for k, v in row.items()} for row in data]
-        CSVManager.write_csv(path, clean)
+        CSVManager.write_csv(path, data)
         print(f"✅ CSV généré : {path}")
\ No newline at end of file
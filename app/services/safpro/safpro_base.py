@@ -20,8 +20,7 @@ class BaseSafproService:
 
         generated_files = []
 
-        for index, container in enumerate(containers, start=1):
-            container_dataframe = self._filter_container(dataframe, container)
+        for index, (container, container_dataframe) in enumerate(self._split_containers(dataframe, containers), start=1):
             output_csv_path = self._process_container(container_dataframe, output_dir, index, len(containers) == 1)
             
             if output_csv_path:  
@@ -34,7 +33,7 @@ class BaseSafproService:
         """
         Chargement et préparation du DataFrame.
         """
-        dataframe = SafproLoader.load_excel_file(file_path)
+        dataframe = SafproLoader.load_excel_file(file_path, column_mapping=self.pl_column_mapping)
         SafproDataframeManager.normalize_columns(dataframe)
         SafproDataframeManager.validate_columns(dataframe, self.pl_column_mapping)
         SafproDataframeManager.add_missing_columns(dataframe, self.pl_column_mapping)
@@ -46,11 +45,11 @@ class BaseSafproService:
         """
         return SafproContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
+    def _split_containers(self, dataframe, containers):
         """
-        Filtre les données pour un conteneur spécifique.
+        Découpe les données par conteneur, en une seule passe.
         """
-        return SafproContainerManager.filter_by_container(dataframe, "Container n°", container)
+        return SafproContainerManager.split_by_container(dataframe, "Container n°", containers)
 
     def _process_container(self, container_dataframe, output_dir, index, single_container):
         """
@@ -61,8 +60,7 @@ class BaseSafproService:
         exporter_ref = self._get_exporter_ref(container_dataframe)
         full_exporter_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_exporter_ref
+        extracted_data["Exporter Ref"] = full_exporter_ref
 
         output_csv_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_csv_path, extracted_data)
@@ -95,15 +93,10 @@ class BaseSafproService:
         """
         Écrit les données extraites dans un fichier CSV.
         """
-        if not extracted_data:
+        if extracted_data is None or len(extracted_data) == 0:
             print("⚠️ Aucune donnée extraite ! Vérifie ton extraction.")
             return
-        clean_data = []
-        for row in extracted_data:
-            clean_row = {key.strip(): value for key, value in row.items()}
-            clean_data.append(clean_row)
-
-        CSVManager.write_csv(output_csv_path, clean_data)
+        CSVManager.write_csv(output_csv_path, extracted_data)
         print(f"✅ CSV généré : {output_csv_path}")
 
 
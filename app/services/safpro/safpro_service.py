@@ -1,16 +1,26 @@
 from .safpro_base import BaseSafproService
 from ...utils.safpro.safpro_calculations import SafproCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
+import logging
 import pandas as pd
 import os
 
+logger = logging.getLogger(__name__)
+
 class SafproService(BaseSafproService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
         self.special_commodity_codes = ["OR", "LE"]
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+    # Valeurs de paramètres écrites vides, comme à l'extraction
+    SETTINGS_EMPTY_VALUES = [None, "", "Non spécifié"]
+
+    @staticmethod
+    def _initialize_column_mapping():
         """
         Initialise le mappage des colonnes entre le fichier Excel et le CSV.
         """
@@ -94,76 +104,43 @@ class SafproService(BaseSafproService):
         """
         Méthode spécialisée pour extraire les données d'une PL SAFPRO.
         """
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            record = self._extract_row_data(row)
-            extracted_data.append(record)
-        return extracted_data
-
-
-    def _extract_row_data(self, row):
-        """
-        Extrait les données d'une ligne spécifique en appliquant les paramètres CSV.
-        """
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]  # ✅ Champs contenant des dates
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
+        for csv_field in self.pl_column_mapping:
             if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                print(f"✅ Remplacement {csv_field} → {self.csv_settings[csv_field]}")
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field == "Box tare (kg)":
-                    cartons = self._get_field_value(row, ["Cartons"])
-                    species = self._get_field_value(row, ["Commodity"])
-                    net_weight_box = self._get_field_value(row, ["Net weight per box (kg)"])
-                    original_value = self._get_field_value(row, excel_columns)
-
-                    record[csv_field] = SafproCalculations.box_tare(
-                        cartons_per_pallet=cartons,
-                        species=species,
-                        net_weight_per_box=net_weight_box,
-                        original_value=original_value
-                    )
-                elif csv_field == "Nb of fruits per box":
-                    commodity_code = self._get_field_value(row, ["Commodity"])
-                    caliber = self._get_field_value(row, ["Size/caliber/count"])
-                    net_weight_box = self._get_field_value(row, ["Net weight per box (kg)"])
-                    record[csv_field] = SafproCalculations.nb_of_fruits_per_box(caliber, commodity_code, net_weight_box)
-                elif csv_field in date_fields:
-                    record[csv_field] = self._process_date_field(row, excel_columns)
-                else:
-                    record[csv_field] = value
-            if record[csv_field] in [None, "", "Non spécifié"]:
-                record[csv_field] = ""
-
-        print("📌 Données extraites après correction :", record)
-        return record
-
-
-    def _get_field_value(self, row, excel_columns):
-        """
-        Récupère la valeur brute d'une colonne Excel correspondant à un champ CSV.
-        """
-        for excel_column in excel_columns:
-            if excel_column in row.index and pd.notna(row[excel_column]):
-                return row[excel_column]
-        return ""
-
-    def _process_date_field(self, row, excel_columns):
-        """
-        Traite les champs de type date et les formate en 'dd/mm/yyyy'.
-        """
-        for excel_column in excel_columns:
-            value = row.get(excel_column, "")
-
-            try:
-                if pd.notnull(value) and value != "":
-                    return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-            except Exception as e:
-                print(f"⚠️ Erreur conversion date `{excel_column}`: {e}")
-
-        return ""
-
-
+                logger.debug("✅ Remplacement %s → %s", csv_field, self.csv_settings[csv_field])
+
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Box tare (kg)": self._box_tare,
+                "Nb of fruits per box": self._nb_of_fruits_per_box,
+            },
+            date_getter=ColumnMapper.first_date,
+            empty_values=[None, "", "Non spécifié"],
+            normalize_settings=True,
+            normalize_special=True,
+        )
+
+        print(f"📌 Données extraites après correction : {len(extracted)} lignes")
+        return extracted
+
+    def _box_tare(self, container_df, excel_columns):
+        cartons = ColumnMapper.first_value(container_df, ["Cartons"])
+        species = ColumnMapper.first_value(container_df, ["Commodity"])
+        net_weight_box = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        original_value = ColumnMapper.first_value(container_df, excel_columns)
+
+        return ColumnMapper.combine(
+            lambda cartons_per_pallet, species_value, net_weight, original: SafproCalculations.box_tare(
+                cartons_per_pallet=cartons_per_pallet,
+                species=species_value,
+                net_weight_per_box=net_weight,
+                original_value=original
+            ),
+            cartons, species, net_weight_box, original_value,
+        )
+
+    def _nb_of_fruits_per_box(self, container_df, excel_columns):
+        commodity_code = ColumnMapper.first_value(container_df, ["Commodity"])
+        caliber = ColumnMapper.first_value(container_df, ["Size/caliber/count"])
+        net_weight_box = ColumnMapper.first_value(container_df, ["Net weight per box (kg)"])
+        return ColumnMapper.combine(SafproCalculations.nb_of_fruits_per_box, caliber, commodity_code, net_weight_box)
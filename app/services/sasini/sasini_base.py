@@ -2,10 +2,23 @@ from ...utils.sasini.sasini_loader import SasiniLoader
 from ...utils.sasini.sasini_df_manager import SasiniDataframeManager
 from ...utils.sasini.sasini_container_manager import SasiniContainerManager
 from ...utils.csv_manager import CSVManager
+from ...utils.sheet_pool import sheet_pool
 import os
 import pandas as pd
 
 
+def _prepare_sheet(pl_column_mapping, df):
+    """
+    Normalise une feuille (un container) et regroupe par palette et calibre (exécutée dans le pool de feuilles).
+    Retourne la feuille préparée sans modifier `df` : même résultat dans le processus courant ou dans un worker.
+    """
+    df = df.copy(deep=False)
+    SasiniDataframeManager.normalize_columns(df)
+    SasiniDataframeManager.validate_columns(df, pl_column_mapping)
+    SasiniDataframeManager.add_missing_columns(df, pl_column_mapping)
+    return SasiniDataframeManager.regroup_by_pallet_and_caliber(df)
+
+
 class BaseSasiniService:
     def __init__(self, pl_column_mapping):
         self.pl_column_mapping = pl_column_mapping
@@ -29,31 +42,23 @@ class BaseSasiniService:
         Retourne un dictionnaire : {nom_du_container: dataframe nettoyé}
         """
         sheets = SasiniLoader.load_all_sheets(file_path)
-        result = {}
-
-        for sheet_name, df in sheets.items():
-            SasiniDataframeManager.normalize_columns(df)
-            SasiniDataframeManager.validate_columns(df, self.pl_column_mapping)
-            SasiniDataframeManager.add_missing_columns(df, self.pl_column_mapping)
-            df_cleaned = SasiniDataframeManager.regroup_by_pallet_and_caliber(df)
-            result[sheet_name] = df_cleaned
-
-        return result
+        # Feuilles traitées en parallèle, résultats dans l'ordre du classeur
+        cleaned = sheet_pool.map(_prepare_sheet, [dict(self.pl_column_mapping)] * len(sheets), sheets.values())
+        return dict(zip(sheets.keys(), cleaned))
 
 
     def _group_containers(self, dataframe):
         return SasiniContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
-        return SasiniContainerManager.filter_by_container(dataframe, "Container n°", container)
+    def _split_containers(self, dataframe, containers):
+        return SasiniContainerManager.split_by_container(dataframe, "Container n°", containers)
 
     def _process_container(self, container_df, output_dir, index, single_container):
         extracted_data = self._extract_data(container_df)
         exporter_ref = self._get_exporter_ref(container_df)
         full_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_ref
+        extracted_data["Exporter Ref"] = full_ref
 
         output_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_path, extracted_data)
@@ -92,9 +97,8 @@ class BaseSasiniService:
         return os.path.join(subfolder, f"PL_{exporter_ref}_{index}.csv")
 
     def _write_to_csv(self, path, data):
-        if not data:
+        if data is None or len(data) == 0:
             print("⚠️ Aucune donnée à écrire.")
             return
-        clean = [{k.strip(): v for k, v in row.items()} for row in data]
-        CSVManager.write_csv(path, clean)
+        CSVManager.write_csv(path, data)
         print(f"✅ CSV généré : {path}")
\ No newline at end of file
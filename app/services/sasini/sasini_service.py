@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .sasini_base import BaseSasiniService
 from ...utils.sasini.sasini_calculations import SasiniCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class SasiniService(BaseSasiniService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet n°"],
             "Exporter Name": ["Exporter name"],
@@ -67,49 +72,27 @@ class SasiniService(BaseSasiniService):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
+        extracted = ColumnMapper.map_columns(container_df, self.pl_column_mapping, self.csv_settings)
 
+        # ✅ Déduire Packaging type : "BOXES {poids}KG"
+        if "Net weight per box (kg)" in extracted:
+            packaging_types = extracted["Packaging type"] if "Packaging type" in extracted else None
+            if packaging_types is None:
+                packaging_types = pd.Series([None] * len(extracted.index), index=extracted.index, dtype=object)
+            extracted["Packaging type"] = ColumnMapper.combine(
+                self._packaging_type, extracted["Net weight per box (kg)"], packaging_types
+            )
 
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
+        return extracted
 
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
-        
-        # ✅ Déduire Packaging type : "BOXES {poids}KG"
+    def _packaging_type(self, net_weight_per_box, current_value):
         try:
-            net_weight_per_box = str(record.get("Net weight per box (kg)", "")).replace(",", ".").strip()
+            net_weight_per_box = str(net_weight_per_box).replace(",", ".").strip()
             if net_weight_per_box:
                 weight_float = float(net_weight_per_box)
                 weight_formatted = str(int(weight_float)) if weight_float.is_integer() else str(weight_float).replace(".", ",")
-                record["Packaging type"] = f"BOXES {weight_formatted}KG"
+                return f"BOXES {weight_formatted}KG"
         except Exception as e:
             print(f"⚠️ Erreur lors de la génération du Packaging type : {e}")
-            record["Packaging type"] = ""
-
-        return record
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
-
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+            return ""
+        return current_value
@@ -3,15 +3,20 @@ import os
 import pandas as pd
 from .shalimar_base import BaseShalimarService
 from ...utils.shalimar.shalimar_calculations import ShalimarCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class ShalimarService(BaseShalimarService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Pallet Number"],
             "Exporter Name": ["Exporter Name"],
@@ -68,66 +73,47 @@ class ShalimarService(BaseShalimarService):
         self.csv_settings["Archive"] = settings.get("archive", "Non")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))
-        return extracted_data
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-
-            elif csv_field == "Certifications":
-                record["Certifications"] = "GG/SMETA"
-
-            elif csv_field == "Exporter Name":
-                record["Exporter Name"] = "SHALIMAR"
-
-            else:
-                value = self._get_field_value(row, excel_columns)
-
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-
-                # Normalisation du poids unitaire pour l’ERP
-                if csv_field == "Net weight per box (kg)":
-                    # Choix du format: "2dec" retourne "4.00", "int" retourne "4"
-                    value = ShalimarCalculations.normalize_weight(value, return_format="2dec")
-
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Certifications": lambda df, excel_columns: "GG/SMETA",
+                "Exporter Name": lambda df, excel_columns: "SHALIMAR",
+                "Net weight per box (kg)": self._net_weight_per_box,
+            },
+            value_getter=self._get_field_values,
+            normalize_special=True,
+        )
 
         # Calcul automatique du nombre de fruits par carton avec le poids normalisé
-        caliber = record.get("Size_caliber_count", "")
-        weight_for_calc = record.get("Net weight per box (kg)", "")
-        nb_fruits = ShalimarCalculations.nb_of_fruits_per_box(caliber, weight_for_calc)
-        if nb_fruits != "":
-            record["Nb of fruits per box"] = nb_fruits
+        empty = pd.Series("", index=extracted.index, dtype=object)
+        caliber = extracted["Size_caliber_count"] if "Size_caliber_count" in extracted else empty
+        weight_for_calc = extracted["Net weight per box (kg)"] if "Net weight per box (kg)" in extracted else empty
+        nb_fruits = ColumnMapper.combine(ShalimarCalculations.nb_of_fruits_per_box, caliber, weight_for_calc)
+        if "Nb of fruits per box" in extracted:
+            extracted["Nb of fruits per box"] = nb_fruits.where(nb_fruits != "", extracted["Nb of fruits per box"])
+        elif (nb_fruits != "").any():
+            extracted["Nb of fruits per box"] = nb_fruits
 
         # Remplir automatiquement Packaging type si vide, basé sur le poids normalisé
-        if not record.get("Packaging type"):
-            w_num = ShalimarCalculations._extract_numeric(weight_for_calc)
-            record["Packaging type"] = f"COLIS {int(w_num)}KG" if w_num is not None else "COLIS KG"
-
-        return record
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]) and str(row[col]).strip() != "":
-                return row[col]
-        if len(excel_columns) == 1:
-            fallback_col = excel_columns[0]
-            if fallback_col in row.index:
-                return row[fallback_col]
-        return ""
-
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        packaging_types = extracted["Packaging type"] if "Packaging type" in extracted else empty
+        missing = packaging_types.map(lambda v: not v).astype(bool)
+        defaults = weight_for_calc.map(self._packaging_type_from_weight)
+        extracted["Packaging type"] = packaging_types.where(~missing, defaults)
+
+        return extracted
+
+    def _net_weight_per_box(self, container_df, excel_columns):
+        # Normalisation du poids unitaire pour l’ERP
+        # Choix du format: "2dec" retourne "4.00", "int" retourne "4"
+        values = self._get_field_values(container_df, excel_columns)
+        return values.map(lambda v: ShalimarCalculations.normalize_weight(v, return_format="2dec"))
+
+    def _packaging_type_from_weight(self, weight):
+        w_num = ShalimarCalculations._extract_numeric(weight)
+        return f"COLIS {int(w_num)}KG" if w_num is not None else "COLIS KG"
+
+    def _get_field_values(self, df, excel_columns):
+        # Une seule colonne candidate : valeur brute, même vide
+        if len(excel_columns) == 1 and excel_columns[0] in df.columns:
+            return df[excel_columns[0]].astype(object)
+        return ColumnMapper.first_value(df, excel_columns, skip_blank=True)
@@ -26,11 +26,10 @@ class BaseSFAService:
 
         generated_files = []
 
-        for index, container in enumerate(containers, start=1):
-            container_dataframe = self._filter_container(dataframe, container)
+        for index, (container, container_dataframe) in enumerate(self._split_containers(dataframe, containers), start=1):
             
             if not isinstance(container_dataframe, pd.DataFrame):
-                print(f"❌ ERREUR: `_filter_container` a retourné un type incorrect: {type(container_dataframe)}")
+                print(f"❌ ERREUR: `_split_containers` a retourné un type incorrect: {type(container_dataframe)}")
                 continue
 
             output_file = self._process_container(container_dataframe, output_dir, index, len(containers) == 1)
@@ -45,7 +44,7 @@ class BaseSFAService:
         return generated_files
 
     def _prepare_dataframe(self, file_path):
-        dataframe = SFALoader.load_excel_file(file_path)
+        dataframe = SFALoader.load_excel_file(file_path, column_mapping=self.pl_column_mapping)
 
         if dataframe.empty:
             print("❌ ERREUR: Le fichier Excel est vide ou non lisible !")
@@ -71,17 +70,11 @@ class BaseSFAService:
 
         return containers
 
-    def _filter_container(self, dataframe, container):
+    def _split_containers(self, dataframe, containers):
         """
-        Filtre les données pour un conteneur spécifique.
+        Découpe les données par conteneur, en une seule passe.
         """
-        filtered = ContainerManager.filter_by_container(dataframe, "Container No", container)
-
-        if not isinstance(filtered, pd.DataFrame):
-            print(f"❌ ERREUR: `_filter_container` ne retourne pas un DataFrame mais {type(filtered)}")
-            return pd.DataFrame()  # Retourne un DataFrame vide si problème
-
-        return filtered
+        return ContainerManager.split_by_container(dataframe, "Container No", containers)
 
     def _process_container(self, container_dataframe, output_dir, index, single_container):
         """
@@ -92,8 +85,7 @@ class BaseSFAService:
         exporter_ref = self._get_exporter_ref(container_dataframe)
         full_exporter_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_exporter_ref
+        extracted_data["Exporter Ref"] = full_exporter_ref
 
         output_csv_path = self._generate_csv_filename(output_dir, exporter_ref, index)
         self._write_to_csv(output_csv_path, extracted_data)
@@ -130,7 +122,7 @@ class BaseSFAService:
         """
         Écrit les données extraites dans un fichier CSV.
         """
-        if not extracted_data:
+        if extracted_data is None or len(extracted_data) == 0:
             print(f"⚠️ Aucune donnée à écrire dans {output_csv_path}, fichier non généré.")
             return None
 
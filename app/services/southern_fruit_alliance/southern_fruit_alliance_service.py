@@ -1,13 +1,21 @@
 from .southern_fruit_alliance_base import BaseSFAService
 from ...utils.southern_fruit_alliance.southern_fruit_alliance_calculation import Calculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 import pandas as pd
 
 class SFAService(BaseSFAService):
     def __init__(self):
         self.csv_settings = {}
-        super().__init__(pl_column_mapping=self._initialize_column_mapping())
+        super().__init__(pl_column_mapping=SupplierTemplate.of(type(self)).pl_column_mapping)
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+    # Valeurs de paramètres écrites vides, comme à l'extraction
+    SETTINGS_EMPTY_VALUES = [None, "", "Non spécifié"]
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["PALLET NO"],
             "Exporter Name": ["EXPORTER NAME"],
@@ -70,18 +78,23 @@ class SFAService(BaseSFAService):
         """
         Méthode spécialisée pour extraire les données d'une PL SFA.
         """
-        extracted_data = []
-        pallet_totals = self._calculate_pallet_totals(container_dataframe)
-
-        for _, row in container_dataframe.iterrows():
-            record = self._extract_row_data(row, pallet_totals)
-            extracted_data.append(record)
-
-        if not extracted_data:
+        self._calculate_pallet_totals(container_dataframe)
+
+        extracted = ColumnMapper.map_columns(
+            container_dataframe, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Country of origin": lambda df, excel_columns: self.csv_settings.get("Country of origin", "ZA"),
+                "Exporter name": self._exporter_name,
+            },
+            date_getter=ColumnMapper.first_date,
+            empty_values=[None, "", "Non spécifié"],
+            normalize_settings=True,
+            normalize_special=True,
+        )
+        if extracted.empty:
             print("⚠️ Aucune donnée extraite ! Vérifie ton extraction.")
-            return []
 
-        return extracted_data
+        return extracted
 
     def _calculate_pallet_totals(self, container_dataframe):
         """
@@ -104,71 +117,23 @@ class SFAService(BaseSFAService):
 
         return container_dataframe.groupby("PALLET NO").agg(agg_dict)
 
-
-    def _extract_row_data(self, row, pallet_totals):
-        """
-        Extrait les données d'une ligne spécifique en appliquant les paramètres CSV.
-        """
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                record[csv_field] = self._process_field(csv_field, excel_columns, row, pallet_totals)
-
-                if csv_field in date_fields:
-                    record[csv_field] = self._process_date_field(row, excel_columns)
-
-            if record[csv_field] in [None, "", "Non spécifié"]:
-                record[csv_field] = ""
-
-        return record
-
-
-    def _process_field(self, csv_field, excel_columns, row, pallet_totals):
-        """
-        Traite un champ spécifique en fonction de sa logique.
-        """
-        if csv_field == "Country of origin":
-            return self.csv_settings.get("Country of origin", "ZA")
-
-        if csv_field == "Exporter name":
-            supplier_code_map = {
-                "zestfruit": "Z6",
-                "komati": "KV",
-                "mahela": "9J",
-                "grosa": "7V"
-            }
-            fournisseur = str(self.csv_settings.get("Fournisseur", "")).strip().lower()
-            prefix = supplier_code_map.get(fournisseur, "")
-            if not prefix:
-                print(f"⚠️ Fournisseur inconnu ou non mappé : '{fournisseur}'")
-            return f"{prefix}-{row.get('Producer ID', '').strip()}" if prefix else row.get("Producer ID", "").strip()
-
-        return self._get_field_value(row, excel_columns)
-
-    def _process_date_field(self, row, excel_columns):
+    def _exporter_name(self, container_dataframe, excel_columns):
         """
-        Traite les champs de type date et les formate en 'dd/mm/yyyy'.
+        Préfixe le Producer ID avec le code du fournisseur.
         """
-        for excel_column in excel_columns:
-            value = row.get(excel_column, "")
-
-            try:
-                if pd.notnull(value) and value != "":
-                    return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-            except Exception as e:
-                print(f"⚠️ Erreur conversion date `{excel_column}`: {e}")
-
-        return ""
-
-    def _get_field_value(self, row, excel_columns):
-        """
-        Récupère la valeur brute d'une colonne Excel correspondant à un champ CSV.
-        """
-        for excel_column in excel_columns:
-            if excel_column in row.index and pd.notna(row[excel_column]):
-                return row[excel_column]
-        return ""
+        supplier_code_map = {
+            "zestfruit": "Z6",
+            "komati": "KV",
+            "mahela": "9J",
+            "grosa": "7V"
+        }
+        fournisseur = str(self.csv_settings.get("Fournisseur", "")).strip().lower()
+        prefix = supplier_code_map.get(fournisseur, "")
+        if not prefix:
+            print(f"⚠️ Fournisseur inconnu ou non mappé : '{fournisseur}'")
+
+        if "Producer ID" in container_dataframe.columns:
+            producer_ids = container_dataframe["Producer ID"].astype(object)
+        else:
+            producer_ids = pd.Series("", index=container_dataframe.index, dtype=object)
+        return producer_ids.map(lambda producer_id: f"{prefix}-{producer_id.strip()}" if prefix else producer_id.strip())
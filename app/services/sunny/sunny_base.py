@@ -22,8 +22,7 @@ class BaseSunnyService:
 
         generated_files = []
 
-        for index, container in enumerate(containers, start=1):
-            container_dataframe = self._filter_container(dataframe, container)
+        for index, (container, container_dataframe) in enumerate(self._split_containers(dataframe, containers), start=1):
             output_csv_path = self._process_container(container_dataframe, output_dir, index, len(containers) == 1)
 
             if output_csv_path:
@@ -41,7 +40,7 @@ class BaseSunnyService:
 
 
     def _prepare_dataframe(self, file_path):
-        dataframe = SunnyLoader.load_excel_file(file_path)
+        dataframe = SunnyLoader.load_excel_file(file_path, column_mapping=self.pl_column_mapping)
 
         if dataframe is None or dataframe.empty:  # Vérification renforcée
             print("❌ ERREUR: Le fichier Excel est vide ou non lisible !")
@@ -63,11 +62,11 @@ class BaseSunnyService:
         """
         return SunnyContainerManager.group_by_container(dataframe)
 
-    def _filter_container(self, dataframe, container):
+    def _split_containers(self, dataframe, containers):
         """
-        Filtre les données pour un conteneur spécifique.
+        Découpe les données par conteneur, en une seule passe.
         """
-        return SunnyContainerManager.filter_by_container(dataframe, "Container", container)
+        return SunnyContainerManager.split_by_container(dataframe, "Container", containers)
 
     
     def _process_container(self, container_dataframe, output_dir, index, single_container):
@@ -81,15 +80,14 @@ class BaseSunnyService:
         print(f"📌 Traitement du conteneur {index}...")
 
         extracted_data = self._extract_data(container_dataframe)
-        if not extracted_data:
+        if extracted_data is None or len(extracted_data) == 0:
             print(f"⚠️ Conteneur {index}: Aucune donnée extraite, fichier CSV non généré.")
             return None  
 
         exporter_ref = self._get_exporter_ref(container_dataframe)
         full_exporter_ref = exporter_ref if single_container else f"{exporter_ref}_{index}"
 
-        for row in extracted_data:
-            row["Exporter Ref"] = full_exporter_ref
+        extracted_data["Exporter Ref"] = full_exporter_ref
 
         output_csv_path = self._generate_csv_filename(output_dir, exporter_ref, index)
 
@@ -139,7 +137,7 @@ class BaseSunnyService:
         """
         Écrit les données extraites dans un fichier CSV.
         """
-        if not extracted_data or len(extracted_data) == 0:
+        if extracted_data is None or len(extracted_data) == 0:
             print(f"⚠️ Aucune donnée à écrire dans {output_csv_path}, fichier non généré.")
             return None
 
@@ -1,18 +1,26 @@
 from .sunny_base import BaseSunnyService
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
+from ...utils.date_normalizer import DateNormalizer
+import logging
 import pandas as pd
 import os
 
+logger = logging.getLogger(__name__)
+
 
 class SunnyService(BaseSunnyService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}  # Stocke les paramètres CSV envoyés par le front
-        
-        # Debug pour voir si les colonnes existent bien dans le fichier Excel
-        print("📌 Colonnes mappées pour SunnyService :", pl_column_mapping)
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+    # Valeurs de paramètres écrites vides, comme à l'extraction
+    SETTINGS_EMPTY_VALUES = [None, "", "Non spécifié"]
+
+    @staticmethod
+    def _initialize_column_mapping():
         """
         Initialise le mappage des colonnes entre le fichier Excel et le CSV.
         """
@@ -87,82 +95,24 @@ class SunnyService(BaseSunnyService):
             print(f"❌ ERREUR: _extract_data() a reçu un type invalide : {type(container_df)}")
             return []
 
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            record = self._extract_row_data(row)
-            extracted_data.append(record)
-
-        if not extracted_data:
-            print("⚠️ Aucune donnée extraite ! Vérifie ton extraction.")
-            return []
-
-        return extracted_data
-
-
-
-    def _extract_row_data(self, row):
-        """
-        Extrait les données d'une ligne spécifique en appliquant les paramètres CSV.
-        """
-        if not isinstance(row, pd.Series):
-            print(f"❌ ERREUR: _extract_row_data() a reçu un type invalide : {type(row)}")
-            return {}
-
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
+        for csv_field in self.pl_column_mapping:
             if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                print(f"✅ Remplacement {csv_field} → {self.csv_settings[csv_field]}")
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                record[csv_field] = self._get_field_value(row, excel_columns)
-
-                if csv_field in date_fields:
-                    record[csv_field] = self._process_date_field(row, excel_columns)
-
-            if record[csv_field] in [None, "", "Non spécifié"]:
-                record[csv_field] = ""
-
-        return record
-
-
-    def _get_field_value(self, row, excel_columns):
-        """
-        Récupère la valeur brute d'une colonne Excel correspondant à un champ CSV.
-        """
-        for excel_column in excel_columns:
-            if excel_column in row.index:
-                value = row[excel_column]
-
-                if pd.notna(value):
-                    return value
-
-        return ""
+                logger.debug("✅ Remplacement %s → %s", csv_field, self.csv_settings[csv_field])
+
+        extracted = ColumnMapper.map_columns(
+            container_df, self.pl_column_mapping, self.csv_settings,
+            date_getter=self._get_date_values,
+            empty_values=[None, "", "Non spécifié"],
+            normalize_settings=True,
+        )
+        if extracted.empty:
+            print("⚠️ Aucune donnée extraite ! Vérifie ton extraction.")
 
+        return extracted
 
-    def _process_date_field(self, row, excel_columns):
+    def _get_date_values(self, container_df, excel_columns):
         """
-        Traite les champs de type date et les formate en 'dd/mm/yyyy'.
+        Première valeur renseignée parmi les colonnes de date, formatée en 'dd/mm/yyyy'.
         """
-        for excel_column in excel_columns:
-            if excel_column in row.index:
-                value = row[excel_column]
-
-                if isinstance(value, str):
-                    value = value.strip()  # Nettoyer les espaces autour des valeurs
-
-                try:
-                    if pd.notnull(value) and value != "":
-                        date_value = pd.to_datetime(value, errors='coerce')
-
-                        if pd.isnull(date_value):
-                            print(f"⚠️ Erreur conversion date `{excel_column}`: valeur incorrecte -> {value}")
-                            return ""
-
-                        return date_value.strftime("%d/%m/%Y")
-                except Exception as e:
-                    print(f"⚠️ Erreur conversion date `{excel_column}`: {e}")
-
-        return ""
-
+        values = ColumnMapper.first_value(container_df, excel_columns, skip_blank=True, strip=True)
+        return DateNormalizer.format_series(values)
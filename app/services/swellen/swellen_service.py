@@ -2,15 +2,20 @@ import os
 import pandas as pd
 from .swellen_base import BaseSwellenService
 from ...utils.swellen.swellen_calculations import SwellenCalculations
+from ...utils.column_mapper import ColumnMapper
+from ...utils.supplier_template import SupplierTemplate
 
 
 class SwellenService(BaseSwellenService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination", "Exporter Name")
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["PalletId"],
             "Exporter Name": [""],
@@ -68,54 +73,20 @@ class SwellenService(BaseSwellenService):
         self.csv_settings["Exporter Name"] = settings.get("exporter_name", "SWELLEN FRUIT")
 
     def _extract_data(self, container_df):
-        extracted_data = []
-        for _, row in container_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, container_df))  
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                record[csv_field] = self.csv_settings[csv_field]
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field in date_fields:
-                    value = self._process_date_field(value)
-                record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        extracted = ColumnMapper.map_columns(container_df, self.pl_column_mapping, self.csv_settings)
 
         # ✅ Toujours recalculer Net weight per box (kg) depuis Mass et CtnQty
-        mass = self._get_field_value(row, ["Net weight per pallet (kg)", "Mass"])
-        cartons = self._get_field_value(row, ["Cartons per pallet", "CtnQty"])
-        record["Net weight per box (kg)"] = SwellenCalculations.net_weight_per_box(mass, cartons)
+        mass = ColumnMapper.first_value(container_df, ["Net weight per pallet (kg)", "Mass"])
+        cartons = ColumnMapper.first_value(container_df, ["Cartons per pallet", "CtnQty"])
+        extracted["Net weight per box (kg)"] = ColumnMapper.combine(SwellenCalculations.net_weight_per_box, mass, cartons)
 
         # ✅ Tare recalculée selon le nombre de cartons
-        cartons = self._get_field_value(row, self.pl_column_mapping.get("Cartons per pallet", []))
-        record["Box tare (kg)"] = SwellenCalculations.box_tare(cartons)
+        cartons = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Cartons per pallet", []))
+        extracted["Box tare (kg)"] = cartons.map(SwellenCalculations.box_tare)
 
         # ✅ Nombre de fruits par boîte selon le poids (recalculé), le calibre et l'espèce
-        caliber = self._get_field_value(row, self.pl_column_mapping.get("Size_caliber_count", []))
-        species = self._get_field_value(row, self.pl_column_mapping.get("Species", []))
-        record["Nb of fruits per box"] = SwellenCalculations.nb_of_fruits_per_box(caliber, species)
-
-        return record
-
-
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
+        caliber = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Size_caliber_count", []))
+        species = ColumnMapper.first_value(container_df, self.pl_column_mapping.get("Species", []))
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(SwellenCalculations.nb_of_fruits_per_box, caliber, species)
 
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        return extracted
@@ -4,15 +4,23 @@ import datetime
 from .viru_base import BaseViruService
 from ...utils.viru.viru_calculations import ViruCalculations
 from ...utils.viru.viru_df_manager import ViruDataframeManager
+from ...utils.column_mapper import ColumnMapper, EMPTY_VALUES
+from ...utils.supplier_template import SupplierTemplate
+from ...utils.date_normalizer import DateNormalizer
 
 
 class ViruService(BaseViruService):
     def __init__(self):
-        pl_column_mapping = self._initialize_column_mapping()
-        super().__init__(pl_column_mapping)
+        super().__init__(SupplierTemplate.of(type(self)).pl_column_mapping)
         self.csv_settings = {}
 
-    def _initialize_column_mapping(self):
+    # Colonnes du CSV remplies depuis les paramètres CSV (réécrites par /extractions/{id}/rerender)
+    SETTINGS_COLUMNS = ("Country of origin", "Forwarder at destination")
+    # Valeurs de paramètres écrites vides, comme à l'extraction
+    SETTINGS_EMPTY_VALUES = EMPTY_VALUES
+
+    @staticmethod
+    def _initialize_column_mapping():
         return {
             "Pallet no": ["Supplier pallet number"],
             "Exporter Name": ["Exporter Name"],
@@ -72,60 +80,33 @@ class ViruService(BaseViruService):
         # Étape 1 : regrouper les palettes mixtes par numéro + calibre
         grouped_df = ViruDataframeManager.regroup_by_pallet_and_caliber(container_df)
 
-        # Étape 2 : extraire les données ligne par ligne
-        extracted_data = []
-        for _, row in grouped_df.iterrows():
-            extracted_data.append(self._extract_row_data(row, grouped_df))
-        return extracted_data
-
-
-    def _extract_row_data(self, row, df):
-        record = {}
-        date_fields = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
-
-        for csv_field, excel_columns in self.pl_column_mapping.items():
-            if csv_field in self.csv_settings and self.csv_settings[csv_field] is not None:
-                value = self.csv_settings[csv_field]
-            elif csv_field == "Certifications":
-                value = "GG/SMETA"
-            else:
-                value = self._get_field_value(row, excel_columns)
-                if csv_field == "ETA":
-                    if value in ["", None]:
-                        value = datetime.datetime.now().strftime("%d/%m/%Y")
-                    else:
-                        value = self._process_date_field(value)
-
-                elif csv_field in date_fields:
-                    value = self._process_date_field(value)
-
-            record[csv_field] = value if value not in [None, "Non spécifié"] else ""
+        # Étape 2 : extraire les données colonne par colonne
+        extracted = ColumnMapper.map_columns(
+            grouped_df, self.pl_column_mapping, self.csv_settings,
+            special_fields={
+                "Certifications": lambda df, excel_columns: "GG/SMETA",
+                "ETA": self._eta,
+            },
+            normalize_settings=True,
+            normalize_special=True,
+        )
 
         # 🔹 Calculs complémentaires
-        caliber = self._get_field_value(row, ["Size"])
-        weight = self._get_field_value(row, ["Net weight box(kg)"])
-        cartons = self._get_field_value(row, ["Number of boxes"])
-
-        record["Nb of fruits per box"] = ViruCalculations.nb_of_fruits_per_box(caliber, weight)
-        record["Nb of pallets"] = self._get_field_value(row, ["Nb of pallets"])
-        record["Net weight per pallet (kg)"] = ViruCalculations.net_weight_per_pallet(cartons, weight)
-        record["Box tare (kg)"] = ViruCalculations.box_tare(weight)
-
-        return record
-
-
-    def _get_field_value(self, row, excel_columns):
-        for col in excel_columns:
-            if col in row.index and pd.notna(row[col]):
-                return row[col]
-        return ""
-
-    def _process_date_field(self, value):
-        try:
-            if pd.notnull(value) and value != "":
-                return pd.to_datetime(value, errors='coerce').strftime("%d/%m/%Y")
-        except Exception as e:
-            print(f"⚠️ Erreur conversion date: {e}")
-        return ""
+        caliber = ColumnMapper.first_value(grouped_df, ["Size"])
+        weight = ColumnMapper.first_value(grouped_df, ["Net weight box(kg)"])
+        cartons = ColumnMapper.first_value(grouped_df, ["Number of boxes"])
+
+        extracted["Nb of fruits per box"] = ColumnMapper.combine(ViruCalculations.nb_of_fruits_per_box, caliber, weight)
+        extracted["Nb of pallets"] = ColumnMapper.first_value(grouped_df, ["Nb of pallets"])
+        extracted["Net weight per pallet (kg)"] = ColumnMapper.combine(ViruCalculations.net_weight_per_pallet, cartons, weight)
+        extracted["Box tare (kg)"] = weight.map(ViruCalculations.box_tare)
+
+        return extracted
+
+    def _eta(self, df, excel_columns):
+        # ETA absente : date du jour
+        today = datetime.datetime.now().strftime("%d/%m/%Y")
+        values = ColumnMapper.first_value(df, excel_columns)
+        return DateNormalizer.format_series(values).mask(values.map(lambda v: v in ["", None]).astype(bool), today)
 
 
@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class AlgContainerManager:
     @staticmethod
     def group_by_container(df, container_column="Container No"):
@@ -9,8 +12,9 @@ class AlgContainerManager:
         return df[container_column].dropna().unique()
 
     @staticmethod
-    def filter_by_container(df, container_column, container):
+    def split_by_container(df, column_name, containers):
         """
-        Filtre les données pour un conteneur spécifique.
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
         """
-        return df[df[container_column] == container]
+        return ContainerSplitter.split(df, column_name, containers)
@@ -1,21 +1,23 @@
-import pandas as pd
 import os
 
+from ..workbook import Workbook
+
 class AlgLoader:
+    # Colonne lue en dehors du mapping : poids brut sommé au regroupement
+    EXTRA_COLUMNS = ("Gross Weight",)
+
     @staticmethod
-    def load_excel_file(file_path, sheet_name="Sheet1", header=0):
+    def load_excel_file(file_path, sheet_name="Sheet1", header=0, column_mapping=None):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Le fichier spécifié n'existe pas : {file_path}")
 
-        if file_path.endswith(".xlsx"):
-            engine = "openpyxl"
-        elif file_path.endswith(".xls"):
-            engine = "xlrd"
-        else:
+        if not file_path.endswith((".xlsx", ".xls")):
             raise ValueError("Format de fichier non pris en charge. Utilisez .xlsx ou .xls.")
 
         try:
-            dataframe = pd.read_excel(file_path, sheet_name=sheet_name, header=header, engine=engine)
+            columns = Workbook.template_columns(column_mapping, AlgLoader.EXTRA_COLUMNS)
+            workbook = Workbook(file_path, sheet_name, columns=columns, header_row=header)
+            dataframe = workbook.read(header=header)
             return dataframe
         except Exception as e:
             raise ValueError(f"Erreur lors du chargement du fichier '{file_path}' avec la feuille '{sheet_name}': {e}")
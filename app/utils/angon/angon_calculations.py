@@ -1,4 +1,8 @@
+import logging
 import pandas as pd
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
 
 class AngonCalculations:
     @staticmethod
@@ -12,34 +16,20 @@ class AngonCalculations:
             elif weight == 10:
                 return int(round(caliber * 2.5))
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
         return ""
 
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
+    def nb_of_pallets_by_palletnum(df, current_values=None):
         """
-        Calcule le nombre de palettes basé sur la répartition des cartons si non fourni.
+        Nb of pallets de chaque ligne du container (palette "Pallet", cartons "Carton") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
         """
-        try:
-            if current_value not in [None, "", "Non spécifié"]:
-                return current_value
-
-            if pd.isna(pallet_num) or pd.isna(boxes):
-                return ""
-
-            lignes = df[df["Pallet"] == pallet_num]
-            if len(lignes) == 1:
-                return "1,00000"
-
-            total = lignes["Carton"].dropna().astype(float).sum()
-            boxes = float(str(boxes).replace(",", "."))
-
-            if total > 0:
-                ratio = boxes / total
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {e}")
-        return ""
+        return PalletCalculations.nb_of_pallets_by_palletnum(
+            df, "Pallet", "Carton", current_values,
+            empty_values=[None, "", "Non spécifié"],
+            parse_boxes=lambda boxes: float(str(boxes).replace(",", ".")),
+        )
 
     @staticmethod
     def box_tare(value):
@@ -48,5 +38,5 @@ class AngonCalculations:
                 return "0"
             return value
         except Exception as e:
-            print(f"⚠️ Erreur box_tare: {e}")
+            logger.debug("⚠️ Erreur box_tare: %s", e)
         return "0"
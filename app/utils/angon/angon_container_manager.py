@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class AngonContainerManager:
     @staticmethod
     def group_by_container(df):
@@ -6,7 +9,12 @@ class AngonContainerManager:
         return containers
 
     @staticmethod
-    def filter_by_container(df, column_name, container_value):
-        filtered = df[df[column_name] == container_value]
-        print(f"🔍 Données filtrées pour container {container_value} : {len(filtered)} lignes")
-        return filtered
\ No newline at end of file
+    def split_by_container(df, column_name, containers):
+        """
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
+        """
+        parts = ContainerSplitter.split(df, column_name, containers)
+        for container_value, filtered in parts:
+            print(f"🔍 Données filtrées pour container {container_value} : {len(filtered)} lignes")
+        return parts
\ No newline at end of file
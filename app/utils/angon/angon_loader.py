@@ -1,8 +1,12 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class AngonLoader:
+    # Toutes les colonnes lues figurent dans le mapping
+    EXTRA_COLUMNS = ()
+
     @staticmethod
-    def load_excel_file(file_path):
-        df = pd.read_excel(file_path, sheet_name="Sheet1", dtype=str)
+    def load_excel_file(file_path, column_mapping=None):
+        columns = Workbook.template_columns(column_mapping, AngonLoader.EXTRA_COLUMNS)
+        df = Workbook(file_path, "Sheet1", columns=columns).read(dtype=str)
         print(f"📅 [AngonLoader] Chargement réussi : {len(df)} lignes")
         return df
\ No newline at end of file
@@ -1,4 +1,8 @@
+import logging
 import pandas as pd
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
 
 class AthosCalculations:
     @staticmethod
@@ -17,38 +21,17 @@ class AthosCalculations:
             elif weight == 10:
                 return int(round(caliber * 2.5))
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
         return ""
     
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
+    def nb_of_pallets_by_palletnum(df, current_values=None):
         """
-        Calcule le nombre de palettes si non défini :
-        - Si une seule ligne → 1,00000
-        - Sinon → ratio (boxes / total_boxes pour cette palette)
-        - Si déjà défini (current_value), retourne sa valeur
+        Nb of pallets de chaque ligne du container (palette "Pallet n°", cartons "Quantity per grower") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
         """
-        try:
-            if current_value not in [None, "", "0", "0,00000"]:
-                return current_value
-
-            if pd.isna(pallet_num) or pd.isna(boxes):
-                return ""
-
-            lignes = df[df["Pallet n°"] == pallet_num]
+        return PalletCalculations.nb_of_pallets_by_palletnum(df, "Pallet n°", "Quantity per grower", current_values)
 
-            if len(lignes) == 1:
-                return "1,00000"
-
-            total_boxes = lignes["Quantity per grower"].dropna().astype(float).sum()
-            boxes = float(boxes)
-
-            if total_boxes > 0:
-                ratio = boxes / total_boxes
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {e}")
-            
     @staticmethod
     def get_packaging_type(weight):
         """
@@ -64,7 +47,7 @@ class AthosCalculations:
             elif weight == 10:
                 return "Colis 10kg"
         except Exception as e:
-            print(f"⚠️ Erreur get_packaging_type: {e}")
+            logger.debug("⚠️ Erreur get_packaging_type: %s", e)
         return ""
 
     @staticmethod
@@ -76,7 +59,7 @@ class AthosCalculations:
             if str(cat_value).strip().upper() == "CAT 1.5":
                 return "ATHOS B"
         except Exception as e:
-            print(f"⚠️ Erreur get_brand_from_class: {e}")
+            logger.debug("⚠️ Erreur get_brand_from_class: %s", e)
         return default_brand
 
     @staticmethod
@@ -90,6 +73,6 @@ class AthosCalculations:
                 value = value.replace("KG", "").strip().replace(",", ".")
             return float(value)
         except Exception as e:
-            print(f"⚠️ Erreur clean_weight_value: {e}")
+            logger.debug("⚠️ Erreur clean_weight_value: %s", e)
             return ""
 
@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class AthosContainerManager:
     @staticmethod
     def group_by_container(df):
@@ -9,10 +12,12 @@ class AthosContainerManager:
         return containers
 
     @staticmethod
-    def filter_by_container(df, column_name, container_value):
+    def split_by_container(df, column_name, containers):
         """
-        Filtre le DataFrame pour un container donné.
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
         """
-        filtered = df[df[column_name] == container_value]
-        print(f"🔍 Données filtrées pour container {container_value} : {len(filtered)} lignes")
-        return filtered
+        parts = ContainerSplitter.split(df, column_name, containers)
+        for container_value, filtered in parts:
+            print(f"🔍 Données filtrées pour container {container_value} : {len(filtered)} lignes")
+        return parts
@@ -1,4 +1,8 @@
+import logging
 import pandas as pd
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
 
 class AthosV2Calculations:
     @staticmethod
@@ -17,34 +21,13 @@ class AthosV2Calculations:
             elif weight == 10:
                 return int(round(caliber * 2.5))
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
         return ""
     
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
+    def nb_of_pallets_by_palletnum(df, current_values=None):
         """
-        Calcule le nombre de palettes si non défini :
-        - Si une seule ligne → 1,00000
-        - Sinon → ratio (boxes / total_boxes pour cette palette)
-        - Si déjà défini (current_value), retourne sa valeur
+        Nb of pallets de chaque ligne du container (palette "Pallet Number", cartons "Cartons per pallet") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
         """
-        try:
-            if current_value not in [None, "", "0", "0,00000"]:
-                return current_value
-
-            if pd.isna(pallet_num) or pd.isna(boxes):
-                return ""
-
-            lignes = df[df["Pallet Number"] == pallet_num]
-
-            if len(lignes) == 1:
-                return "1,00000"
-
-            total_boxes = lignes["Cartons per pallet"].dropna().astype(float).sum()
-            boxes = float(boxes)
-
-            if total_boxes > 0:
-                ratio = boxes / total_boxes
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {e}")
\ No newline at end of file
+        return PalletCalculations.nb_of_pallets_by_palletnum(df, "Pallet Number", "Cartons per pallet", current_values)
@@ -1,14 +1,30 @@
 import pandas as pd
 import re 
+from ..workbook import Workbook
 
 
 class AthosV2Loader:
+    # En-tête du tableau en ligne 19 ; métadonnées dans les colonnes A à P (D7:D16, B1:P3)
+    HEADER_ROW = 18
+    METADATA_COLS = 16
+    # Colonnes lues en dehors du mapping : référence du nom de fichier, en-tête container renommé
+    EXTRA_COLUMNS = ("Exporter ref", "Container n°", "Container n° (ABCD1234567)")
+
+    @staticmethod
+    def open_workbook(file_path, column_mapping=None):
+        """
+        Analyse la feuille une seule fois, limitée aux colonnes du tableau et des métadonnées.
+        """
+        columns = Workbook.template_columns(column_mapping, AthosV2Loader.EXTRA_COLUMNS)
+        return Workbook(file_path, columns=columns, header_row=AthosV2Loader.HEADER_ROW,
+                        min_col=AthosV2Loader.METADATA_COLS)
+
     @staticmethod
     def load_excel_file(file_path):
         """
         Charge uniquement le fichier Excel complet, sans l'analyser.
         """
-        df = pd.read_excel(file_path, header=None, dtype=str)  # sans entête
+        df = Workbook.of(file_path).read(header=None, dtype=str)  # sans entête
         return df
 
     @staticmethod
@@ -32,7 +48,7 @@ class AthosV2Loader:
         """
         Charge uniquement le tableau commençant à B19 (entêtes) / B20 (data).
         """
-        df = pd.read_excel(file_path, header=18, dtype=str)  # header à la ligne 19 (index 18)
+        df = Workbook.of(file_path).read(header=18, dtype=str)  # header à la ligne 19 (index 18)
         print(f"📊 [AthosV2Loader] Tableau extrait : {len(df)} lignes")
         return df
 
@@ -0,0 +1,146 @@
+import pandas as pd
+
+from .date_normalizer import DateNormalizer
+
+# Champs CSV contenant des dates (formatées en dd/mm/yyyy)
+DATE_FIELDS = ["ETA", "ETD", "Packing house departure date", "Date of packaging", "Date of harvesting"]
+
+# Valeurs remplacées par une chaîne vide dans le CSV
+EMPTY_VALUES = [None, "Non spécifié"]
+
+
+class ColumnMapper:
+    """
+    Construit le tableau de sortie d'un container colonne par colonne à partir du `pl_column_mapping`,
+    au lieu de parcourir chaque ligne avec iterrows.
+
+    Pour chaque champ CSV, dans l'ordre du mapping :
+    1. valeur fixe issue de `csv_settings` si elle est définie (non None) ;
+    2. sinon règle spécifique du fournisseur (`special_fields`) ;
+    3. sinon première colonne Excel renseignée parmi les colonnes candidates,
+       convertie par DateNormalizer pour les champs de `date_fields`, puis normalisée (EMPTY_VALUES → "").
+    """
+
+    @staticmethod
+    def first_value(df, excel_columns, skip_blank=False, strip=False):
+        """
+        Équivalent colonne de `_get_field_value` : pour chaque ligne, la valeur de la première
+        colonne présente et non vide (NaN) de `excel_columns`, sinon "".
+
+        :param skip_blank: ignore aussi les chaînes vides ou composées d'espaces.
+        :param strip: retire les espaces autour des chaînes retournées.
+        """
+        result = pd.Series("", index=df.index, dtype=object)
+        found = pd.Series(False, index=df.index)
+
+        for excel_column in excel_columns:
+            if excel_column not in df.columns:
+                continue
+
+            values = df[excel_column].astype(object)
+            if strip:
+                values = values.map(lambda v: v.strip() if isinstance(v, str) else v)
+
+            valid = values.notna() & ~found
+            if skip_blank:
+                valid &= values.astype(str).str.strip() != ""
+
+            result[valid] = values[valid]
+            found |= valid
+
+        return result
+
+    @staticmethod
+    def column(df, excel_column, default=""):
+        """
+        Équivalent colonne de `row.get(excel_column, default)` : valeurs brutes (NaN compris).
+        """
+        if excel_column in df.columns:
+            return df[excel_column].astype(object)
+        return pd.Series([default] * len(df.index), index=df.index, dtype=object)
+
+    @staticmethod
+    def first_date(df, excel_columns, dayfirst=False, date_format=None):
+        """
+        Pour chaque ligne, la première date valide parmi `excel_columns`, formatée en 'dd/mm/yyyy'.
+        """
+        result = pd.Series("", index=df.index, dtype=object)
+        found = pd.Series(False, index=df.index)
+
+        for excel_column in excel_columns:
+            if excel_column not in df.columns:
+                continue
+
+            formatted = DateNormalizer.format_series(df[excel_column], dayfirst, date_format)
+            valid = (formatted != "") & ~found
+            result[valid] = formatted[valid]
+            found |= valid
+
+        return result
+
+    @staticmethod
+    def normalize(values, empty_values=EMPTY_VALUES, replacement=""):
+        """
+        Remplace les valeurs de `empty_values` par `replacement` (colonne ou valeur scalaire).
+        """
+        if not isinstance(values, pd.Series):
+            return replacement if values in empty_values else values
+
+        strings = [value for value in empty_values if value is not None]
+        mask = values.isin(strings)
+        if None in empty_values:
+            mask |= values.map(lambda v: v is None).astype(bool)
+        return values.mask(mask, replacement)
+
+    @staticmethod
+    def combine(func, *columns):
+        """
+        Calcule une colonne à partir d'autres colonnes alignées : func(valeur_1, valeur_2, ...) par ligne.
+        Utilisé pour les calculs métier (nb de fruits par carton, tare...) qui travaillent sur des scalaires.
+        """
+        index = columns[0].index
+        return pd.Series([func(*values) for values in zip(*columns)], index=index, dtype=object)
+
+    @staticmethod
+    def map_columns(df, pl_column_mapping, csv_settings, special_fields=None, date_fields=DATE_FIELDS,
+                    dayfirst=False, date_format=None, date_getter=None, value_getter=None,
+                    empty_values=EMPTY_VALUES, normalize_settings=False, normalize_special=False):
+        """
+        Construit le DataFrame de sortie (une colonne par champ CSV, dans l'ordre du mapping).
+
+        :param special_fields: {champ CSV: fonction(df, colonnes_excel) → colonne ou scalaire}
+        :param dayfirst, date_format: options de lecture des dates du fournisseur (voir DateNormalizer).
+        :param date_getter: fonction(df, colonnes_excel) → colonne de dates déjà formatées
+                            (défaut : première valeur renseignée, convertie par DateNormalizer).
+        :param value_getter: fonction(df, colonnes_excel) → colonne (défaut : first_value).
+        :param normalize_settings: normalise aussi les valeurs issues de csv_settings.
+        :param normalize_special: normalise aussi les valeurs des champs spécifiques.
+        """
+        special_fields = special_fields or {}
+        value_getter = value_getter or ColumnMapper.first_value
+        columns = {}
+
+        for csv_field, excel_columns in pl_column_mapping.items():
+            if csv_field in csv_settings and csv_settings[csv_field] is not None:
+                value = csv_settings[csv_field]
+                normalize = normalize_settings
+            elif csv_field in special_fields:
+                value = special_fields[csv_field](df, excel_columns)
+                normalize = normalize_special
+            else:
+                if csv_field in date_fields and date_getter is not None:
+                    value = date_getter(df, excel_columns)
+                else:
+                    value = value_getter(df, excel_columns)
+                    if csv_field in date_fields:
+                        value = DateNormalizer.format_series(value, dayfirst, date_format)
+                normalize = True
+
+            columns[csv_field] = ColumnMapper.normalize(value, empty_values) if normalize else value
+
+        frame = pd.DataFrame(index=df.index)
+        for csv_field, value in columns.items():
+            frame[csv_field] = value if isinstance(value, pd.Series) else pd.Series(
+                [value] * len(df.index), index=df.index, dtype=object
+            )
+        return frame
@@ -0,0 +1,13 @@
+class ContainerSplitter:
+    @staticmethod
+    def split(df, column_name, containers):
+        """
+        Découpe le DataFrame par container en une seule passe (groupby), au lieu d'un filtre
+        `df[df[column_name] == container]` par container.
+
+        Retourne [(container, sous-DataFrame)] dans l'ordre de `containers` : l'index de chaque
+        container (et donc le nommage des fichiers) est inchangé. Un container sans ligne
+        correspondante (ex. valeur vide) donne un DataFrame vide, comme le filtre d'égalité.
+        """
+        positions = df.groupby(column_name, sort=False).indices if len(df) else {}
+        return [(container, df.iloc[positions.get(container, [])]) for container in containers]
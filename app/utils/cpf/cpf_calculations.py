@@ -1,23 +1,18 @@
+import logging
 import pandas as pd
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
 
 class CpfCalculations:
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
-        try:
-            if current_value not in [None, "", "0", "0,00000"]:
-                return current_value
-            lignes = df[df["PALLET"] == pallet_num]
-            if len(lignes) == 1:
-                return "1,00000"
-            total_boxes = lignes["CASES"].dropna().astype(float).sum()
-            boxes = float(boxes)
-            if total_boxes > 0:
-                ratio = boxes / total_boxes
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ CPF pallets calc error: {e}")
-        return ""
-    
+    def nb_of_pallets_by_palletnum(df, current_values=None):
+        """
+        Nb of pallets de chaque ligne du container (palette "PALLET", cartons "CASES") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
+        """
+        return PalletCalculations.nb_of_pallets_by_palletnum(df, "PALLET", "CASES", current_values)
+
     @staticmethod
     def nb_of_fruits_per_box(caliber, net_weight_per_box):
         try:
@@ -32,7 +27,7 @@ class CpfCalculations:
             elif abs(net - 10) < 0.01:
                 return int(round(caliber * 2.5))
         except Exception as e:
-            print(f"⚠️ [CpfCalculations] Erreur calcul nb_of_fruits_per_box : {e}")
+            logger.debug("⚠️ [CpfCalculations] Erreur calcul nb_of_fruits_per_box : %s", e)
         return ""
 
     
@@ -46,7 +41,7 @@ class CpfCalculations:
                 tare = assumed_gross_per_box - net_per_box
                 return round(tare, 2)
         except Exception as e:
-            print(f"⚠️ Erreur box_tare: {e}")
+            logger.debug("⚠️ Erreur box_tare: %s", e)
         return ""
     
     @staticmethod
@@ -56,7 +51,7 @@ class CpfCalculations:
             cartons_per_pallet = float(str(cartons_per_pallet).replace(",", "."))
             return round(net_weight_per_box * cartons_per_pallet, 2)
         except Exception as e:
-            print(f"⚠️ Erreur net_weight_per_pallet: {e}")
+            logger.debug("⚠️ Erreur net_weight_per_pallet: %s", e)
             return ""
 
 
@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class CpfContainerManager:
     @staticmethod
     def group_by_container(df):
@@ -6,11 +9,16 @@ class CpfContainerManager:
         return containers
 
     @staticmethod
-    def filter_by_container(df, column_name, container_value):
-        filtered = df[df[column_name] == container_value]
-        print(f"🔍 Container CPF {container_value} : {len(filtered)} lignes")
-        return filtered
-    
+    def split_by_container(df, column_name, containers):
+        """
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
+        """
+        parts = ContainerSplitter.split(df, column_name, containers)
+        for container_value, filtered in parts:
+            print(f"🔍 Container CPF {container_value} : {len(filtered)} lignes")
+        return parts
+
     @staticmethod
     def regroup_by_pallet_and_caliber(df):
         sum_cols = ["CASES", "NET WEIGHT", "Nb of pallets"]
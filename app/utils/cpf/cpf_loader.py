@@ -1,21 +1,22 @@
 import pandas as pd
 import os
+from ..workbook import Workbook
 
 class CpfLoader:
+    # Feuille du tableau et ligne d'en-tête (ligne 3) ; toutes les colonnes lues figurent dans le mapping
+    SHEET_NAME = "Manifest"
+    HEADER_ROW = 2
+    EXTRA_COLUMNS = ()
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
-        Tente de charger le fichier CPF avec xlrd, sinon fallback vers openpyxl.
+        Charge la feuille "Manifest" (.xls ou .xlsx), limitée aux colonnes du template.
         """
         try:
-            print(f"🔍 Tentative de lecture avec l'engine : xlrd (.xls)")
-            return pd.read_excel(file_path, sheet_name="Manifest", header=2, dtype=str, engine="xlrd")
-
-        except Exception as e1:
-            print(f"⚠️ xlrd a échoué : {e1}")
-            print(f"🔄 Tentative de lecture avec openpyxl (.xlsx)")
-            try:
-                return pd.read_excel(file_path, sheet_name="Manifest", header=2, dtype=str, engine="openpyxl")
-            except Exception as e2:
-                print(f"❌ Les deux tentatives ont échoué : {e2}")
-                return pd.DataFrame()
+            columns = Workbook.template_columns(column_mapping, CpfLoader.EXTRA_COLUMNS)
+            workbook = Workbook(file_path, CpfLoader.SHEET_NAME, columns=columns, header_row=CpfLoader.HEADER_ROW)
+            return workbook.read(header=CpfLoader.HEADER_ROW, dtype=str)
+        except Exception as e:
+            print(f"❌ Lecture du fichier CPF impossible : {e}")
+            return pd.DataFrame()
@@ -0,0 +1,334 @@
+import codecs
+import contextlib
+import csv
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows (build PyInstaller)
+    fcntl = None
+
+# Colonne identifiant une palette dans les CSV générés (clé des modifications par palette)
+DEFAULT_KEY_COLUMN = "Pallet no"
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+_checksums = {}
+_checksums_lock = threading.Lock()
+_file_locks = {}
+_file_locks_lock = threading.Lock()
+
+
+class CSVPatchError(ValueError):
+    """
+    Modification impossible à appliquer (ligne, palette ou colonne inconnue).
+    """
+
+
+class CSVVersionMismatchError(Exception):
+    """
+    Le fichier a été modifié depuis la version connue du client (If-Match).
+    """
+
+
+def file_checksum(file_path):
+    """
+    SHA-256 du contenu du fichier. Mémorisé par (chemin, date de modification, taille) :
+    le fichier n'est relu que s'il a changé depuis le dernier calcul.
+    """
+    stat = os.stat(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(file_path)
+
+    with _checksums_lock:
+        cached = _checksums.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    checksum = digest.hexdigest()
+    _remember_checksum(key, signature, checksum)
+    return checksum
+
+
+def etag_for(file_path):
+    """ETag fort (entre guillemets) dérivé du SHA-256 du fichier."""
+    return f'"{file_checksum(file_path)}"'
+
+
+def _remember_checksum(key, signature, checksum):
+    with _checksums_lock:
+        _checksums[key] = (signature, checksum)
+
+
+def lock_path(file_path):
+    """Fichier verrou (caché, à côté du CSV) partagé par les processus qui modifient `file_path`."""
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, f".{name}.lock")
+
+
+@contextlib.contextmanager
+def _file_lock(file_path):
+    """
+    Verrou exclusif sur `file_path` pendant la vérification de version (If-Match) et le remplacement :
+    verrou de thread dans le processus, puis verrou fichier (fcntl) entre processus (workers uvicorn),
+    si la plateforme le permet.
+    """
+    key = os.path.abspath(file_path)
+    with _file_locks_lock:
+        thread_lock = _file_locks.setdefault(key, threading.Lock())
+
+    with thread_lock, open(lock_path(file_path), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class _HashingWriter:
+    """Fichier binaire dont le contenu écrit est haché au passage (pas de relecture)."""
+
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+
+    def write(self, data):
+        self.digest.update(data)
+        self.file.write(data)
+
+
+def _atomic_write(file_path, write):
+    """
+    Écrit `file_path` via un fichier temporaire du même dossier (fsync puis os.replace) :
+    un lecteur voit l'ancienne ou la nouvelle version, jamais un fichier partiel.
+    `write(writer)` reçoit un objet binaire avec `write(bytes)`. Retourne le SHA-256 du contenu.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            writer = _HashingWriter(file)
+            write(writer)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(file_path):
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    checksum = writer.digest.hexdigest()
+    stat = os.stat(file_path)
+    _remember_checksum(os.path.abspath(file_path), (stat.st_mtime_ns, stat.st_size), checksum)
+    return checksum
+
+
+def replace_file(file_path, content, if_match=None):
+    """
+    Remplace le contenu de `file_path` par `content` (bytes) de façon atomique.
+    Retourne le nouvel ETag.
+    """
+    with _file_lock(file_path):
+        _check_version(file_path, if_match)
+        return f'"{_atomic_write(file_path, lambda writer: writer.write(content))}"'
+
+
+def _check_version(file_path, if_match):
+    if if_match and if_match.strip() != "*" and if_match.strip() != etag_for(file_path):
+        raise CSVVersionMismatchError(f"Le fichier {file_path} a été modifié depuis (ETag {etag_for(file_path)}).")
+
+
+class CSVEditor:
+    """
+    Modification ligne à ligne d'un CSV généré (séparateur ";"), sans pandas ni relecture.
+
+    Une modification cible une ligne de données par son index (`row`, 0 = première ligne après
+    l'en-tête) ou toutes les lignes d'une palette (`key`, valeur de `key_column`), et donne les
+    nouvelles valeurs des colonnes (`changes`). Le fichier est parcouru une fois : les lignes non
+    modifiées sont recopiées octet pour octet, les lignes modifiées sont réécrites avec le même
+    séparateur et la même fin de ligne. Le SHA-256 est calculé pendant l'écriture et sert d'ETag.
+    """
+
+    @staticmethod
+    def apply_patches(file_path, patches, key_column=DEFAULT_KEY_COLUMN, if_match=None):
+        """
+        :param patches: [{"row": 3, "changes": {"Brand": "X"}}, {"key": "PAL001", "changes": {...}}]
+        :param if_match: ETag connu du client ; CSVVersionMismatchError si le fichier a changé depuis.
+        :return: {"etag", "updated_rows", "updated_cells"}
+        :raises CSVPatchError: ligne, palette ou colonne inconnue (le fichier n'est alors pas modifié).
+        """
+        if not patches:
+            raise CSVPatchError("Aucune modification envoyée.")
+
+        def plan(header):
+            by_row, by_key = CSVEditor._index_patches(patches, header, key_column)
+            key_index = header.index(key_column) if by_key else None
+            found_keys = set()
+
+            def changes_for(index, row):
+                changes = dict(by_row.get(index, {}))
+                if key_index is not None and key_index < len(row) and row[key_index] in by_key:
+                    found_keys.add(row[key_index])
+                    changes.update(by_key[row[key_index]])
+                return changes
+
+            def check(nb_rows):
+                CSVEditor._check_targets(by_row, by_key, nb_rows, found_keys)
+
+            return changes_for, check
+
+        return CSVEditor._rewrite(file_path, plan, if_match)
+
+    @staticmethod
+    def fill_columns(file_path, values, if_match=None):
+        """
+        Donne à chaque colonne de `values` ({colonne: valeur}) la même valeur sur toutes les lignes
+        (ex. paramètres CSV). Les colonnes absentes du fichier sont ignorées.
+
+        :return: {"etag", "updated_rows", "updated_cells"}
+        """
+        def plan(header):
+            changes = {column: value for column, value in values.items() if column in header}
+            return (lambda index, row: changes), None
+
+        return CSVEditor._rewrite(file_path, plan, if_match)
+
+    @staticmethod
+    def _rewrite(file_path, plan, if_match):
+        """
+        Parcours commun aux modifications : `plan(header)` retourne `changes_for(index, ligne)`
+        ({colonne: valeur} à appliquer à la ligne) et une vérification finale `check(nb_lignes)`
+        (ou None), appelée avant le remplacement du fichier.
+        """
+        with _file_lock(file_path):
+            _check_version(file_path, if_match)
+            encoding, newline = CSVEditor._detect_format(file_path)
+
+            with open(file_path, encoding=encoding, newline="") as source:
+                raw_lines = []
+
+                def lines():
+                    for line in source:
+                        raw_lines.append(line)
+                        yield line
+
+                reader = csv.reader(lines(), delimiter=";")
+                header = next(reader, None)
+                if not header:
+                    raise CSVPatchError("Le fichier CSV est vide.")
+
+                changes_for, check = plan(header)
+                render = CSVEditor._row_renderer(newline)
+                stats = {"rows": 0, "cells": 0}
+
+                def write(writer):
+                    if encoding == "utf-8-sig":
+                        writer.write(codecs.BOM_UTF8)
+                    writer.write("".join(raw_lines).encode("utf-8"))
+                    raw_lines.clear()
+
+                    nb_rows = 0
+                    for index, row in enumerate(reader):
+                        raw = "".join(raw_lines)
+                        raw_lines.clear()
+                        nb_rows = index + 1
+
+                        patched, changed_cells = CSVEditor._patch_row(row, header, changes_for(index, row))
+                        if not changed_cells:
+                            writer.write(raw.encode("utf-8"))
+                            continue
+                        stats["rows"] += 1
+                        stats["cells"] += changed_cells
+                        writer.write(render(patched).encode("utf-8"))
+
+                    if check is not None:
+                        check(nb_rows)
+
+                checksum = _atomic_write(file_path, write)
+
+        return {"etag": f'"{checksum}"', "updated_rows": stats["rows"], "updated_cells": stats["cells"]}
+
+    @staticmethod
+    def _index_patches(patches, header, key_column):
+        """
+        Regroupe les modifications par index de ligne et par palette, et vérifie les colonnes.
+        """
+        by_row, by_key = {}, {}
+        for patch in patches:
+            changes = patch.get("changes") or {}
+            unknown = [column for column in changes if column not in header]
+            if unknown:
+                raise CSVPatchError(f"Colonne(s) inconnue(s) : {', '.join(unknown)}")
+
+            row, key = patch.get("row"), patch.get("key")
+            if (row is None) == (key is None):
+                raise CSVPatchError("Chaque modification doit cibler soit une ligne (row), soit une palette (key).")
+            if row is not None:
+                if row < 0:
+                    raise CSVPatchError(f"Index de ligne invalide : {row}")
+                by_row.setdefault(row, {}).update(changes)
+            else:
+                if key_column not in header:
+                    raise CSVPatchError(f"Colonne de palette inconnue : {key_column}")
+                by_key.setdefault(str(key), {}).update(changes)
+        return by_row, by_key
+
+    @staticmethod
+    def _patch_row(row, header, changes):
+        """(ligne modifiée, nombre de cellules changées) ; 0 cellule si rien ne change."""
+        if not changes:
+            return row, 0
+        patched = list(row) + [""] * (len(header) - len(row))
+        changed_cells = 0
+        for column, value in changes.items():
+            index = header.index(column)
+            value = "" if value is None else str(value)
+            if patched[index] != value:
+                patched[index] = value
+                changed_cells += 1
+        return patched, changed_cells
+
+    @staticmethod
+    def _check_targets(by_row, by_key, nb_rows, found_keys):
+        missing_rows = sorted(row for row in by_row if row >= nb_rows)
+        if missing_rows:
+            raise CSVPatchError(f"Ligne(s) inexistante(s) : {missing_rows} (le fichier compte {nb_rows} lignes)")
+        missing_keys = sorted(key for key in by_key if key not in found_keys)
+        if missing_keys:
+            raise CSVPatchError(f"Palette(s) introuvable(s) : {', '.join(missing_keys)}")
+
+    @staticmethod
+    def _row_renderer(newline):
+        """Sérialise une ligne comme le fait csv.writer (séparateur ";", fin de ligne du fichier)."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";", lineterminator=newline)
+
+        def render(row):
+            buffer.seek(0)
+            buffer.truncate(0)
+            writer.writerow(row)
+            return buffer.getvalue()
+
+        return render
+
+    @staticmethod
+    def _detect_format(file_path):
+        """Encodage (BOM utf-8 ou non) et fin de ligne ("\\r\\n" ou "\\n") du fichier existant."""
+        with open(file_path, "rb") as file:
+            start = file.read(64 * 1024)
+        encoding = "utf-8-sig" if start.startswith(b"\xef\xbb\xbf") else "utf-8"
+        first_line_end = start.find(b"\n")
+        newline = "\r\n" if first_line_end > 0 and start[first_line_end - 1:first_line_end] == b"\r" else "\n"
+        return encoding, newline
@@ -1,16 +1,81 @@
 import csv
 import os
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow est optionnel
+    pa = None
+
+# Taille du tampon d'écriture (1 Mo) : quelques gros write() au lieu d'un par ligne
+WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 class CSVManager:
     @staticmethod
-    def write_csv(file_path, data):
-        """Écrit les données dans un fichier CSV."""
-        if not data:
+    def write_csv(file_path, data, decimal="."):
+        """
+        Écrit les données dans un fichier CSV (séparateur ";", encodage utf-8-sig).
+
+        `data` peut être une liste de dictionnaires, un DataFrame pandas ou une table Arrow :
+        les noms de colonnes sont nettoyés (strip) une seule fois et les valeurs converties
+        colonne par colonne, sans copie ligne par ligne. Le fichier est écrit dans un fichier
+        temporaire du même dossier puis renommé : un lecteur ne voit jamais de CSV partiel.
+
+        :param decimal: séparateur décimal des nombres flottants ("," pour le format français).
+                        Par défaut, les valeurs sont écrites telles quelles (str).
+        """
+        header, columns = CSVManager._to_columns(data)
+        if not header or not columns or not columns[0]:
             raise ValueError("Les données sont vides.")
 
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        rows = zip(*(CSVManager._format_column(values, decimal) for values in columns))
+
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, mode="x", newline="", encoding="utf-8-sig", buffering=WRITE_BUFFER_SIZE) as file:
+                writer = csv.writer(file, delimiter=";")
+                writer.writerow(header)
+                writer.writerows(rows)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
 
-        with open(file_path, mode="w", newline="", encoding="utf-8-sig") as file:
-            writer = csv.DictWriter(file, fieldnames=data[0].keys(), delimiter=";")
-            writer.writeheader()
-            writer.writerows(data)
+    @staticmethod
+    def _to_columns(data):
+        """
+        Retourne (entêtes nettoyées, [valeurs de chaque colonne]).
+        Pour une liste de dictionnaires, les entêtes sont les clés de la première ligne (comme DictWriter).
+        """
+        if isinstance(data, pd.DataFrame):
+            header = [str(column).strip() for column in data.columns]
+            return header, [data.iloc[:, position].tolist() for position in range(data.shape[1])]
+
+        if pa is not None and isinstance(data, pa.Table):
+            header = [str(column).strip() for column in data.column_names]
+            return header, [column.to_pylist() for column in data.columns]
+
+        if not data:
+            return [], []
+
+        keys = list(data[0].keys())
+        return [key.strip() for key in keys], [[row.get(key) for row in data] for key in keys]
+
+    @staticmethod
+    def _format_column(values, decimal):
+        """
+        Convertit une colonne en chaînes, comme le module csv (None → "", sinon str(valeur)).
+        """
+        if decimal == ".":
+            return ["" if value is None else str(value) for value in values]
+        return [
+            str(value).replace(".", decimal) if isinstance(value, float)
+            else "" if value is None else str(value)
+            for value in values
+        ]
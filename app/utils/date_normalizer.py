@@ -0,0 +1,60 @@
+import pandas as pd
+
+# Format des dates dans le CSV
+DATE_OUTPUT_FORMAT = "%d/%m/%Y"
+
+
+class DateNormalizer:
+    """
+    Normalisation des dates du packing list en 'dd/mm/yyyy', colonne par colonne.
+
+    Une PL répète généralement les mêmes quelques dates sur des centaines de lignes :
+    chaque valeur distincte n'est convertie qu'une seule fois (pd.factorize), puis le résultat
+    est redistribué sur toutes les lignes. Les colonnes déjà typées en dates sont formatées directement.
+
+    - dayfirst : lecture jour/mois des dates ambiguës (ex. CPF)
+    - date_format : format attendu (ex. "%d.%m.%Y"), essayé avant la détection automatique
+    Une valeur vide ou non reconnue donne "".
+    """
+
+    @staticmethod
+    def format_value(value, dayfirst=False, date_format=None):
+        """
+        Convertit une valeur unique en 'dd/mm/yyyy' ("" si vide ou non reconnue).
+        """
+        try:
+            if pd.isnull(value) or value == "":
+                return ""
+        except (TypeError, ValueError):
+            pass
+
+        try:
+            parsed = pd.NaT
+            if date_format is not None and isinstance(value, str):
+                parsed = pd.to_datetime(value, format=date_format, errors="coerce")
+            if pd.isnull(parsed):
+                parsed = pd.to_datetime(value, dayfirst=dayfirst, errors="coerce")
+            if pd.notnull(parsed):
+                return parsed.strftime(DATE_OUTPUT_FORMAT)
+        except Exception:
+            pass
+        return ""
+
+    @staticmethod
+    def format_series(values, dayfirst=False, date_format=None):
+        """
+        Convertit une colonne en 'dd/mm/yyyy', en ne parsant qu'une fois chaque valeur distincte.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            return values.dt.strftime(DATE_OUTPUT_FORMAT).astype(object).fillna("")
+
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        formatted = [DateNormalizer.format_value(value, dayfirst, date_format) for value in uniques]
+
+        invalid = [value for value, date in zip(uniques, formatted) if date == "" and value != ""]
+        if invalid:
+            print(f"⚠️ Erreur conversion date: {len(invalid)} valeur(s) non reconnue(s), ex. {invalid[:3]}")
+
+        # Code -1 (valeur vide) → "" en dernière position
+        lookup = pd.Series(formatted + [""], dtype=object).to_numpy()
+        return pd.Series(lookup[codes], index=values.index, dtype=object)
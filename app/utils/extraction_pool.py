@@ -0,0 +1,205 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .metrics import call_collecting, replay_observations
+
+
+# Vrai dans les workers du pool en mode "process" (voir in_extraction_worker)
+_IN_WORKER = False
+
+
+def _init_worker():
+    global _IN_WORKER
+    _IN_WORKER = True
+
+
+def in_extraction_worker():
+    """Indique si le code s'exécute dans un worker process du pool d'extraction."""
+    return _IN_WORKER
+
+
+class PoolSaturatedError(Exception):
+    """
+    Levée lorsque le pool d'extraction n'accepte plus de nouvelles tâches.
+    """
+
+
+class ExtractionPool:
+    """
+    Pool borné pour exécuter les extractions (pandas/openpyxl) hors de la boucle asyncio.
+
+    - mode "thread" : ThreadPoolExecutor (par défaut)
+    - mode "process" : ProcessPoolExecutor (la fonction soumise doit être importable) ;
+      les métriques mesurées dans le worker sont rejouées dans l'API à la fin de la tâche
+    - max_queue : nombre de tâches pouvant attendre un worker libre avant saturation
+    - reserved_workers : workers laissés aux requêtes unitaires (run/submit) ; les tâches de
+      run_when_available (lots), tous lots confondus, n'en occupent jamais plus que
+      `max_workers - reserved_workers` (au moins un)
+    """
+
+    def __init__(self, mode="thread", max_workers=None, max_queue=None, reserved_workers=1):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Mode de pool inconnu : {mode}")
+
+        self.mode = mode
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue if max_queue is not None else self.max_workers * 2
+        self._executor = None
+        self.background_limit = max(1, self.max_workers - reserved_workers)
+        self._pending = 0
+        self._background = 0
+        self._lock = threading.Lock()
+        # Tâches de run_when_available() en attente d'une place (asyncio.Future)
+        self._waiters = []
+
+    @classmethod
+    def from_env(cls):
+        """
+        Construit le pool depuis les variables d'environnement :
+        EXTRACTION_POOL_MODE, EXTRACTION_MAX_WORKERS, EXTRACTION_MAX_QUEUE,
+        EXTRACTION_RESERVED_WORKERS (1 par défaut).
+        """
+        max_workers = os.getenv("EXTRACTION_MAX_WORKERS")
+        max_queue = os.getenv("EXTRACTION_MAX_QUEUE")
+        return cls(
+            mode=os.getenv("EXTRACTION_POOL_MODE", "thread"),
+            max_workers=int(max_workers) if max_workers else None,
+            max_queue=int(max_queue) if max_queue else None,
+            reserved_workers=int(os.getenv("EXTRACTION_RESERVED_WORKERS", "1")),
+        )
+
+    @property
+    def capacity(self):
+        """Nombre maximal de tâches en cours + en attente."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extraction")
+        return self._executor
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise PoolSaturatedError(
+                    f"Pool d'extraction saturé ({self._pending}/{self.capacity} tâches en cours)."
+                )
+            self._pending += 1
+
+    def _release(self, background=False):
+        with self._lock:
+            if background:
+                self._background -= 1
+            else:
+                self._pending -= 1
+            waiters, self._waiters = self._waiters, []
+        # Réveille toutes les attentes : celles qui n'obtiennent pas la place se remettent en file.
+        # Réveiller une seule attente perdrait la place si sa tâche vient d'être annulée.
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    def submit(self, func, *args):
+        """
+        Soumet `func(*args)` au pool sans attendre et retourne un asyncio.Future.
+        Lève PoolSaturatedError si la file d'attente est pleine.
+        """
+        self._reserve()
+        try:
+            loop = asyncio.get_running_loop()
+            if self.mode == "process":
+                task = loop.run_in_executor(self._get_executor(), call_collecting, func, *args)
+            else:
+                task = loop.run_in_executor(self._get_executor(), func, *args)
+        except Exception:
+            self._release()
+            raise
+        task.add_done_callback(lambda _: self._release())
+        if self.mode == "thread":
+            return task
+
+        future = loop.create_future()
+        task.add_done_callback(lambda _: _forward_result(task, future))
+        future.add_done_callback(lambda _: task.cancel() if future.cancelled() else None)
+        return future
+
+    async def run(self, func, *args):
+        """
+        Exécute `func(*args)` dans le pool et attend son résultat.
+        Lève PoolSaturatedError si la file d'attente est pleine.
+        """
+        return await self.submit(func, *args)
+
+    async def run_when_available(self, func, *args):
+        """
+        Comme run(), mais attend qu'une place se libère au lieu de lever PoolSaturatedError.
+        Utilisé pour les lots, qui peuvent contenir plus de fichiers que la capacité du pool :
+        au plus `background_limit` de ces tâches s'exécutent à la fois, pour l'ensemble des lots.
+        L'attente est réveillée par la fin d'une tâche (_release), sans scrutation.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = None
+            with self._lock:
+                if self._background < self.background_limit and self._pending < self.capacity:
+                    self._background += 1
+                else:
+                    waiter = loop.create_future()
+                    self._waiters.append(waiter)
+            if waiter is not None:
+                await waiter
+                continue
+
+            try:
+                future = self.submit(func, *args)
+            except PoolSaturatedError:
+                # Une requête unitaire a pris la dernière place entre la vérification et submit()
+                self._release(background=True)
+                continue
+            try:
+                return await future
+            finally:
+                self._release(background=True)
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def _forward_result(task, future):
+    """
+    Transmet à `future` le résultat d'une tâche exécutée via call_collecting(),
+    après avoir rejoué ses métriques dans l'API.
+    """
+    if task.cancelled():
+        future.cancel()
+        return
+
+    exception = task.exception()
+    if exception is not None:
+        replay_observations(getattr(exception, "metrics_observations", ()))
+        if not future.done():
+            future.set_exception(exception)
+        return
+
+    result, observations = task.result()
+    replay_observations(observations)
+    if not future.done():
+        future.set_result(result)
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+extraction_pool = ExtractionPool.from_env()
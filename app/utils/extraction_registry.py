@@ -0,0 +1,481 @@
+import contextlib
+import json
+import os
+import shelve
+import threading
+import time
+
+try:
+    import sqlite3
+except ImportError:  # Python compilé sans sqlite3 (certains builds embarqués)
+    sqlite3 = None
+
+try:
+    import fcntl
+except ImportError:  # Windows (build PyInstaller)
+    fcntl = None
+
+from .csv_editor import lock_path
+
+
+EXTRACTION_STATUSES = ("queued", "running", "done", "failed")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+PURGE_INTERVAL_SECONDS = 60
+
+
+class BaseExtractionRegistry:
+    """
+    Registre des extractions : statut, progression par container, fichiers générés,
+    durées et paramètres CSV.
+
+    Chaque enregistrement est un dictionnaire :
+    {
+        "extraction_id", "fournisseur", "status", "generated_files",
+        "progress": {"done", "total"}, "error",
+        "created_at", "updated_at", "started_at", "finished_at", "duration"
+    }
+
+    Les sous-classes fournissent le stockage via `_transaction()`, qui retourne un
+    objet dict-like (get / __setitem__ / pop / items) verrouillé le temps du bloc.
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._last_purge = 0.0
+        # Callable → fichiers à conserver même s'ils ne sont plus listés par aucune extraction
+        # (entrées du cache de résultats, branché par result_cache)
+        self.retained_files = None
+
+    # --- Stockage (à implémenter) -------------------------------------------------
+
+    def _transaction(self):
+        raise NotImplementedError()
+
+    def _settings_transaction(self):
+        raise NotImplementedError()
+
+    # --- Extractions --------------------------------------------------------------
+
+    def create(self, extraction_id, fournisseur, status="queued", generated_files=None, **extra):
+        now = time.time()
+        generated_files = list(generated_files or [])
+        total = len(generated_files) if status == "done" else None
+        record = {
+            "extraction_id": extraction_id,
+            "fournisseur": fournisseur,
+            "status": status,
+            "generated_files": generated_files,
+            "progress": {"done": len(generated_files), "total": total},
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": now if status != "queued" else None,
+            "finished_at": now if status in ("done", "failed") else None,
+            "duration": 0.0 if status in ("done", "failed") else None,
+            **extra,
+        }
+        self.purge_expired()
+        with self._transaction() as records:
+            records[extraction_id] = record
+        return dict(record)
+
+    def update(self, extraction_id, **fields):
+        """
+        Met à jour un enregistrement existant. Ignoré si l'extraction est inconnue.
+        Les horodatages started_at / finished_at / duration suivent les changements de statut.
+        """
+        status = fields.get("status")
+        if status is not None and status not in EXTRACTION_STATUSES:
+            raise ValueError(f"Statut d'extraction inconnu : {status}")
+
+        now = time.time()
+        with self._transaction() as records:
+            record = records.get(extraction_id)
+            if record is None:
+                return None
+            record.update(fields)
+            if status == "running" and record.get("started_at") is None:
+                record["started_at"] = now
+            if status in ("done", "failed"):
+                record["finished_at"] = now
+                record["duration"] = round(now - (record.get("started_at") or record["created_at"]), 3)
+            record["updated_at"] = now
+            records[extraction_id] = record
+            return dict(record)
+
+    def add_generated_file(self, extraction_id, file_path):
+        """
+        Ajoute un fichier généré et incrémente la progression (un fichier = un container).
+        """
+        with self._transaction() as records:
+            record = records.get(extraction_id)
+            if record is None:
+                return
+            if file_path:
+                record["generated_files"].append(file_path)
+            record["progress"] = {**record["progress"], "done": record["progress"]["done"] + 1}
+            record["updated_at"] = time.time()
+            records[extraction_id] = record
+
+    def set_total(self, extraction_id, total):
+        with self._transaction() as records:
+            record = records.get(extraction_id)
+            if record is None:
+                return
+            record["progress"] = {**record["progress"], "total": total}
+            record["updated_at"] = time.time()
+            records[extraction_id] = record
+
+    def get(self, extraction_id):
+        with self._transaction() as records:
+            record = records.get(extraction_id)
+        if record is None or self._is_expired(record):
+            return None
+        return record
+
+    def delete(self, extraction_id):
+        with self._transaction() as records:
+            records.pop(extraction_id, None)
+
+    def referenced_files(self, exclude=None):
+        """
+        Fichiers listés par les extractions non expirées (à ne pas supprimer de outputs/),
+        hors extraction `exclude`.
+        """
+        with self._transaction() as records:
+            items = records.items()
+        return {
+            file_path
+            for extraction_id, record in items
+            if extraction_id != exclude and record is not None and not self._is_expired(record)
+            for file_path in record.get("generated_files") or []
+        }
+
+    def __contains__(self, extraction_id):
+        return self.get(extraction_id) is not None
+
+    # --- Expiration ---------------------------------------------------------------
+
+    def _is_expired(self, record):
+        if not self.ttl_seconds:
+            return False
+        return record["updated_at"] + self.ttl_seconds < time.time()
+
+    def purge_expired(self, force=False):
+        """
+        Supprime les extractions expirées (au plus une fois par minute sauf si force=True),
+        puis leurs fichiers devenus orphelins (voir _remove_orphan_files).
+        Retourne le nombre d'enregistrements supprimés.
+        """
+        now = time.time()
+        if not self.ttl_seconds or (not force and now - self._last_purge < PURGE_INTERVAL_SECONDS):
+            return 0
+        self._last_purge = now
+
+        with self._transaction() as records:
+            expired = [record for _, record in records.items() if self._is_expired(record)]
+            for record in expired:
+                records.pop(record["extraction_id"], None)
+
+        if expired:
+            print(f"🧹 {len(expired)} extraction(s) expirée(s) supprimée(s) du registre")
+            self._remove_orphan_files(expired)
+        return len(expired)
+
+    def _remove_orphan_files(self, expired):
+        """
+        Supprime du disque les fichiers des extractions expirées qu'aucune extraction encore valide
+        ni aucune entrée du cache de résultats (`retained_files`) ne référence, ainsi que le dossier
+        `{extraction_id}/` d'une copie réécrite (/rerender) devenu vide.
+        """
+        candidates = {
+            file_path: record["extraction_id"]
+            for record in expired
+            for file_path in record.get("generated_files") or []
+        }
+        if not candidates:
+            return 0
+
+        kept = self.referenced_files()
+        if self.retained_files is not None:
+            kept |= set(self.retained_files())
+
+        removed = 0
+        for file_path, extraction_id in candidates.items():
+            if file_path in kept:
+                continue
+            try:
+                os.remove(file_path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(lock_path(file_path))
+            directory = os.path.dirname(file_path)
+            if os.path.basename(directory) == extraction_id:
+                with contextlib.suppress(OSError):
+                    os.rmdir(directory)
+
+        if removed:
+            print(f"🧹 {removed} fichier(s) d'extractions expirées supprimé(s)")
+        return removed
+
+    # --- Paramètres CSV -----------------------------------------------------------
+
+    def save_settings(self, settings, key="settings"):
+        with self._settings_transaction() as store:
+            store[key] = dict(settings)
+
+    def get_settings(self, key="settings"):
+        with self._settings_transaction() as store:
+            settings = store.get(key)
+        return dict(settings) if settings is not None else None
+
+
+class MemoryExtractionRegistry(BaseExtractionRegistry):
+    """
+    Registre en mémoire du processus (un seul worker, perdu au redémarrage).
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS):
+        super().__init__(ttl_seconds)
+        self._records = {}
+        self._settings = {}
+        self._lock = threading.RLock()
+
+    @contextlib.contextmanager
+    def _locked(self, data):
+        with self._lock:
+            yield _CopyingStore(data)
+
+    def _transaction(self):
+        return self._locked(self._records)
+
+    def _settings_transaction(self):
+        return self._locked(self._settings)
+
+
+class _CopyingStore:
+    """
+    Vue dict-like qui copie les valeurs (comme une sérialisation) pour isoler les appelants.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, key, default=None):
+        value = self._data.get(key)
+        return json.loads(json.dumps(value)) if value is not None else default
+
+    def __setitem__(self, key, value):
+        self._data[key] = json.loads(json.dumps(value))
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def items(self):
+        return [(key, self.get(key)) for key in list(self._data)]
+
+
+class SQLiteExtractionRegistry(BaseExtractionRegistry):
+    """
+    Registre SQLite en mode WAL, partagé entre workers uvicorn, processus et redémarrages.
+    """
+
+    def __init__(self, path, ttl_seconds=DEFAULT_TTL_SECONDS):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "extraction_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_updated_at ON extractions (updated_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def _connect(self):
+        """
+        Une connexion par thread et par processus (les connexions sqlite3 ne se partagent pas).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextlib.contextmanager
+    def _table_transaction(self, table, key_column):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield _SQLiteStore(conn, table, key_column)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _transaction(self):
+        return self._table_transaction("extractions", "extraction_id")
+
+    def _settings_transaction(self):
+        return self._table_transaction("settings", "key")
+
+    def purge_expired(self, force=False):
+        now = time.time()
+        if not self.ttl_seconds or (not force and now - self._last_purge < PURGE_INTERVAL_SECONDS):
+            return 0
+        self._last_purge = now
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT data FROM extractions WHERE updated_at < ?", (now - self.ttl_seconds,)
+            ).fetchall()
+            conn.execute("DELETE FROM extractions WHERE updated_at < ?", (now - self.ttl_seconds,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if rows:
+            print(f"🧹 {len(rows)} extraction(s) expirée(s) supprimée(s) du registre")
+            self._remove_orphan_files([json.loads(data) for data, in rows])
+        return len(rows)
+
+
+class _SQLiteStore:
+    def __init__(self, conn, table, key_column):
+        self._conn = conn
+        self._table = table
+        self._key = key_column
+
+    def get(self, key, default=None):
+        row = self._conn.execute(
+            f"SELECT data FROM {self._table} WHERE {self._key} = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def __setitem__(self, key, value):
+        data = json.dumps(value)
+        if self._table == "extractions":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (extraction_id, data, updated_at) VALUES (?, ?, ?)",
+                (key, data, value.get("updated_at", time.time())),
+            )
+        else:
+            self._conn.execute(f"INSERT OR REPLACE INTO {self._table} ({self._key}, data) VALUES (?, ?)", (key, data))
+
+    def pop(self, key, default=None):
+        value = self.get(key, default)
+        self._conn.execute(f"DELETE FROM {self._table} WHERE {self._key} = ?", (key,))
+        return value
+
+    def items(self):
+        rows = self._conn.execute(f"SELECT {self._key}, data FROM {self._table}").fetchall()
+        return [(key, json.loads(data)) for key, data in rows]
+
+
+class ShelveExtractionRegistry(BaseExtractionRegistry):
+    """
+    Repli sur `shelve` quand sqlite3 n'est pas disponible.
+    Verrou fichier (fcntl) entre processus si la plateforme le permet.
+    """
+
+    def __init__(self, path, ttl_seconds=DEFAULT_TTL_SECONDS):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @contextlib.contextmanager
+    def _open(self, suffix):
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with shelve.open(f"{self.path}{suffix}") as db:
+                    yield _CopyingStore(db)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _transaction(self):
+        return self._open("")
+
+    def _settings_transaction(self):
+        return self._open(".settings")
+
+
+def create_registry_from_env():
+    """
+    Construit le registre depuis les variables d'environnement :
+    - EXTRACTION_REGISTRY_BACKEND : sqlite (défaut), shelve ou memory
+    - EXTRACTION_REGISTRY_PATH : chemin du fichier (défaut data/extractions.db)
+    - EXTRACTION_TTL_SECONDS : durée de conservation (défaut 7 jours, 0 = illimité)
+    """
+    backend = os.getenv("EXTRACTION_REGISTRY_BACKEND", "sqlite").lower()
+    path = os.getenv("EXTRACTION_REGISTRY_PATH", os.path.join("data", "extractions.db"))
+    ttl_seconds = int(os.getenv("EXTRACTION_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+    if backend == "memory":
+        return MemoryExtractionRegistry(ttl_seconds)
+
+    if backend == "sqlite" and sqlite3 is not None:
+        return SQLiteExtractionRegistry(path, ttl_seconds)
+
+    if backend == "sqlite":
+        print("⚠️ sqlite3 indisponible, repli sur le registre shelve")
+    elif backend != "shelve":
+        raise ValueError(f"Backend de registre inconnu : {backend}")
+
+    return ShelveExtractionRegistry(os.path.splitext(path)[0] + ".shelve", ttl_seconds)
+
+
+def track_progress(service, registry, extraction_id):
+    """
+    Branche le suivi de progression sur une instance de service fournisseur :
+    - `_group_containers` (liste) ou `_prepare_dataframe` (dict de feuilles) → nombre total de containers
+    - `_process_container` → fichier généré + container terminé
+    """
+    group_containers = getattr(service, "_group_containers", None)
+    prepare_dataframe = getattr(service, "_prepare_dataframe", None)
+    process_container = service._process_container
+
+    if group_containers is not None:
+        def _tracked_group_containers(*args, **kwargs):
+            containers = group_containers(*args, **kwargs)
+            try:
+                registry.set_total(extraction_id, len(containers))
+            except TypeError:
+                pass
+            return containers
+
+        service._group_containers = _tracked_group_containers
+
+    if prepare_dataframe is not None:
+        def _tracked_prepare_dataframe(*args, **kwargs):
+            prepared = prepare_dataframe(*args, **kwargs)
+            if isinstance(prepared, dict):
+                registry.set_total(extraction_id, len(prepared))
+            return prepared
+
+        service._prepare_dataframe = _tracked_prepare_dataframe
+
+    def _tracked_process_container(*args, **kwargs):
+        output_path = process_container(*args, **kwargs)
+        registry.add_generated_file(extraction_id, output_path)
+        return output_path
+
+    service._process_container = _tracked_process_container
+    return service
+
+
+extraction_registry = create_registry_from_env()
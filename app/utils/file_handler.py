@@ -1,13 +1,63 @@
+import hashlib
 import os
+import tempfile
 
 UPLOAD_DIR = "Archives/"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Taille maximale d'un upload (MAX_UPLOAD_SIZE_MB, 0 = illimitée)
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50")) * 1024 * 1024 or None
+
+
+class UploadTooLargeError(ValueError):
+    """
+    Levée lorsque le fichier envoyé dépasse la taille maximale autorisée.
+    """
+
+
+def save_upload_stream(uploaded_file, destination, max_size=MAX_UPLOAD_SIZE, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Copie un fichier uploadé sur disque par blocs, sans le charger entièrement en mémoire.
+    Le SHA-256 est calculé pendant la copie ; le fichier final est remplacé de façon atomique.
+
+    :param uploaded_file: UploadFile FastAPI (ou objet avec un attribut `file` lisible).
+    :param destination: Chemin du fichier à écrire.
+    :param max_size: Taille maximale en octets (None = illimitée).
+    :return: (chemin, sha256 hexadécimal, taille en octets)
+    :raises UploadTooLargeError: Si le fichier dépasse `max_size`.
+    """
+    directory = os.path.dirname(os.path.abspath(destination))
+    os.makedirs(directory, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = uploaded_file.file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLargeError(
+                        f"Fichier trop volumineux (limite : {max_size // (1024 * 1024)} Mo)."
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return destination, digest.hexdigest(), size
+
 
 def save_temp_file(uploaded_file):
     """
     Sauvegarde un fichier temporaire dans le dossier 'Archives'.
     """
-    file_path = os.path.join(UPLOAD_DIR, uploaded_file.filename)
-    with open(file_path, "wb") as buffer:
-        buffer.write(uploaded_file.file.read())
+    file_path = os.path.join(UPLOAD_DIR, os.path.basename(uploaded_file.filename))
+    save_upload_stream(uploaded_file, file_path)
     return file_path
@@ -1,5 +1,8 @@
+import logging
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 class GHCalculations:
     @staticmethod
     def nb_of_fruits_per_box(caliber, weight):
@@ -17,5 +20,5 @@ class GHCalculations:
             elif weight == 10:
                 return int(round(caliber * 2.5))
         except Exception as e:
-            print(f"⚠️ Erreur GH nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur GH nb_of_fruits_per_box: %s", e)
         return ""
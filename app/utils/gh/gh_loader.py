@@ -1,11 +1,15 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class GHLoader:
+    # Colonne lue en dehors du mapping : container du découpage et du nom de fichier
+    EXTRA_COLUMNS = ("Container n°",)
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
         Charge le fichier Excel GH et retourne un DataFrame.
         """
-        df = pd.read_excel(file_path, sheet_name=0, dtype=str)
+        columns = Workbook.template_columns(column_mapping, GHLoader.EXTRA_COLUMNS)
+        df = Workbook(file_path, 0, columns=columns).read(dtype=str)
         print(f"📥 [GHLoader] Chargement réussi : {len(df)} lignes")
         return df
@@ -1,4 +1,8 @@
+import logging
 import pandas as pd
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
 
 class HnpCalculations:
     @staticmethod
@@ -17,38 +21,17 @@ class HnpCalculations:
             elif weight == 10:
                 return int(round(caliber * 2.5))
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
         return ""
     
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
+    def nb_of_pallets_by_palletnum(df, current_values=None):
         """
-        Calcule le nombre de palettes si non défini :
-        - Si une seule ligne → 1,00000
-        - Sinon → ratio (boxes / total_boxes pour cette palette)
-        - Si déjà défini (current_value), retourne sa valeur
+        Nb of pallets de chaque ligne du container (palette "Pallet Ref. Nr.", cartons "Quantity") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
         """
-        try:
-            if current_value not in [None, "", "0", "0,00000"]:
-                return current_value
-
-            if pd.isna(pallet_num) or pd.isna(boxes):
-                return ""
-
-            lignes = df[df["Pallet Ref. Nr."] == pallet_num]
+        return PalletCalculations.nb_of_pallets_by_palletnum(df, "Pallet Ref. Nr.", "Quantity", current_values)
 
-            if len(lignes) == 1:
-                return "1,00000"
-
-            total_boxes = lignes["Quantity"].dropna().astype(float).sum()
-            boxes = float(boxes)
-
-            if total_boxes > 0:
-                ratio = boxes / total_boxes
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {e}")
-            
     @staticmethod
     def net_weight_per_pallet(cartons, weight_per_box):
         """
@@ -60,7 +43,7 @@ class HnpCalculations:
             weight = float(str(weight_per_box).replace(",", "."))
             return round(cartons * weight, 2)
         except Exception as e:
-            print(f"⚠️ Erreur net_weight_per_pallet: {e}")
+            logger.debug("⚠️ Erreur net_weight_per_pallet: %s", e)
             return ""
         
     @staticmethod
@@ -74,5 +57,5 @@ class HnpCalculations:
             weight_float = float(str(weight_per_box).replace(",", "."))
             return 0.32 if weight_float == 4 else 0.4
         except Exception as e:
-            print(f"⚠️ Erreur box_tare: {e}")
+            logger.debug("⚠️ Erreur box_tare: %s", e)
             return 0.6
\ No newline at end of file
@@ -1,11 +1,15 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class HnpLoader:
+    # Colonnes lues en dehors du mapping : référence du nom de fichier, en-tête container renommé
+    EXTRA_COLUMNS = ("Exporter ref", "Container n°", "Container n° (ABCD1234567)")
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
         Charge le fichier Excel et retourne un DataFrame.
         """
-        df = pd.read_excel(file_path, sheet_name=1, dtype=str)
+        columns = Workbook.template_columns(column_mapping, HnpLoader.EXTRA_COLUMNS)
+        df = Workbook(file_path, 1, columns=columns).read(dtype=str)
         print(f"📥 [HnpLoader] Chargement réussi : {len(df)} lignes")
         return df
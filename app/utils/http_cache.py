@@ -0,0 +1,74 @@
+import zlib
+
+from .csv_editor import file_checksum
+
+# Les CSV peuvent être modifiés (/update-csv/) : le client garde sa copie mais la revalide
+# à chaque ouverture (If-None-Match → 304 tant que le contenu n'a pas changé)
+CACHE_CONTROL = "private, no-cache"
+
+# En dessous de cette taille, la compression ne fait rien gagner
+MIN_COMPRESS_SIZE = 1024
+COMPRESS_CHUNK_SIZE = 256 * 1024
+
+# Encodages supportés, par ordre de préférence à qualité égale (wbits zlib : 31 = gzip, 15 = zlib/deflate)
+_ENCODINGS = {"gzip": 31, "deflate": 15}
+
+
+def representation_etag(file_path, encoding=None):
+    """
+    ETag fort d'une représentation du fichier : SHA-256 du contenu (recalculé seulement si
+    la date de modification ou la taille ont changé), suffixé par l'encodage éventuel.
+    """
+    checksum = file_checksum(file_path)
+    return f'"{checksum}-{encoding}"' if encoding else f'"{checksum}"'
+
+
+def etag_matches(if_none_match, etags):
+    """
+    If-None-Match correspond-il à l'un des ETags ? (comparaison faible, "*" accepté)
+    """
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    candidates = {candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates}
+    return any(etag in candidates for etag in etags)
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Encodage de compression à utiliser d'après Accept-Encoding ("gzip", "deflate" ou None).
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in _ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressed_chunks(file_path, encoding, chunk_size=COMPRESS_CHUNK_SIZE, level=6):
+    """Générateur du contenu du fichier compressé à la volée (gzip ou deflate)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _ENCODINGS[encoding])
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
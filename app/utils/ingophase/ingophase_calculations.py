@@ -1,5 +1,21 @@
+import logging
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Nombre de fruits par carton des SC, par calibre ("" = inconnu)
+SC_FRUITS_PER_BOX = {
+    "1": 94,
+    "1X": 75,
+    "1XX": 68,
+    "1XXX": 43,
+    "2": 98,
+    "3": "",
+    "4": "",
+    "5": "",
+}
+
+
 class IngophaseCalculations:
     @staticmethod
     def nb_of_fruits_per_box(caliber, species=""):
@@ -13,24 +29,14 @@ class IngophaseCalculations:
             species = species.strip().upper()
 
             if species in ["SC"]:
-                mapping = {
-                "1": 94,
-                "1X": 75,
-                "1XX": 68,
-                "1XXX": 43,
-                "2": 98,
-                "3": "",  # Inconnu
-                "4": "",  # Inconnu
-                "5": "",  # Inconnu
-            }
-                if caliber_str in mapping and mapping[caliber_str] != "":
-                    return mapping[caliber_str]
+                if caliber_str in SC_FRUITS_PER_BOX and SC_FRUITS_PER_BOX[caliber_str] != "":
+                    return SC_FRUITS_PER_BOX[caliber_str]
                 else:
                     return caliber_str  
             else:
                 return caliber_str  
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
             return ""
     
     @staticmethod
@@ -44,7 +50,7 @@ class IngophaseCalculations:
             weight = float(str(weight_per_box).replace(",", "."))
             return round(cartons * weight, 2)
         except Exception as e:
-            print(f"⚠️ Erreur net_weight_per_pallet: {e}")
+            logger.debug("⚠️ Erreur net_weight_per_pallet: %s", e)
             return ""
         
     @staticmethod
@@ -60,7 +66,7 @@ class IngophaseCalculations:
             if cartons > 0:
                 return round(mass / cartons, 2)
         except Exception as e:
-            print(f"⚠️ Erreur net_weight_per_box: {e}")
+            logger.debug("⚠️ Erreur net_weight_per_box: %s", e)
         return ""
 
 
@@ -85,6 +91,6 @@ class IngophaseCalculations:
             return 0.35 if cartons == 216 else 0.7
 
         except Exception as e:
-            print(f"⚠️ Erreur box_tare: {e}")
+            logger.debug("⚠️ Erreur box_tare: %s", e)
             return 0.7
 
@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class IngophaseContainerManager:
     @staticmethod
     def group_by_container(df):
@@ -13,13 +16,15 @@ class IngophaseContainerManager:
         return containers
 
     @staticmethod
-    def filter_by_container(df, column_name, container_value):
+    def split_by_container(df, column_name, containers):
         """
-        Filtre le DataFrame pour un container donné.
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
         """
         if column_name in df.columns:
-            filtered = df[df[column_name] == container_value]
+            parts = ContainerSplitter.split(df, column_name, containers)
         else:
-            filtered = df.copy()
-        print(f"🔍 Données filtrées pour container {container_value} : {len(filtered)} lignes")
-        return filtered
+            parts = [(container_value, df.copy()) for container_value in containers]
+        for container_value, filtered in parts:
+            print(f"🔍 Données filtrées pour container {container_value} : {len(filtered)} lignes")
+        return parts
@@ -1,19 +1,18 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class IngophaseLoader:
+    # Colonne lue en dehors du mapping : container du découpage
+    EXTRA_COLUMNS = ("ContainerNumber",)
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
         Charge la première feuille du fichier Excel.
         """
         try:
-            xls = pd.ExcelFile(file_path)
-            print(f"📄 Feuilles Excel détectées : {xls.sheet_names}")
-            if len(xls.sheet_names) == 0:
-                raise ValueError("Aucune feuille détectée dans le fichier.")
-            
-            # Toujours charger la première feuille
-            df = pd.read_excel(xls, sheet_name=0, dtype=str)
+            # Toujours charger la première feuille (sans ouvrir tout le classeur si déjà analysé)
+            columns = Workbook.template_columns(column_mapping, IngophaseLoader.EXTRA_COLUMNS)
+            df = Workbook(file_path, 0, columns=columns).read(dtype=str)
             print(f"📥 [IngophaseLoader] Chargement réussi : {len(df)} lignes")
             return df
         except Exception as e:
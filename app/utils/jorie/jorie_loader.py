@@ -1,11 +1,15 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class JorieLoader:
+    # Colonnes lues en dehors du mapping : palette du calcul des parts, en-tête container renommé
+    EXTRA_COLUMNS = ("Pallet", "ContainerNumber")
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
         Charge le fichier Excel à partir de la ligne 14 et retourne un DataFrame.
         """
-        df = pd.read_excel(file_path, dtype=str)
+        columns = Workbook.template_columns(column_mapping, JorieLoader.EXTRA_COLUMNS)
+        df = Workbook(file_path, 0, columns=columns).read(dtype=str)
         print(f"📥 [JorieLoader] Chargement réussi : {len(df)} lignes")
         return df
@@ -1,14 +1,17 @@
 import pandas as pd
+from ..workbook import Workbook
 
 class KakuziLoader:
+    # La première feuille (récapitulatif) n'est jamais lue
+    SKIPPED_SHEETS = 1
+
     @staticmethod
     def load_excel_file(file_path):
         """
         Charge les feuilles à partir de la 3e (index 1) du fichier Excel.
         Chaque feuille correspond à un conteneur.
         """
-        all_sheets = pd.read_excel(file_path, sheet_name=None, header=None, dtype=str)
-        sheet_names = list(all_sheets.keys())[1:] 
-        dfs = {name: all_sheets[name] for name in sheet_names}
+        sheets = Workbook.open_sheets(file_path, skip_sheets=KakuziLoader.SKIPPED_SHEETS)
+        dfs = {name: sheet.read(header=None, dtype=str) for name, sheet in sheets.items()}
         print(f"📥 [KakuziLoader] {len(dfs)} feuilles chargées (1 feuille = 1 container, à partir de la 3ᵉ)")
         return dfs
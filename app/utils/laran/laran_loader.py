@@ -1,11 +1,15 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class LaranLoader:
+    # Colonnes lues en dehors du mapping : cartons du calcul des parts, en-tête container renommé
+    EXTRA_COLUMNS = ("Quantity per grower", "Container n° (ABCD1234567)")
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
         Charge le fichier Excel et retourne un DataFrame.
         """
-        df = pd.read_excel(file_path, sheet_name=0, dtype=str)
+        columns = Workbook.template_columns(column_mapping, LaranLoader.EXTRA_COLUMNS)
+        df = Workbook(file_path, 0, columns=columns).read(dtype=str)
         print(f"📥 [LaranLoader] Chargement réussi : {len(df)} lignes")
         return df
@@ -0,0 +1,105 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributs standards d'un LogRecord : tout le reste vient de `extra=` et est exporté en JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener = None
+_installed_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON par message : time, level, logger, message, champs passés via `extra=`
+    et éventuelle trace d'exception.
+    """
+
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def parse_module_levels(value):
+    """
+    "app.services.safpro=DEBUG,app.routers=WARNING" → {"app.services.safpro": "DEBUG", ...}
+    """
+    levels = {}
+    for part in (value or "").split(","):
+        if "=" not in part:
+            continue
+        name, level = part.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level=None, log_format=None, module_levels=None, use_queue=None, stream=None):
+    """
+    Configure le logging de l'application (appelée une fois au démarrage ; un nouvel appel remplace
+    la configuration précédente). Sans argument, lit les variables d'environnement :
+    - LOG_LEVEL   : niveau global (INFO par défaut : les messages DEBUG des boucles ligne à ligne sont coupés)
+    - LOG_FORMAT  : "text" (défaut) ou "json" (production)
+    - LOG_LEVELS  : niveaux par module, ex. "app.services.safpro=DEBUG,app.routers=WARNING"
+    - LOG_ASYNC   : "1" pour écrire les logs depuis un thread dédié (QueueHandler/QueueListener),
+                    sans bloquer les extractions sur la sortie standard
+    """
+    global _listener, _installed_handler
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    if module_levels is None:
+        module_levels = parse_module_levels(os.getenv("LOG_LEVELS"))
+    if use_queue is None:
+        use_queue = os.getenv("LOG_ASYNC", "0").lower() in ("1", "true", "yes")
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    _remove_installed_handler(root)
+
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        _installed_handler = logging.handlers.QueueHandler(log_queue)
+    else:
+        _installed_handler = handler
+
+    root.addHandler(_installed_handler)
+    root.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+def _remove_installed_handler(root):
+    global _listener, _installed_handler
+
+    if _installed_handler is not None:
+        root.removeHandler(_installed_handler)
+        _installed_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@atexit.register
+def _flush_queue():
+    """Vide la file des logs asynchrones à l'arrêt du process."""
+    _remove_installed_handler(logging.getLogger())
@@ -1,12 +1,28 @@
 import pandas as pd
+from ..workbook import Workbook
 
 class MavunoLoader:
+    # En-tête du tableau en ligne 10 ; métadonnées dans les colonnes A à Q des lignes 1 à 10
+    HEADER_ROW = 9
+    METADATA_COLS = 17
+    # Colonne lue en dehors du mapping : en-tête container renommé en "Container n°"
+    EXTRA_COLUMNS = ("Container n° (ABCD1234567)",)
+
+    @staticmethod
+    def open_workbook(file_path, column_mapping=None):
+        """
+        Analyse la feuille une seule fois, limitée aux colonnes du tableau et des métadonnées.
+        """
+        columns = Workbook.template_columns(column_mapping, MavunoLoader.EXTRA_COLUMNS)
+        return Workbook(file_path, columns=columns, header_row=MavunoLoader.HEADER_ROW,
+                        min_col=MavunoLoader.METADATA_COLS)
+
     @staticmethod
     def load_excel_file(file_path):
         """
         Charge le tableau principal à partir de la ligne 10 (ligne 10 = index 9).
         """
-        df = pd.read_excel(file_path, dtype=str, skiprows=9)
+        df = Workbook.of(file_path).read(dtype=str, skiprows=9)
         print(f"📥 [MavunoLoader] Chargement principal : {len(df)} lignes")
         return df
 
@@ -15,7 +31,7 @@ class MavunoLoader:
         """
         Extrait les métadonnées des lignes 1 à 10 du fichier Excel.
         """
-        raw = pd.read_excel(file_path, header=None, nrows=10)
+        raw = Workbook.of(file_path).read(header=None, nrows=10)
 
         def extract_from_range(row_idx, col_range):
             for col in col_range:
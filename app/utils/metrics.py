@@ -0,0 +1,279 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Bornes des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Observations mises de côté par collect_observations() (thread courant), au lieu d'être enregistrées
+_collector = threading.local()
+
+
+def _collect(metric, method, value, labels):
+    """Met l'observation de côté si une collecte est en cours dans ce thread. Retourne True dans ce cas."""
+    observations = getattr(_collector, "observations", None)
+    if observations is None:
+        return False
+    observations.append((metric.name, method, value, labels))
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Compteur cumulatif, une série par combinaison de labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        if _collect(self, "inc", amount, labels):
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram:
+    """Histogramme (buckets cumulés, _sum, _count), une série par combinaison de labels."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        if _collect(self, "observe", value, labels):
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][position] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def samples(self):
+        with self._lock:
+            series = {key: {"counts": list(data["counts"]), "sum": data["sum"], "count": data["count"]}
+                      for key, data in self._series.items()}
+
+        lines = []
+        for key, data in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, data["counts"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(data['sum'])}")
+            lines.append(f"{self.name}_count{labels} {data['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Métriques de l'application, exposées au format texte Prometheus sur /api/metrics.
+    Les valeurs sont propres au process : une tâche exécutée dans un worker process (pool
+    d'extraction en mode "process") passe par call_collecting(), et ses observations sont
+    rejouées dans l'API avec replay_observations().
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def replay(self, observations):
+        by_name = {metric.name: metric for metric in self._metrics}
+        for name, method, value, labels in observations:
+            getattr(by_name[name], method)(value, **labels)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+EXTRACTIONS = metrics.counter(
+    "packing_list_extractions_total", "Extractions terminées, par fournisseur et statut (done/failed).",
+    ("fournisseur", "status"),
+)
+EXTRACTION_DURATION = metrics.histogram(
+    "packing_list_extraction_duration_seconds", "Durée totale d'une extraction (process_file).",
+    ("fournisseur",),
+)
+STAGE_DURATION = metrics.histogram(
+    "packing_list_stage_duration_seconds",
+    "Durée de chaque étape du pipeline (upload, prepare, group, extract, write, container).",
+    ("fournisseur", "stage"),
+)
+STAGE_ROWS = metrics.counter(
+    "packing_list_stage_rows_total", "Lignes traitées par étape du pipeline.", ("fournisseur", "stage"),
+)
+STAGE_BYTES = metrics.counter(
+    "packing_list_stage_bytes_total", "Octets reçus (upload) et écrits (CSV).", ("fournisseur", "stage"),
+)
+CSV_FILES = metrics.counter(
+    "packing_list_csv_files_total", "Fichiers CSV générés.", ("fournisseur",),
+)
+
+
+def count_rows(value):
+    """
+    Nombre de lignes d'un DataFrame, d'un dict de DataFrames (feuilles) ou d'une liste.
+    (Sans import de pandas : ce module est chargé au démarrage de l'API.)
+    """
+    if hasattr(value, "shape"):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(frame) for frame in value.values() if hasattr(frame, "shape"))
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    return 0
+
+
+def observe_stage(fournisseur, stage, duration, rows=0, size=0):
+    STAGE_DURATION.observe(duration, fournisseur=fournisseur, stage=stage)
+    if rows:
+        STAGE_ROWS.inc(rows, fournisseur=fournisseur, stage=stage)
+    if size:
+        STAGE_BYTES.inc(size, fournisseur=fournisseur, stage=stage)
+
+
+def instrument_service(service, fournisseur):
+    """
+    Branche les mesures sur une instance de service fournisseur (comme track_progress) :
+    - `_prepare_dataframe` → "prepare" (lecture Excel, normalisation, regroupement), lignes lues
+    - `_group_containers`  → "group"
+    - `_extract_data`      → "extract" (mapping des colonnes), lignes produites
+    - `_write_to_csv`      → "write", lignes et octets écrits
+    - `_process_container` → "container" (extraction + écriture d'un container)
+    """
+
+    def wrap(method_name, stage, rows=None, written=False):
+        method = getattr(service, method_name, None)
+        if method is None:
+            return
+
+        def _timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            duration = time.perf_counter() - start
+
+            size = 0
+            if written and args and isinstance(args[0], str) and os.path.exists(args[0]):
+                size = os.path.getsize(args[0])
+                CSV_FILES.inc(fournisseur=fournisseur)
+            observe_stage(fournisseur, stage, duration, rows(args, result) if rows else 0, size)
+            return result
+
+        setattr(service, method_name, _timed)
+
+    wrap("_prepare_dataframe", "prepare", rows=lambda args, result: count_rows(result))
+    wrap("_group_containers", "group")
+    wrap("_extract_data", "extract", rows=lambda args, result: count_rows(result))
+    wrap("_write_to_csv", "write", rows=lambda args, result: count_rows(args[1]) if len(args) > 1 else 0, written=True)
+    wrap("_process_container", "container")
+    return service
+
+
+@contextmanager
+def timed_extraction(fournisseur):
+    """
+    Mesure une extraction complète : durée et statut (done/failed) par fournisseur.
+    """
+    start = time.perf_counter()
+    status = "failed"
+    try:
+        yield
+        status = "done"
+    finally:
+        EXTRACTION_DURATION.observe(time.perf_counter() - start, fournisseur=fournisseur)
+        EXTRACTIONS.inc(fournisseur=fournisseur, status=status)
+
+
+@contextmanager
+def collect_observations():
+    """
+    Met de côté les observations faites dans le thread courant au lieu de les enregistrer,
+    et fournit leur liste (sérialisable) : [(métrique, méthode, valeur, labels)].
+    """
+    previous = getattr(_collector, "observations", None)
+    _collector.observations = []
+    try:
+        yield _collector.observations
+    finally:
+        _collector.observations = previous
+
+
+def call_collecting(func, *args):
+    """
+    Exécute `func(*args)` dans un worker process et retourne (résultat, observations).
+    En cas d'erreur, les observations (statut "failed"...) accompagnent l'exception
+    (attribut `metrics_observations`, conservé à la sérialisation).
+    """
+    with collect_observations() as observations:
+        try:
+            result = func(*args)
+        except Exception as e:
+            e.metrics_observations = list(observations)
+            raise
+    return result, observations
+
+
+def replay_observations(observations):
+    """Enregistre dans l'API les observations retournées par un worker process."""
+    metrics.replay(observations)
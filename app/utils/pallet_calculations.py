@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from .column_mapper import ColumnMapper
+
+# Valeurs de "Nb of pallets" considérées comme non renseignées
+EMPTY_PALLET_VALUES = [None, "", "0", "0,00000"]
+
+
+class PalletCalculations:
+    @staticmethod
+    def nb_of_pallets_by_palletnum(df, pallet_column, boxes_column, current_values=None,
+                                   empty_values=EMPTY_PALLET_VALUES, parse_boxes=float):
+        """
+        Calcule le nombre de palettes de chaque ligne d'un container, en une passe groupée :
+        - Si déjà défini (current_values hors de empty_values), conserve la valeur
+        - Si la palette n'a qu'une ligne → 1,00000
+        - Sinon → ratio (cartons de la ligne / total des cartons de la palette), format "0,12345"
+        - "" si le calcul est impossible (colonne absente, cartons non numériques...)
+
+        :param pallet_column: colonne du numéro de palette ("Pallet n°", "PALLET", "Barcode"...)
+        :param boxes_column: colonne du nombre de cartons ("Cartons per pallet", "CASES"...)
+        :param parse_boxes: conversion du nombre de cartons de la ligne en float
+        """
+        result = pd.Series("", index=df.index, dtype=object)
+
+        if current_values is not None:
+            current_values = current_values.astype(object)
+            is_set = ~current_values.isin([value for value in empty_values if value is not None])
+            if None in empty_values:
+                is_set &= ~current_values.map(lambda value: value is None).astype(bool)
+            result[is_set] = current_values[is_set]
+            to_compute = ~is_set
+        else:
+            to_compute = pd.Series(True, index=df.index)
+
+        if not to_compute.any():
+            return result
+
+        if pallet_column not in df.columns:
+            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: colonne '{pallet_column}' absente")
+            return result
+
+        # Les lignes sans numéro de palette ne comptent dans aucune palette
+        pallets = df[pallet_column].astype(object)
+        is_member = pallets.notna()
+        keys = pallets.where(is_member, "").to_numpy()
+        lines_per_pallet = is_member.groupby(keys, sort=False).transform("sum")
+
+        single = to_compute & (lines_per_pallet == 1)
+        result[single] = "1,00000"
+        to_compute &= ~single
+        if not to_compute.any():
+            return result
+
+        if boxes_column not in df.columns:
+            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: colonne '{boxes_column}' absente")
+            return result
+
+        # Total des cartons par palette (un carton non numérique invalide toute la palette)
+        box_counts, invalid = PalletCalculations._to_float(df[boxes_column].astype(object), float)
+        totals = box_counts.where(is_member, 0).groupby(keys, sort=False).transform("sum")
+        invalid_pallet = (invalid & is_member).groupby(keys, sort=False).transform("any")
+
+        boxes, invalid_boxes = PalletCalculations._to_float(ColumnMapper.first_value(df, [boxes_column]), parse_boxes)
+
+        errors = to_compute & (invalid_pallet | invalid_boxes)
+        if errors.any():
+            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {int(errors.sum())} ligne(s) avec un nombre de cartons invalide")
+
+        valid = to_compute & ~errors & (totals > 0)
+        ratios = boxes[valid] / totals[valid]
+        result[valid] = [f"{ratio:.5f}".replace(".", ",") for ratio in ratios]
+        return result
+
+    @staticmethod
+    def _to_float(values, parse):
+        """
+        Convertit une colonne en float (NaN conservés). Retourne (valeurs, masque des valeurs invalides).
+        """
+        converted = np.full(len(values), np.nan)
+        invalid = np.zeros(len(values), dtype=bool)
+        for position, value in enumerate(values):
+            if pd.isna(value):
+                continue
+            try:
+                converted[position] = parse(value)
+            except Exception:
+                invalid[position] = True
+        return pd.Series(converted, index=values.index), pd.Series(invalid, index=values.index)
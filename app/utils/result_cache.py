@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import sqlite3
+except ImportError:  # Python compilé sans sqlite3 (certains builds embarqués)
+    sqlite3 = None
+
+
+from .extraction_registry import extraction_registry
+
+# À incrémenter lorsqu'une évolution des services change le contenu des CSV générés,
+# pour ne pas resservir des fichiers produits par l'ancienne logique.
+# Les sources des services et utilitaires entrent aussi dans la clé (voir code_fingerprint) :
+# le numéro de version ne sert plus que pour les builds sans sources (PyInstaller).
+RESULT_CACHE_VERSION = 1
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_FINGERPRINTED_PACKAGES = ("services", "utils")
+_fingerprint = None
+
+
+def code_fingerprint():
+    """
+    SHA-256 des sources Python des services et utilitaires (calculé une fois par process) :
+    toute modification d'un service, d'un mapping ou d'un utilitaire change la clé du cache,
+    sans dépendre d'un RESULT_CACHE_VERSION incrémenté à la main. None si les sources
+    ne sont pas disponibles (build figé).
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+        found = False
+        for package in _FINGERPRINTED_PACKAGES:
+            for directory, subdirs, files in os.walk(os.path.join(APP_DIR, package)):
+                subdirs.sort()
+                for name in sorted(files):
+                    if not name.endswith(".py"):
+                        continue
+                    path = os.path.join(directory, name)
+                    digest.update(os.path.relpath(path, APP_DIR).encode("utf-8"))
+                    with open(path, "rb") as file:
+                        digest.update(file.read())
+                    found = True
+        _fingerprint = digest.hexdigest() if found else ""
+    return _fingerprint or None
+
+
+class ResultCache:
+    """
+    Cache des extractions indexé par (SHA-256 du classeur, fournisseur, paramètres CSV).
+
+    Un succès retourne les CSV déjà générés dans outputs/ sans relancer le pipeline pandas.
+    Chaque entrée mémorise la taille et la date de modification des fichiers : si un fichier
+    a été réécrit depuis (nouvelle extraction, /update-csv/), l'entrée est invalidée.
+    L'éviction LRU supprime les entrées les moins récemment utilisées tant que la taille totale
+    dépasse `max_bytes`. Les fichiers d'une entrée évincée ne sont supprimés que si aucune extraction
+    du registre ne les liste encore (`referenced_files()` → chemins encore utilisés) ; sinon ils le
+    sont par le registre à l'expiration de la dernière extraction qui les liste (`purge_expired`).
+    """
+
+    def __init__(self, path, max_bytes, enabled=True, referenced_files=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.referenced_files = referenced_files
+        self.enabled = enabled and sqlite3 is not None
+        self._local = threading.local()
+
+        if self.enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "cache_key TEXT PRIMARY KEY, fournisseur TEXT NOT NULL, files TEXT NOT NULL, "
+                    "total_size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)")
+
+    @classmethod
+    def from_env(cls, referenced_files=None):
+        """
+        RESULT_CACHE_ENABLED (1/0), RESULT_CACHE_PATH (data/result_cache.db),
+        RESULT_CACHE_MAX_MB (500, 0 = pas d'éviction).
+        """
+        return cls(
+            path=os.getenv("RESULT_CACHE_PATH", os.path.join("data", "result_cache.db")),
+            max_bytes=int(os.getenv("RESULT_CACHE_MAX_MB", "500")) * 1024 * 1024 or None,
+            enabled=os.getenv("RESULT_CACHE_ENABLED", "1") not in ("0", "false", "False"),
+            referenced_files=referenced_files,
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def make_key(file_sha256, fournisseur, settings):
+        payload = json.dumps(
+            {
+                "version": RESULT_CACHE_VERSION,
+                "code": code_fingerprint(),
+                "file_sha256": file_sha256,
+                "fournisseur": fournisseur,
+                "settings": settings or {},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _file_signature(path):
+        stat = os.stat(path)
+        return {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @staticmethod
+    def _is_unchanged(entry):
+        try:
+            stat = os.stat(entry["path"])
+        except OSError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+    def lookup(self, cache_key):
+        """
+        Retourne la liste des fichiers générés si l'entrée existe et que les fichiers sont intacts.
+        """
+        if not self.enabled:
+            return None
+
+        conn = self._connect()
+        row = conn.execute("SELECT files FROM results WHERE cache_key = ?", (cache_key,)).fetchone()
+        if row is None:
+            return None
+
+        entries = json.loads(row[0])
+        if not all(self._is_unchanged(entry) for entry in entries):
+            print(f"♻️ Cache invalidé (fichiers modifiés ou supprimés) : {cache_key[:12]}")
+            conn.execute("DELETE FROM results WHERE cache_key = ?", (cache_key,))
+            return None
+
+        conn.execute("UPDATE results SET last_used = ? WHERE cache_key = ?", (time.time(), cache_key))
+        return [entry["path"] for entry in entries]
+
+    def cached_files(self):
+        """
+        Fichiers servis par les entrées du cache (partagés avec toute extraction qui obtient un succès).
+        """
+        if not self.enabled:
+            return set()
+
+        rows = self._connect().execute("SELECT files FROM results").fetchall()
+        return {entry["path"] for row in rows for entry in json.loads(row[0])}
+
+    def store(self, cache_key, fournisseur, generated_files):
+        """
+        Enregistre les fichiers générés pour une clé puis applique l'éviction LRU.
+        """
+        if not self.enabled or not generated_files:
+            return
+
+        try:
+            entries = [self._file_signature(path) for path in generated_files]
+        except OSError as e:
+            print(f"⚠️ Résultat non mis en cache : {e}")
+            return
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (cache_key, fournisseur, files, total_size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, fournisseur, json.dumps(entries), sum(e["size"] for e in entries), now, now),
+            )
+            self.evict(keep=cache_key)
+        except sqlite3.Error as e:
+            # Le cache est une optimisation : une erreur ne doit pas faire échouer l'extraction
+            print(f"⚠️ Résultat non mis en cache : {e}")
+
+    def evict(self, keep=None):
+        """
+        Supprime les entrées les moins récemment utilisées tant que la taille totale dépasse max_bytes.
+        Un fichier n'est supprimé du disque que s'il n'a pas été réécrit, qu'aucune autre entrée ne le référence
+        et qu'aucune extraction du registre ne le liste encore dans ses `generated_files`.
+        L'entrée `keep` (celle qui vient d'être produite) n'est jamais évincée.
+        """
+        if not self.enabled or self.max_bytes is None:
+            return 0
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT cache_key, files, total_size FROM results ORDER BY last_used ASC"
+            ).fetchall()
+            total = sum(row[2] for row in rows)
+            evicted = []
+            for row in list(rows):
+                if total <= self.max_bytes:
+                    break
+                cache_key, files, size = row
+                if cache_key == keep:
+                    continue
+                rows.remove(row)
+                evicted.append((cache_key, json.loads(files)))
+                total -= size
+
+            for cache_key, _ in evicted:
+                conn.execute("DELETE FROM results WHERE cache_key = ?", (cache_key,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        still_referenced = {entry["path"] for _, files, _ in rows for entry in json.loads(files)}
+        if evicted and self.referenced_files is not None:
+            still_referenced |= set(self.referenced_files())
+        for cache_key, entries in evicted:
+            for entry in entries:
+                if entry["path"] not in still_referenced and self._is_unchanged(entry):
+                    os.remove(entry["path"])
+            print(f"🧹 Entrée de cache évincée : {cache_key[:12]} ({len(entries)} fichier(s))")
+
+        return len(evicted)
+
+
+result_cache = ResultCache.from_env(referenced_files=extraction_registry.referenced_files)
+extraction_registry.retained_files = result_cache.cached_files
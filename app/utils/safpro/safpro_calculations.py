@@ -1,5 +1,19 @@
+import logging
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Nombre de fruits par carton des SC de 9 à 11 kg, par calibre
+SC_FRUITS_PER_BOX = {
+    "1": 94,
+    "1X": 75,
+    "1XX": 68,
+    "1XXX": 43,
+    "2": 98,
+    "3": 105,
+}
+
+
 class SafproCalculations:
     @staticmethod
     def nb_of_fruits_per_box(caliber, species="", net_weight_per_box=None):
@@ -15,16 +29,8 @@ class SafproCalculations:
                 try:
                     net_weight = float(str(net_weight_per_box).replace(",", "."))
                     if 9.0 <= net_weight <= 11.0:
-                        mapping = {
-                            "1": 94,
-                            "1X": 75,
-                            "1XX": 68,
-                            "1XXX": 43,
-                            "2": 98,
-                            "3": 105
-                        }
-                        if caliber_str in mapping:
-                            return mapping[caliber_str]
+                        if caliber_str in SC_FRUITS_PER_BOX:
+                            return SC_FRUITS_PER_BOX[caliber_str]
                 except ValueError:
                     pass  # On ignore si le poids est invalide
 
@@ -32,7 +38,7 @@ class SafproCalculations:
             return caliber_str
 
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
             return ""
 
 
@@ -54,6 +60,6 @@ class SafproCalculations:
                     pass  
             return original_value 
         except Exception as e:
-            print(f"⚠️ Erreur box_tare: {e}")
+            logger.debug("⚠️ Erreur box_tare: %s", e)
             return original_value
 
@@ -1,4 +1,5 @@
 import pandas as pd
+from ..workbook import Workbook
 
 class SasiniLoader:
     @staticmethod
@@ -7,6 +8,7 @@ class SasiniLoader:
         Charge toutes les feuilles Excel et retourne un dictionnaire : {nom_feuille: DataFrame}
         Chaque feuille représente un container distinct.
         """
-        all_dfs = pd.read_excel(file_path, sheet_name=None, dtype=str)
+        sheets = Workbook.open_sheets(file_path)
+        all_dfs = {name: sheet.read(dtype=str) for name, sheet in sheets.items()}
         print(f"📥 [SasiniLoader] Feuilles chargées : {list(all_dfs.keys())}")
         return all_dfs
@@ -1,12 +1,20 @@
 # shalimar_calculations.py
+import logging
 import pandas as pd
 import re
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
+
+# Premier nombre (décimales éventuelles) d'une valeur texte, ex. "4.3 KGS"
+NUMBER_PATTERN = re.compile(r"\d+(\.\d+)?")
+
 
 class ShalimarCalculations:
     @staticmethod
     def _extract_numeric(value):
         try:
-            match = re.search(r"\d+(\.\d+)?", str(value).replace(",", "."))
+            match = NUMBER_PATTERN.search(str(value).replace(",", "."))
             return float(match.group()) if match else None
         except Exception:
             return None
@@ -44,26 +52,16 @@ class ShalimarCalculations:
             if w == 10.0:
                 return int(round(cal * 2.5))
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
         return ""
 
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
-        try:
-            if current_value not in [None, "", "0", "0,00000"]:
-                return current_value
-            if pd.isna(pallet_num) or pd.isna(boxes):
-                return ""
-            lignes = df[df["Pallet Number"] == pallet_num]
-            if len(lignes) == 1:
-                return "1,00000"
-            total_boxes = lignes["Cartons per pallet"].dropna().astype(float).sum()
-            boxes = float(boxes)
-            if total_boxes > 0:
-                ratio = boxes / total_boxes
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {e}")
+    def nb_of_pallets_by_palletnum(df, current_values=None):
+        """
+        Nb of pallets de chaque ligne du container (palette "Pallet Number", cartons "Cartons per pallet") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
+        """
+        return PalletCalculations.nb_of_pallets_by_palletnum(df, "Pallet Number", "Cartons per pallet", current_values)
 
     @staticmethod
     def compute_box_tare(df):
@@ -1,11 +1,18 @@
 import pandas as pd
 import re
+from ..workbook import Workbook
 
 class ShalimarLoader:
+    # Zone utile du modèle : colonnes A à P (métadonnées et tableau)
+    MAX_COL = 16
+
+    @staticmethod
+    def open_workbook(file_path):
+        return Workbook(file_path, max_col=ShalimarLoader.MAX_COL)
 
     @staticmethod
     def load_excel_file(file_path):
-        return pd.read_excel(file_path, header=None, dtype=str)
+        return Workbook.of(file_path).read(header=None, dtype=str)
 
     @staticmethod
     def extract_metadata(df):
@@ -59,7 +66,7 @@ class ShalimarLoader:
         """
         try:
             # Lire à partir de la ligne 16 (index 15), colonnes B à M
-            df = pd.read_excel(file_path, header=15, usecols="B:P", dtype=str)
+            df = Workbook.of(file_path).read(header=15, usecols="B:P", dtype=str)
             df.columns = [
                 "Pallet Number",       # B
                 "Product",             # C
@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .extraction_pool import extraction_pool, in_extraction_worker
+from .metrics import call_collecting, replay_observations
+
+# forkserver : les workers ne copient pas l'état du processus de l'API (threads, connexions SQLite, verrous) ;
+# spawn là où forkserver n'existe pas (Windows, macOS selon la version)
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class SheetPool:
+    """
+    Traitement en parallèle des feuilles d'un classeur (1 feuille = 1 container chez Kakuzi, Sasini)
+    dans un pool de processus unique, créé au premier classeur qui en a besoin puis réutilisé.
+
+    `map(func, *iterables)` retourne les résultats dans l'ordre des feuilles, comme une boucle :
+    la numérotation des fichiers (enumerate(..., start=1)) est inchangée. `func` doit être une
+    fonction de module (importable) et ses arguments sérialisables (DataFrame, dict, classe).
+
+    Les feuilles sont traitées dans le processus courant :
+    - en dessous de `min_sheets` feuilles, ou avec un seul worker (démarrer le pool coûterait plus que le gain) ;
+    - dans un worker du pool d'extraction en mode "process" (pas de pool de processus imbriqué) ;
+    - dans un exécutable empaqueté (PyInstaller), où un worker relancerait l'exécutable lui-même.
+    Le pool étant partagé, les extractions simultanées se répartissent les mêmes `max_workers` processus.
+    """
+
+    def __init__(self, max_workers=None, min_sheets=4):
+        self.max_workers = max_workers if max_workers is not None else extraction_pool.max_workers
+        self.min_sheets = min_sheets
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        SHEET_POOL_WORKERS (EXTRACTION_MAX_WORKERS, 1 = traitement séquentiel),
+        SHEET_POOL_MIN_SHEETS (4).
+        """
+        max_workers = os.getenv("SHEET_POOL_WORKERS")
+        return cls(
+            max_workers=int(max_workers) if max_workers else None,
+            min_sheets=int(os.getenv("SHEET_POOL_MIN_SHEETS", "4")),
+        )
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context(START_METHOD)
+                )
+            return self._executor
+
+    def map(self, func, *iterables):
+        items = list(zip(*iterables))
+        workers = min(self.max_workers, len(items))
+        if (workers < 2 or len(items) < self.min_sheets or in_extraction_worker()
+                or getattr(sys, "frozen", False)):
+            return [func(*args) for args in items]
+
+        print(f"🧵 {len(items)} feuilles réparties sur {workers} processus")
+        chunksize = max(1, len(items) // (workers * 4))
+        executor = self._get_executor()
+        try:
+            # Les métriques observées dans les workers sont rejouées ici (voir metrics.call_collecting)
+            outcomes = list(executor.map(call_collecting, [func] * len(items), *zip(*items), chunksize=chunksize))
+        except BrokenProcessPool:
+            # Worker arrêté brutalement : le pool est recréé au prochain classeur
+            self.shutdown(wait=False)
+            raise
+        except Exception as e:
+            replay_observations(getattr(e, "metrics_observations", ()))
+            raise
+
+        results = []
+        for result, observations in outcomes:
+            replay_observations(observations)
+            results.append(result)
+        return results
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+sheet_pool = SheetPool.from_env()
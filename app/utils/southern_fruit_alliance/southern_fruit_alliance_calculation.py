@@ -1,3 +1,8 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
 class Calculations:
     @staticmethod
     def sfa_net_weight_per_box(net_weight, cartons):
@@ -29,15 +34,15 @@ class Calculations:
                         gross_weight = float(gross_weight)
                         net_weight = float(net_weight)
                     except (ValueError, TypeError):
-                        print(f"⚠️ Données non numériques pour {barcode}, impossible de calculer Box Tare.")
+                        logger.debug("⚠️ Données non numériques pour %s, impossible de calculer Box Tare.", barcode)
                         return ""
 
                     if cartons > 0:
                         return f"{(gross_weight - 20 - net_weight) / cartons:.2f}".replace(".", ",")
                 else:
-                    print(f"⚠️ Impossible de calculer Box Tare : colonnes manquantes pour {barcode}")
+                    logger.debug("⚠️ Impossible de calculer Box Tare : colonnes manquantes pour %s", barcode)
         except Exception as e:
-            print(f"❌ Erreur dans sfa_box_tare pour {barcode} : {e}")
+            logger.debug("❌ Erreur dans sfa_box_tare pour %s : %s", barcode, e)
         return ""
 
 
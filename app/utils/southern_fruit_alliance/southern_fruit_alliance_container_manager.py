@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class ContainerManager:
     @staticmethod
     def group_by_container(df, container_column="Container No"):
@@ -7,6 +10,9 @@ class ContainerManager:
         return df[container_column].dropna().unique()
 
     @staticmethod
-    def filter_by_container(df, container_column, container):
-        """Filtre les données pour un conteneur spécifique."""
-        return df[df[container_column] == container]
+    def split_by_container(df, column_name, containers):
+        """
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
+        """
+        return ContainerSplitter.split(df, column_name, containers)
@@ -1,15 +1,20 @@
-import pandas as pd
 import os
 
+from ..workbook import Workbook
+
 class SFALoader:
+    # Colonnes lues en dehors du mapping : poids et cartons sommés par palette
+    EXTRA_COLUMNS = ("Gross Weight", "Nett Weight", "No Cartons")
+
     @staticmethod
-    def load_excel_file(file_path, sheet_name="Data", header=0):
+    def load_excel_file(file_path, sheet_name="Data", header=0, column_mapping=None):
         """
         Charge un fichier Excel (.xlsx ou .xls) et retourne un DataFrame.
 
         :param file_path: Chemin du fichier Excel.
         :param sheet_name: Nom de la feuille à charger.
         :param header: Ligne d'en-tête du fichier Excel.
+        :param column_mapping: Mapping du template : seules ses colonnes (et EXTRA_COLUMNS) sont lues.
         :return: pandas.DataFrame contenant les données du fichier Excel.
         :raises ValueError: Si le chargement échoue ou si l'extension n'est pas supportée.
         :raises FileNotFoundError: Si le fichier n'existe pas.
@@ -18,17 +23,15 @@ class SFALoader:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Le fichier spécifié n'existe pas : {file_path}")
 
-        # Déterminer le moteur en fonction de l'extension
-        if file_path.endswith(".xlsx"):
-            engine = "openpyxl"
-        elif file_path.endswith(".xls"):
-            engine = "xlrd"
-        else:
+        # Vérifier l'extension (.xlsx lu par openpyxl, .xls par xlrd)
+        if not file_path.endswith((".xlsx", ".xls")):
             raise ValueError("Format de fichier non pris en charge. Utilisez .xlsx ou .xls.")
 
         try:
             # Charger le fichier Excel
-            dataframe = pd.read_excel(file_path, sheet_name=sheet_name, header=header, engine=engine)
+            columns = Workbook.template_columns(column_mapping, SFALoader.EXTRA_COLUMNS)
+            workbook = Workbook(file_path, sheet_name, columns=columns, header_row=header)
+            dataframe = workbook.read(header=header)
             return dataframe
         except Exception as e:
             raise ValueError(f"Erreur lors du chargement du fichier '{file_path}' avec la feuille '{sheet_name}': {e}")
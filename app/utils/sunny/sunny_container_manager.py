@@ -1,3 +1,6 @@
+from ..container_splitter import ContainerSplitter
+
+
 class SunnyContainerManager:
     @staticmethod
     def group_by_container(dataframe):
@@ -7,9 +10,10 @@ class SunnyContainerManager:
         return dataframe["Container"].unique()
 
     @staticmethod
-    def filter_by_container(dataframe, column_name, container):
+    def split_by_container(df, column_name, containers):
         """
-        Filtre les données pour un conteneur spécifique.
+        Découpe le DataFrame par container en une seule passe : [(container, sous-DataFrame)],
+        dans l'ordre de `containers`.
         """
-        return dataframe[dataframe[column_name] == container]
+        return ContainerSplitter.split(df, column_name, containers)
 
@@ -1,16 +1,20 @@
-import pandas as pd
-import openpyxl
 import os
 
+from ..workbook import Workbook
+
 class SunnyLoader:
+    # Toutes les colonnes lues figurent dans le mapping
+    EXTRA_COLUMNS = ()
+
     @staticmethod
-    def load_excel_file(file_path, sheet_name=None, header=0):
+    def load_excel_file(file_path, sheet_name=None, header=0, column_mapping=None):
         """
         Charge un fichier Excel (.xlsx ou .xls) et retourne un DataFrame.
 
         :param file_path: Chemin du fichier Excel.
         :param sheet_name: Nom de la feuille à charger. Si None, charge la première feuille.
         :param header: Ligne d'en-tête du fichier Excel.
+        :param column_mapping: Mapping du template : seules ses colonnes (et EXTRA_COLUMNS) sont lues.
         :return: pandas.DataFrame contenant les données du fichier Excel.
         :raises ValueError: Si le chargement échoue ou si l'extension n'est pas supportée.
         :raises FileNotFoundError: Si le fichier n'existe pas.
@@ -18,23 +22,18 @@ class SunnyLoader:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Le fichier spécifié n'existe pas : {file_path}")
 
-        if file_path.endswith(".xlsx"):
-            engine = "openpyxl"
-        elif file_path.endswith(".xls"):
-            engine = "xlrd"
-        else:
+        if not file_path.endswith((".xlsx", ".xls")):
             raise ValueError("Format de fichier non pris en charge. Utilisez .xlsx ou .xls.")
 
         try:
-            # Charger les noms des feuilles disponibles
-            excel_file = pd.ExcelFile(file_path, engine=engine)
-            
             # Utiliser la première feuille si sheet_name n'est pas spécifié
             if sheet_name is None:
-                sheet_name = excel_file.sheet_names[0]
-                print(f"Aucun nom de feuille spécifié. Chargement de la première feuille : {sheet_name}")
+                sheet_name = 0
+                print("Aucun nom de feuille spécifié. Chargement de la première feuille")
 
-            dataframe = pd.read_excel(excel_file, sheet_name=sheet_name, header=header)
+            columns = Workbook.template_columns(column_mapping, SunnyLoader.EXTRA_COLUMNS)
+            workbook = Workbook(file_path, sheet_name, columns=columns, header_row=header)
+            dataframe = workbook.read(header=header)
             return dataframe
 
         except Exception as e:
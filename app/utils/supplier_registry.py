@@ -0,0 +1,162 @@
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+
+class SupplierRegistry:
+    """
+    Registre des services fournisseurs, chargés à la demande.
+
+    Chaque fournisseur est associé au chemin pointé de sa classe de service
+    ("app.services.sunny.sunny_service.SunnyService") : le module (et son loader, df_manager,
+    calculations, pandas/openpyxl...) n'est importé qu'à la première extraction du fournisseur,
+    puis la classe est gardée en cache. Le démarrage de l'API (redémarrage du container,
+    build PyInstaller) ne paie donc plus l'import des 23 services.
+
+    S'utilise comme le dictionnaire FOURNISSEURS_SUPPORTES : `nom in registre`, `registre[nom]`.
+
+    ⚠️ PyInstaller ne voit pas les imports par chemin : passer `module_paths()` en hiddenimports.
+    """
+
+    def __init__(self, class_paths):
+        self._class_paths = dict(class_paths)
+        self._classes = {}
+        self._import_times = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, fournisseur):
+        return fournisseur in self._class_paths
+
+    def __getitem__(self, fournisseur):
+        return self.get(fournisseur)
+
+    def __iter__(self):
+        return iter(self._class_paths)
+
+    def __len__(self):
+        return len(self._class_paths)
+
+    def keys(self):
+        return self._class_paths.keys()
+
+    def items(self):
+        """(fournisseur, classe) pour tous les fournisseurs : importe tous les services."""
+        return [(fournisseur, self.get(fournisseur)) for fournisseur in self._class_paths]
+
+    def get(self, fournisseur):
+        """
+        Retourne la classe de service du fournisseur, en important son module au premier appel.
+        Lève KeyError si le fournisseur n'est pas enregistré.
+        """
+        class_path = self._class_paths[fournisseur]
+        service_class = self._classes.get(class_path)
+        if service_class is not None:
+            return service_class
+
+        with self._lock:
+            if class_path not in self._classes:
+                module_path, class_name = class_path.rsplit(".", 1)
+                start = time.perf_counter()
+                module = importlib.import_module(module_path)
+                self._classes[class_path] = getattr(module, class_name)
+                self._import_times[class_path] = time.perf_counter() - start
+                print(f"📦 Service {class_name} chargé en {self._import_times[class_path] * 1000:.0f} ms")
+            return self._classes[class_path]
+
+    def is_loaded(self, fournisseur):
+        return self._class_paths.get(fournisseur) in self._classes
+
+    def module_paths(self):
+        """Modules des services (hiddenimports PyInstaller, préchargement)."""
+        return sorted({class_path.rsplit(".", 1)[0] for class_path in self._class_paths.values()})
+
+    def preload(self):
+        """Importe tous les services (ex. avant un fork de workers)."""
+        for fournisseur in self._class_paths:
+            self.get(fournisseur)
+
+    def import_report(self, preload=False):
+        """
+        Rapport de chargement : pour chaque classe de service, son statut et la durée de son import.
+
+        La durée mesurée est celle du premier import du module dans le process : les dépendances
+        communes (pandas, openpyxl) sont comptées pour le premier service chargé uniquement.
+        """
+        if preload:
+            self.preload()
+
+        services = []
+        for class_path in sorted(set(self._class_paths.values())):
+            import_time = self._import_times.get(class_path)
+            services.append({
+                "service": class_path,
+                "fournisseurs": sorted(name for name, path in self._class_paths.items() if path == class_path),
+                "loaded": class_path in self._classes,
+                "import_ms": round(import_time * 1000, 1) if import_time is not None else None,
+            })
+
+        loaded_times = [service["import_ms"] for service in services if service["import_ms"] is not None]
+        return {
+            "fournisseurs": len(self._class_paths),
+            "services": len(services),
+            "loaded": len(loaded_times),
+            "total_import_ms": round(sum(loaded_times), 1),
+            "details": services,
+        }
+
+
+def startup_import_report(module="app.main", top=15):
+    """
+    Mesure le coût d'import de `module` dans un interpréteur neuf (`python -X importtime`)
+    et retourne le total et les modules de premier niveau les plus coûteux (cumulé, en ms).
+    Réservé à la ligne de commande (`python -m app.utils.supplier_registry`) : l'API ne lance
+    pas d'interpréteur, et un exécutable PyInstaller n'en embarque pas.
+    """
+    if getattr(sys, "frozen", False):
+        raise RuntimeError("Mesure -X importtime indisponible dans un exécutable empaqueté.")
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import de {module} impossible : {completed.stderr.strip().splitlines()[-1:]}")
+
+    # Sortie post-ordre : les imports de `module` (profondeur 1) précèdent sa propre ligne
+    total_us, children, pending = 0, [], []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                total_us, children = int(cumulative), pending
+            pending = []
+        elif depth == 1:
+            pending.append((name.strip(), int(cumulative)))
+
+    children.sort(key=lambda entry: entry[1], reverse=True)
+
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "modules": [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in children[:top]],
+    }
+
+
+if __name__ == "__main__":
+    # python -m app.utils.supplier_registry : coût de démarrage de l'API puis de chaque service
+    from app.routers.root_app import FOURNISSEURS_SUPPORTES
+
+    report = startup_import_report()
+    print(f"🚀 Import de {report['module']} : {report['total_ms']} ms")
+    for entry in report["modules"]:
+        print(f"   {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+
+    services = FOURNISSEURS_SUPPORTES.import_report(preload=True)
+    print(f"📦 {services['services']} services chargés à la demande : {services['total_import_ms']} ms au total")
+    for service in services["details"]:
+        print(f"   {service['import_ms']:>9.1f} ms  {service['service']}")
@@ -0,0 +1,41 @@
+import threading
+from types import MappingProxyType
+
+
+class SupplierTemplate:
+    """
+    Partie immuable d'un service fournisseur, construite une seule fois par process et par classe
+    de service : le `pl_column_mapping` (champ CSV → colonnes Excel candidates), en lecture seule.
+
+    Le service instancié à chaque extraction ne porte plus que le contexte de la requête
+    (csv_settings, suivi de progression) : son instanciation ne reconstruit plus le mapping,
+    et le template peut être partagé sans risque entre extractions concurrentes.
+    """
+
+    __slots__ = ("pl_column_mapping",)
+
+    _templates = {}
+    _lock = threading.Lock()
+
+    def __init__(self, pl_column_mapping):
+        # Colonnes candidates en tuples : ni le mapping ni ses listes ne peuvent être modifiés
+        mapping = {csv_field: tuple(excel_columns) for csv_field, excel_columns in pl_column_mapping.items()}
+        object.__setattr__(self, "pl_column_mapping", MappingProxyType(mapping))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SupplierTemplate est immuable.")
+
+    @classmethod
+    def of(cls, service_class):
+        """
+        Retourne le template de `service_class`, construit au premier appel à partir
+        de sa méthode statique `_initialize_column_mapping()`.
+        """
+        template = cls._templates.get(service_class)
+        if template is None:
+            with cls._lock:
+                template = cls._templates.get(service_class)
+                if template is None:
+                    template = cls(service_class._initialize_column_mapping())
+                    cls._templates[service_class] = template
+        return template
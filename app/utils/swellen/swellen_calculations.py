@@ -1,4 +1,21 @@
+import logging
 import pandas as pd
+from ..pallet_calculations import PalletCalculations
+
+logger = logging.getLogger(__name__)
+
+# Nombre de fruits par carton des SC, par calibre ("" = inconnu)
+SC_FRUITS_PER_BOX = {
+    "1": 94,
+    "1X": 75,
+    "1XX": 68,
+    "1XXX": 43,
+    "2": 98,
+    "3": "",
+    "4": "",
+    "5": "",
+}
+
 
 class SwellenCalculations:
     @staticmethod
@@ -13,57 +30,26 @@ class SwellenCalculations:
             species = species.strip().upper()
 
             if species in ["SC"]:
-                mapping = {
-                "1": 94,
-                "1X": 75,
-                "1XX": 68,
-                "1XXX": 43,
-                "2": 98,
-                "3": "",  # Inconnu
-                "4": "",  # Inconnu
-                "5": "",  # Inconnu
-            }
-                if caliber_str in mapping and mapping[caliber_str] != "":
-                    return mapping[caliber_str]
+                if caliber_str in SC_FRUITS_PER_BOX and SC_FRUITS_PER_BOX[caliber_str] != "":
+                    return SC_FRUITS_PER_BOX[caliber_str]
                 else:
                     return caliber_str  # défaut : retourne le calibre tel quel
             else:
                 return caliber_str  # pour les autres espèces, on retourne juste le calibre
         except Exception as e:
-            print(f"⚠️ Erreur nb_of_fruits_per_box: {e}")
+            logger.debug("⚠️ Erreur nb_of_fruits_per_box: %s", e)
             return ""
 
 
     
     @staticmethod
-    def nb_of_pallets_by_palletnum(pallet_num, boxes, df, current_value=None):
+    def nb_of_pallets_by_palletnum(df, current_values=None):
         """
-        Calcule le nombre de palettes si non défini :
-        - Si une seule ligne → 1,00000
-        - Sinon → ratio (boxes / total_boxes pour cette palette)
-        - Si déjà défini (current_value), retourne sa valeur
+        Nb of pallets de chaque ligne du container (palette "Pallet n°", cartons "Cartons per pallet") :
+        valeur existante conservée, sinon 1,00000 ou part des cartons de la palette.
         """
-        try:
-            if current_value not in [None, "", "0", "0,00000"]:
-                return current_value
-
-            if pd.isna(pallet_num) or pd.isna(boxes):
-                return ""
+        return PalletCalculations.nb_of_pallets_by_palletnum(df, "Pallet n°", "Cartons per pallet", current_values)
 
-            lignes = df[df["Pallet n°"] == pallet_num]
-
-            if len(lignes) == 1:
-                return "1,00000"
-
-            total_boxes = lignes["Cartons per pallet"].dropna().astype(float).sum()
-            boxes = float(boxes)
-
-            if total_boxes > 0:
-                ratio = boxes / total_boxes
-                return f"{ratio:.5f}".replace(".", ",")
-        except Exception as e:
-            print(f"⚠️ Erreur nb_of_pallets_by_palletnum: {e}")
-    
     @staticmethod
     def net_weight_per_pallet(cartons, weight_per_box):
         """
@@ -75,7 +61,7 @@ class SwellenCalculations:
             weight = float(str(weight_per_box).replace(",", "."))
             return round(cartons * weight, 2)
         except Exception as e:
-            print(f"⚠️ Erreur net_weight_per_pallet: {e}")
+            logger.debug("⚠️ Erreur net_weight_per_pallet: %s", e)
             return ""
         
     @staticmethod
@@ -91,7 +77,7 @@ class SwellenCalculations:
             if cartons > 0:
                 return round(mass / cartons, 2)
         except Exception as e:
-            print(f"⚠️ Erreur net_weight_per_box: {e}")
+            logger.debug("⚠️ Erreur net_weight_per_box: %s", e)
         return ""
 
 
@@ -106,6 +92,6 @@ class SwellenCalculations:
             cartons = int(float(str(cartons_per_pallet).replace(",", ".")))
             return 0.35 if cartons == 216 else 0.7
         except Exception as e:
-            print(f"⚠️ Erreur box_tare: {e}")
+            logger.debug("⚠️ Erreur box_tare: %s", e)
             return 0.7
 
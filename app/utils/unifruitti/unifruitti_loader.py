@@ -1,11 +1,15 @@
-import pandas as pd
+from ..workbook import Workbook
 
 class UnifruittiLoader:
+    # Colonne lue en dehors du mapping : en-tête container renommé en "Container n°"
+    EXTRA_COLUMNS = ("Container n° (ABCD1234567)",)
+
     @staticmethod
-    def load_excel_file(file_path):
+    def load_excel_file(file_path, column_mapping=None):
         """
         Charge le fichier Excel à partir de la ligne 14 et retourne un DataFrame.
         """
-        df = pd.read_excel(file_path, sheet_name="Packing Data", dtype=str, skiprows=13)
+        columns = Workbook.template_columns(column_mapping, UnifruittiLoader.EXTRA_COLUMNS)
+        df = Workbook(file_path, "Packing Data", columns=columns, header_row=13).read(dtype=str, skiprows=13)
         print(f"📥 [UnifruittiLoader] Chargement réussi : {len(df)} lignes")
         return df
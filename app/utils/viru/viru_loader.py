@@ -1,14 +1,30 @@
 import pandas as pd
 from .viru_df_manager import ViruDataframeManager
+from ..workbook import Workbook
 
 
 class ViruLoader:
+    # En-tête du tableau en ligne 15 ; métadonnées dans les colonnes A à E (B4:B11, E6, E7)
+    HEADER_ROW = 14
+    METADATA_COLS = 5
+    # Colonnes lues en dehors du mapping : palette du calcul des parts, en-tête container renommé
+    EXTRA_COLUMNS = ("Pallet n°", "Container n°", "Container n° (ABCD1234567)")
+
+    @staticmethod
+    def open_workbook(file_path, column_mapping=None):
+        """
+        Analyse la feuille une seule fois, limitée aux colonnes du tableau et des métadonnées.
+        """
+        columns = Workbook.template_columns(column_mapping, ViruLoader.EXTRA_COLUMNS)
+        return Workbook(file_path, columns=columns, header_row=ViruLoader.HEADER_ROW,
+                        min_col=ViruLoader.METADATA_COLS)
+
     @staticmethod
     def load_excel_file(file_path):
         """
         Charge le fichier Excel complet sans l’analyser.
         """
-        df = pd.read_excel(file_path, header=None, dtype=str)
+        df = Workbook.of(file_path).read(header=None, dtype=str)
         return df
 
     @staticmethod
@@ -35,7 +51,7 @@ class ViruLoader:
         """
         Charge uniquement le tableau avec en-têtes en ligne 15, data à partir de ligne 17 (index 16).
         """
-        df = pd.read_excel(file_path, header=14, skiprows=[15], dtype=str)
+        df = Workbook.of(file_path).read(header=14, skiprows=[15], dtype=str)
         ViruDataframeManager.normalize_columns(df)
         print(f"📊 [ViruLoader] Tableau extrait : {len(df)} lignes")
         return df
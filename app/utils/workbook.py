@@ -0,0 +1,286 @@
+import itertools
+import zipfile
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from openpyxl.utils.cell import column_index_from_string, coordinate_to_tuple
+from openpyxl.utils.exceptions import InvalidFileException
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+from .workbook_cache import workbook_cache
+
+
+class Workbook:
+    """
+    Feuille Excel analysée une seule fois, qui sert à la fois les cellules de métadonnées
+    (en-tête du packing list) et le tableau des palettes.
+
+    `read(**kwargs)` retourne le même DataFrame que `pd.read_excel(file_path, sheet_name, **kwargs)` :
+    les cellules sont converties comme le fait pandas puis passées au même parseur.
+
+    `max_row` / `max_col` (1 = ligne 1 / colonne A) bornent la zone lue : les cellules au-delà
+    ne sont jamais matérialisées. `columns` borne la zone d'après le tableau : seules les colonnes
+    jusqu'à la dernière dont l'en-tête (ligne `header_row`, 0 = ligne 1) est l'un de ces noms sont
+    converties, et au moins les `min_col` premières (cellules de métadonnées). Les fichiers .xlsx
+    sont lus en streaming (openpyxl read_only), les autres formats (.xls...) passent par pandas puis
+    sont recadrés. Les feuilles analysées sont conservées dans le cache des classeurs
+    (workbook_cache), indexé par le SHA-256 du fichier.
+    """
+
+    def __init__(self, file_path, sheet_name=0, max_row=None, max_col=None,
+                 columns=None, header_row=0, min_col=None, _rows=None):
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.max_row = max_row
+        self.max_col = max_col
+
+        if _rows is None:
+            bound = (columns, header_row, min_col) if columns else None
+            _rows = next(iter(self._load_sheets(file_path, [sheet_name], max_row, max_col, bound).values()))
+        self.rows = _rows
+
+    @classmethod
+    def of(cls, source, sheet_name=0, max_row=None, max_col=None, columns=None, header_row=0, min_col=None):
+        """
+        Retourne `source` s'il s'agit déjà d'un Workbook, sinon analyse le fichier.
+        Permet aux loaders d'accepter indifféremment un chemin ou un classeur déjà lu.
+        """
+        if isinstance(source, cls):
+            return source
+        return cls(source, sheet_name, max_row=max_row, max_col=max_col,
+                   columns=columns, header_row=header_row, min_col=min_col)
+
+    @staticmethod
+    def template_columns(column_mapping, extra_columns=()):
+        """
+        Noms d'en-tête utilisés par un template : champs et colonnes candidates du `pl_column_mapping`,
+        plus les colonnes lues en dehors du mapping (`extra_columns`). None sans mapping (pas de borne).
+        """
+        if column_mapping is None:
+            return None
+        names = set(column_mapping) | {col for cols in column_mapping.values() for col in cols}
+        names.update(extra_columns)
+        return tuple(sorted({str(name).strip() for name in names} - {""}))
+
+    @classmethod
+    def open_sheets(cls, file_path, skip_sheets=0, max_row=None, max_col=None):
+        """
+        Analyse les feuilles du classeur à partir de la feuille `skip_sheets` (0 = toutes),
+        en une seule ouverture du fichier. Retourne {nom_feuille: Workbook} dans l'ordre du classeur.
+        """
+        sheets = cls._load_sheets(file_path, None, max_row, max_col, skip_sheets=skip_sheets)
+        return {
+            name: cls(file_path, name, max_row=max_row, max_col=max_col, _rows=rows)
+            for name, rows in sheets.items()
+        }
+
+    def read(self, header=0, usecols=None, nrows=None, **kwargs):
+        """
+        Vue tabulaire de la feuille, avec les paramètres de `pd.read_excel`
+        (header, usecols, skiprows, nrows, dtype...).
+        """
+        rows = self._rows_for(header, kwargs.get("skiprows"), nrows)
+        if not rows:
+            return pd.DataFrame()
+
+        try:
+            parser = TextParser(
+                rows,
+                header=header,
+                usecols=self._convert_usecols(usecols),
+                nrows=nrows,
+                skip_blank_lines=False,
+                **kwargs,
+            )
+            return parser.read(nrows=nrows)
+        except EmptyDataError:
+            return pd.DataFrame()
+
+    def cell(self, coordinate):
+        """
+        Valeur d'une cellule en notation Excel ("B6"), None si elle est vide ou hors de la zone lue.
+        """
+        row, col = coordinate_to_tuple(coordinate)
+        if row > len(self.rows) or col > len(self.rows[row - 1]):
+            return None
+        value = self.rows[row - 1][col - 1]
+        return None if value == "" else value
+
+    @classmethod
+    def _load_sheets(cls, file_path, sheet_names, max_row, max_col, bound=None, skip_sheets=0):
+        """
+        Lit les feuilles demandées (noms ou index ; None = toutes à partir de `skip_sheets`)
+        et retourne {nom_feuille: lignes}. `bound` = (columns, header_row, min_col) ou None.
+        Un classeur déjà analysé est repris du cache.
+        """
+        return workbook_cache.load(
+            file_path,
+            "Workbook",
+            lambda: cls._parse_sheets(file_path, sheet_names, max_row, max_col, bound, skip_sheets),
+            sheet_names=sheet_names,
+            max_row=max_row,
+            max_col=max_col,
+            bound=bound,
+            skip_sheets=skip_sheets,
+        )
+
+    @classmethod
+    def _parse_sheets(cls, file_path, sheet_names, max_row, max_col, bound, skip_sheets):
+        try:
+            book = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        except (InvalidFileException, zipfile.BadZipFile):
+            return cls._load_sheets_with_pandas(file_path, sheet_names, max_row, max_col, bound, skip_sheets)
+
+        try:
+            worksheets = book.worksheets
+            if sheet_names is None:
+                selected = worksheets[skip_sheets:]
+            else:
+                selected = [
+                    worksheets[name] if isinstance(name, int) else book[name]
+                    for name in sheet_names
+                ]
+
+            sheets = {}
+            for sheet in selected:
+                sheet.reset_dimensions()
+                sheets[sheet.title] = cls._trim_rows(
+                    sheet.iter_rows(max_row=max_row, max_col=max_col), cls._convert_cell, bound
+                )
+            return sheets
+        finally:
+            book.close()
+
+    @classmethod
+    def _load_sheets_with_pandas(cls, file_path, sheet_names, max_row, max_col, bound, skip_sheets):
+        """
+        Repli pour les formats non lus par openpyxl (.xls, .ods...) : lecture pandas puis recadrage.
+        """
+        # na_filter=False : les cellules vides restent "" comme dans la lecture interne de pandas
+        grids = pd.read_excel(
+            file_path, sheet_name=sheet_names, header=None, dtype=object, na_filter=False, nrows=max_row
+        )
+        names = list(grids.keys())
+        if sheet_names is None:
+            names = names[skip_sheets:]
+        return {
+            name: cls._trim_rows((row[:max_col] for row in grids[name].values.tolist()), bound=bound)
+            for name in names
+        }
+
+    @staticmethod
+    def _convert_cell(cell):
+        """
+        Conversion identique à celle de pandas (moteur openpyxl) : entiers exacts en int, vide en "".
+        """
+        if cell.value is None:
+            return ""
+        if cell.data_type == TYPE_ERROR:
+            return np.nan
+        if cell.data_type == TYPE_NUMERIC:
+            value = int(cell.value)
+            return value if value == cell.value else float(cell.value)
+        return cell.value
+
+    @classmethod
+    def _trim_rows(cls, rows, convert=None, bound=None):
+        """
+        Convertit les cellules (`convert`, valeurs déjà converties par défaut), supprime les cellules
+        vides en fin de ligne et les lignes vides en fin de feuille (comme pandas).
+
+        Avec `bound` = (columns, header_row, min_col), seules les colonnes jusqu'à la dernière dont
+        l'en-tête est dans `columns` sont converties. Une ligne qui a des valeurs au-delà garde toute
+        la largeur bornée, et une ligne qui n'a de valeurs qu'au-delà est gardée vide : les lignes
+        et les colonnes conservées sont exactement celles de la lecture complète.
+        """
+        convert = convert or (lambda value: value)
+        rows = iter(rows)
+        last_col = None
+        if bound is not None:
+            columns, header_row, min_col = bound
+            head = list(itertools.islice(rows, header_row + 1))
+            if len(head) > header_row:
+                last_col = cls._last_template_column([convert(cell) for cell in head[header_row]], columns, min_col)
+            rows = itertools.chain(head, rows)
+
+        trimmed = []
+        for row in rows:
+            if last_col is None:
+                values = [convert(cell) for cell in row]
+            else:
+                values = [convert(cell) for cell in row[:last_col]]
+                if any(convert(cell) != "" for cell in row[last_col:]):
+                    trimmed.append(values)
+                    continue
+            while values and values[-1] == "":
+                values.pop()
+            trimmed.append(values)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+        return trimmed
+
+    @staticmethod
+    def _last_template_column(header, columns, min_col):
+        """
+        Nombre de colonnes à lire : jusqu'à la dernière cellule d'en-tête dont le nom est dans `columns`
+        (au moins `min_col`). None si aucun en-tête ne correspond (autre modèle) : pas de borne.
+        """
+        names = set(columns)
+        matches = [index for index, value in enumerate(header) if str(value).strip() in names]
+        if not matches:
+            return None
+        return max(matches[-1] + 1, min_col or 0)
+
+    @staticmethod
+    def _pad_rows(rows):
+        """
+        Copie des lignes sans les lignes vides de fin, complétées à la même largeur (comme pandas).
+        """
+        end = len(rows)
+        while end and not rows[end - 1]:
+            end -= 1
+        width = max((len(row) for row in rows[:end]), default=0)
+        return [row + [""] * (width - len(row)) for row in rows[:end]]
+
+    def _rows_for(self, header, skiprows, nrows):
+        """
+        Copie des lignes à passer au parseur. Avec `nrows`, pandas ne lit que les lignes
+        nécessaires du fichier (et la largeur du tableau ne dépend que d'elles) : on reproduit ce découpage.
+        """
+        if nrows is None or not isinstance(header, (int, type(None))):
+            return self._pad_rows(self.rows)
+
+        needed = (1 if header is None else header + 1) + nrows
+        if isinstance(skiprows, int):
+            needed += skiprows
+        elif skiprows is not None:
+            is_skipped = skiprows if callable(skiprows) else set(skiprows).__contains__
+            kept, row_number = 0, 0
+            while kept < needed and row_number < len(self.rows):
+                if not is_skipped(row_number):
+                    kept += 1
+                row_number += 1
+            needed = row_number
+
+        return self._pad_rows(self.rows[:needed])
+
+    @staticmethod
+    def _convert_usecols(usecols):
+        """
+        Convertit une plage de colonnes Excel ("B:P", "A,C:E") en indices, comme `pd.read_excel`.
+        """
+        if not isinstance(usecols, str):
+            return usecols
+
+        indices = []
+        for part in usecols.upper().split(","):
+            if ":" in part:
+                start, end = part.split(":")
+                indices.extend(range(column_index_from_string(start.strip()) - 1,
+                                     column_index_from_string(end.strip())))
+            else:
+                indices.append(column_index_from_string(part.strip()) - 1)
+        return indices
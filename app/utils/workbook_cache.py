@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+import openpyxl
+import pandas as pd
+
+from .csv_editor import file_checksum
+
+# À incrémenter lorsque la conversion des cellules change (Workbook._convert_cell, _trim_rows...),
+# pour ne pas resservir des feuilles analysées par l'ancienne logique.
+# 2 : lignes conservées sans les cellules vides de fin (complétées à la lecture).
+WORKBOOK_CACHE_VERSION = 2
+
+_PARSER_VERSIONS = {"pandas": pd.__version__, "openpyxl": openpyxl.__version__}
+
+
+class WorkbookCache:
+    """
+    Cache des feuilles Excel analysées, indexé par (SHA-256 du classeur, lecteur, paramètres de lecture).
+
+    La lecture Excel (openpyxl / xlrd) est l'étape la plus coûteuse d'une extraction : une relance
+    sur le même classeur (paramètres CSV corrigés, mapping corrigé) reprend les feuilles déjà
+    analysées sans rouvrir le fichier. Chaque entrée est un fichier pickle (DataFrame ou lignes de
+    cellules) du dossier du cache ; l'éviction supprime les entrées les moins récemment utilisées
+    tant que la taille totale dépasse `max_bytes`.
+
+    Le cache est une optimisation : une entrée illisible est supprimée et le classeur relu,
+    une erreur d'écriture ne fait pas échouer l'extraction.
+    """
+
+    def __init__(self, directory, max_bytes, enabled=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._evict_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        WORKBOOK_CACHE_ENABLED (1/0), WORKBOOK_CACHE_DIR (data/workbook_cache),
+        WORKBOOK_CACHE_MAX_MB (200, 0 = pas d'éviction).
+        """
+        return cls(
+            directory=os.getenv("WORKBOOK_CACHE_DIR", os.path.join("data", "workbook_cache")),
+            max_bytes=int(os.getenv("WORKBOOK_CACHE_MAX_MB", "200")) * 1024 * 1024 or None,
+            enabled=os.getenv("WORKBOOK_CACHE_ENABLED", "1") not in ("0", "false", "False"),
+        )
+
+    @staticmethod
+    def make_key(file_sha256, reader, params):
+        payload = json.dumps(
+            {
+                "version": WORKBOOK_CACHE_VERSION,
+                "parsers": _PARSER_VERSIONS,
+                "file_sha256": file_sha256,
+                "reader": reader,
+                "params": params,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, file_path, reader, parse, **params):
+        """
+        Retourne `parse()` pour ce classeur, depuis le cache si la même lecture
+        (`reader` + `params`) a déjà été faite sur un fichier de même contenu.
+        """
+        if not self.enabled or not isinstance(file_path, (str, os.PathLike)):
+            return parse()
+
+        try:
+            cache_key = self.make_key(file_checksum(file_path), reader, params)
+        except OSError:
+            return parse()
+
+        entry_path = os.path.join(self.directory, f"{cache_key}.pkl")
+        cached = self._read(entry_path)
+        if cached is not None:
+            print(f"⚡ Classeur déjà analysé, lecture Excel évitée ({reader}) : {cache_key[:12]}")
+            return cached
+
+        value = parse()
+        self._write(entry_path, value)
+        return value
+
+    def read_excel(self, file_path, **kwargs):
+        """`pd.read_excel(file_path, **kwargs)` mis en cache."""
+        return self.load(file_path, "read_excel", lambda: pd.read_excel(file_path, **kwargs), **kwargs)
+
+    def _read(self, entry_path):
+        try:
+            with open(entry_path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"♻️ Entrée de cache illisible, classeur relu : {e}")
+            self._remove(entry_path)
+            return None
+
+        try:
+            # La date de modification sert d'ordre LRU à l'éviction
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return value
+
+    def _write(self, entry_path, value):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                self._remove(tmp_path)
+                raise
+            self.evict(keep=entry_path)
+        except Exception as e:
+            print(f"⚠️ Classeur analysé non mis en cache : {e}")
+
+    def evict(self, keep=None):
+        """
+        Supprime les entrées les moins récemment utilisées tant que la taille totale dépasse max_bytes.
+        L'entrée `keep` (celle qui vient d'être écrite) n'est jamais évincée.
+        """
+        if not self.enabled or self.max_bytes is None:
+            return 0
+
+        with self._evict_lock:
+            entries = []
+            try:
+                with os.scandir(self.directory) as scanner:
+                    for item in scanner:
+                        if item.name.endswith(".pkl"):
+                            stat = item.stat()
+                            entries.append((stat.st_mtime, stat.st_size, item.path))
+            except FileNotFoundError:
+                return 0
+
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+                    continue
+                self._remove(path)
+                total -= size
+                evicted += 1
+
+        if evicted:
+            print(f"🧹 {evicted} classeur(s) analysé(s) évincé(s) du cache")
+        return evicted
+
+    def clear(self):
+        """Supprime toutes les entrées du cache."""
+        try:
+            with os.scandir(self.directory) as scanner:
+                for item in scanner:
+                    if item.name.endswith((".pkl", ".tmp")):
+                        self._remove(item.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+workbook_cache = WorkbookCache.from_env()
@@ -0,0 +1,72 @@
+import os
+import zipfile
+
+ZIP_CHUNK_SIZE = 256 * 1024
+
+
+class _ChunkBuffer:
+    """
+    Flux d'écriture non positionnable pour zipfile : accumule les octets écrits,
+    récupérés par `drain()` au fil de la construction de l'archive.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(files, chunk_size=ZIP_CHUNK_SIZE, compresslevel=6):
+    """
+    Générateur des octets d'une archive ZIP (deflate) contenant `files`, produite à la volée :
+    ni l'archive ni les fichiers compressés ne sont construits sur disque ou en mémoire.
+
+    :param files: [(chemin sur disque, nom dans l'archive), ...]
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        for file_path, arcname in files:
+            info = zipfile.ZipInfo.from_file(file_path, arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(file_path, "rb") as source, archive.open(info, mode="w") as target:
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    target.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # Répertoire central, écrit à la fermeture de l'archive
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def bundle_entries(file_paths, base_dir):
+    """(chemin, nom dans l'archive relatif à `base_dir`) pour chaque fichier, sans doublon de nom."""
+    entries, names = [], set()
+    for file_path in file_paths:
+        arcname = os.path.relpath(file_path, start=base_dir).replace(os.sep, "/")
+        if arcname.startswith("../"):
+            arcname = os.path.basename(file_path)
+        if arcname in names:
+            continue
+        names.add(arcname)
+        entries.append((file_path, arcname))
+    return entries
@@ -0,0 +1,73 @@
+"""
+Compare deux résultats de benchmarks.run (ex. avant / après un commit) : durée, lignes/s et
+pic de mémoire par fournisseur et par taille.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.compare avant.json apres.json [--threshold 10]
+"""
+import argparse
+import json
+
+
+def load(file_path):
+    with open(file_path, encoding="utf-8") as file:
+        report = json.load(file)
+    return report, {(entry["fournisseur"], entry["rows"]): entry for entry in report["results"]}
+
+
+def _change(before, after):
+    """Variation en % (négative = plus rapide / plus léger)."""
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+
+def compare(before_path, after_path, threshold=10.0):
+    """
+    Affiche la comparaison ligne à ligne et retourne le nombre de régressions
+    (durée ou mémoire en hausse de plus de `threshold` %).
+    """
+    before_report, before = load(before_path)
+    after_report, after = load(after_path)
+    print(f"📊 {before_report.get('commit')} ({before_report.get('date')}) → "
+          f"{after_report.get('commit')} ({after_report.get('date')})")
+    print(f"{'Fournisseur':<32} {'Lignes':>8} {'Durée (s)':>21} {'Δ':>8} {'Mémoire (Mo)':>17} {'Δ':>8}")
+
+    regressions = 0
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        if "error" in old or "error" in new:
+            print(f"{key[0]:<32} {key[1]:>8,} ❌ {new.get('error') or old.get('error')}")
+            continue
+
+        wall = _change(old["wall_s"], new["wall_s"])
+        rss = _change(old["peak_rss_mb"], new["peak_rss_mb"])
+        flag = ""
+        if (wall or 0) > threshold or (rss or 0) > threshold:
+            regressions += 1
+            flag = " ⚠️"
+        elif (wall or 0) < -threshold:
+            flag = " ⚡"
+        print(f"{key[0]:<32} {key[1]:>8,} {old['wall_s']:>9.3f} → {new['wall_s']:>9.3f} {wall or 0:>+7.1f}% "
+              f"{old['peak_rss_mb']:>7.1f} → {new['peak_rss_mb']:>7.1f} {rss or 0:>+7.1f}%{flag}")
+
+    for key in sorted(before.keys() ^ after.keys()):
+        print(f"{key[0]:<32} {key[1]:>8,} (mesuré dans un seul des deux fichiers)")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="seuil de régression en %%")
+    args = parser.parse_args()
+
+    regressions = compare(args.before, args.after, args.threshold)
+    print(f"⚠️ {regressions} régression(s) au-delà de {args.threshold:g} %" if regressions else "✅ Pas de régression")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark de l'écriture CSV : ancien chemin (copie des clés + csv.DictWriter ligne par ligne)
+contre CSVManager.write_csv (liste de dictionnaires et DataFrame).
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.csv_writer [--rows 50000] [--repeat 3]
+"""
+import argparse
+import csv
+import filecmp
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.utils.csv_manager import CSVManager
+
+FIELDS = [
+    "Exporter Ref", "Container n°", "Pallet n°", "Variety", "Caliber", "Nb of boxes", "Net weight",
+    "Gross weight", "Nb of pallets", "Box tare", "Packaging type", "ETA", "ETD", "Vessel", "Certifications",
+]
+
+
+def build_records(nb_rows):
+    """Génère des lignes représentatives d'un export (chaînes, nombres, valeurs vides)."""
+    records = []
+    for i in range(nb_rows):
+        records.append({
+            "Exporter Ref ": f"REF{i // 500:05d}",
+            "Container n°": f"MSKU{i // 500:07d}",
+            "Pallet n°": f"P{i // 20:06d}",
+            "Variety": "Hass" if i % 3 else "Fuerte; bio",
+            "Caliber": 12 + i % 10,
+            "Nb of boxes": 80 + i % 40,
+            "Net weight": 4.0,
+            "Gross weight": 4.6 + (i % 7) / 10,
+            "Nb of pallets": f"{(i % 20 + 1) / 20:.5f}".replace(".", ","),
+            "Box tare": 0.6,
+            "Packaging type": "4KG",
+            "ETA": "12/03/2025",
+            "ETD": "",
+            "Vessel": None,
+            "Certifications": 'GlobalG.A.P "GGN"',
+        })
+    return records
+
+
+def legacy_write_csv(file_path, data):
+    """Chemin d'origine : copie de chaque ligne pour nettoyer les clés, puis DictWriter."""
+    clean = [{k.strip(): v for k, v in row.items()} for row in data]
+    with open(file_path, mode="w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.DictWriter(file, fieldnames=clean[0].keys(), delimiter=";")
+        writer.writeheader()
+        writer.writerows(clean)
+
+
+def measure(label, func, data, path, nb_rows, repeat):
+    best = min(_timed(func, path, data) for _ in range(repeat))
+    print(f"{label:<32} {best:8.3f} s   {nb_rows / best:12,.0f} lignes/s")
+    return best
+
+
+def _timed(func, path, data):
+    start = time.perf_counter()
+    func(path, data)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = build_records(args.rows)
+    frame = pd.DataFrame(records)
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "legacy.csv")
+        records_path = os.path.join(directory, "records.csv")
+        frame_path = os.path.join(directory, "frame.csv")
+
+        print(f"📊 {args.rows:,} lignes × {len(FIELDS)} colonnes, meilleur de {args.repeat}")
+        legacy = measure("DictWriter (ancien)", legacy_write_csv, records, legacy_path, args.rows, args.repeat)
+        new = measure("CSVManager (liste de dicts)", CSVManager.write_csv, records, records_path, args.rows, args.repeat)
+        new_frame = measure("CSVManager (DataFrame)", CSVManager.write_csv, frame, frame_path, args.rows, args.repeat)
+        print(f"⚡ Gain : x{legacy / new:.2f} (dicts), x{legacy / new_frame:.2f} (DataFrame)")
+
+        identical = all(filecmp.cmp(legacy_path, path, shallow=False) for path in (records_path, frame_path))
+        print("✅ Sorties identiques octet pour octet" if identical else "❌ Les sorties diffèrent")
+
+
+if __name__ == "__main__":
+    main()
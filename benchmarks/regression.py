@@ -0,0 +1,176 @@
+"""
+Non-régression des CSV ERP sur les packing lists réels d'archives/ : chaque classeur du corpus
+(benchmarks/golden/manifest.json) est traité par son service fournisseur, puis les CSV produits
+sont comparés cellule par cellule aux fichiers de référence (benchmarks/golden/), avec la durée
+de chaque extraction.
+
+Les colonnes "volatiles" d'un cas (ex. ETA à la date du jour chez Ingophase et Viru)
+ne sont pas comparées. Le cache des classeurs analysés est désactivé : la lecture Excel
+fait partie de ce qui est vérifié.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.regression                  # compare aux références
+    python -m benchmarks.regression --record         # régénère les références (après un changement voulu)
+    python -m benchmarks.regression --case VIRU.xlsx --max-diffs 50
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVES_DIR = os.path.join(ROOT_DIR, "archives")
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+MANIFEST_PATH = os.path.join(GOLDEN_DIR, "manifest.json")
+
+
+def load_manifest(path=MANIFEST_PATH):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def case_dir(base_dir, case):
+    """Dossier des CSV d'un cas : <base>/<classeur sans extension>/<fournisseur>/."""
+    return os.path.join(base_dir, os.path.splitext(case["archive"])[0], case["fournisseur"])
+
+
+def read_csv(file_path):
+    with open(file_path, newline="", encoding="utf-8-sig") as file:
+        return list(csv.reader(file, delimiter=";"))
+
+
+def diff_csv(expected_path, actual_path, ignored_columns=()):
+    """
+    Compare deux CSV cellule par cellule. Retourne la liste des différences
+    (ligne 1 = en-tête, colonne désignée par son nom).
+    """
+    expected, actual = read_csv(expected_path), read_csv(actual_path)
+    if not expected or not actual:
+        return [] if expected == actual else [{"row": 1, "column": None, "expected": len(expected), "actual": len(actual)}]
+
+    header = expected[0]
+    if actual[0] != header:
+        return [{"row": 1, "column": None, "expected": header, "actual": actual[0]}]
+
+    differences = []
+    if len(expected) != len(actual):
+        differences.append({"row": None, "column": None, "expected": f"{len(expected) - 1} lignes",
+                            "actual": f"{len(actual) - 1} lignes"})
+
+    compared = [index for index, name in enumerate(header) if name not in ignored_columns]
+    for number, (expected_row, actual_row) in enumerate(zip(expected[1:], actual[1:]), start=2):
+        if expected_row == actual_row:
+            continue
+        if len(expected_row) != len(actual_row):
+            differences.append({"row": number, "column": None, "expected": expected_row, "actual": actual_row})
+            continue
+        for index in compared:
+            if expected_row[index] != actual_row[index]:
+                differences.append({"row": number, "column": header[index],
+                                    "expected": expected_row[index], "actual": actual_row[index]})
+    return differences
+
+
+def run_case(case, output_dir, settings):
+    """Traite le classeur du cas avec son service ; retourne (durée en s, CSV produits)."""
+    from app.routers.root_app import FOURNISSEURS_SUPPORTES, run_extraction
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        FOURNISSEURS_SUPPORTES.get(case["fournisseur"])
+
+        start = time.perf_counter()
+        files = run_extraction(case["fournisseur"], os.path.join(ARCHIVES_DIR, case["archive"]),
+                               output_dir, settings) or []
+        duration = time.perf_counter() - start
+    return duration, files
+
+
+def compare_case(case, files, max_diffs):
+    """Compare les CSV produits aux références du cas ; retourne la liste des problèmes (texte)."""
+    golden = case_dir(GOLDEN_DIR, case)
+    expected_names = sorted(os.listdir(golden)) if os.path.isdir(golden) else []
+    actual = {os.path.basename(path): path for path in files}
+
+    problems = [f"CSV manquant : {name}" for name in expected_names if name not in actual]
+    problems += [f"CSV inattendu : {name}" for name in sorted(actual) if name not in expected_names]
+
+    for name in expected_names:
+        if name not in actual:
+            continue
+        differences = diff_csv(os.path.join(golden, name), actual[name], case.get("volatile_columns", ()))
+        for difference in differences[:max_diffs]:
+            location = f"ligne {difference['row']}" if difference["row"] else "taille"
+            if difference["column"]:
+                location += f", {difference['column']!r}"
+            problems.append(f"{name} ({location}) : attendu {difference['expected']!r}, obtenu {difference['actual']!r}")
+        if len(differences) > max_diffs:
+            problems.append(f"{name} : ... {len(differences) - max_diffs} autres différences")
+    return problems
+
+
+def record_case(case, files):
+    """Remplace les références du cas par les CSV produits."""
+    golden = case_dir(GOLDEN_DIR, case)
+    shutil.rmtree(golden, ignore_errors=True)
+    os.makedirs(golden)
+    for path in files:
+        shutil.copyfile(path, os.path.join(golden, os.path.basename(path)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="régénère les références au lieu de comparer")
+    parser.add_argument("--case", nargs="+", help="classeurs (ou fournisseurs) à traiter uniquement")
+    parser.add_argument("--max-diffs", type=int, default=10, help="différences affichées par CSV")
+    parser.add_argument("--output", help="écrit les durées et résultats en JSON")
+    args = parser.parse_args()
+
+    # Avant l'import des services (workbook_cache est configuré à l'import)
+    os.environ["WORKBOOK_CACHE_ENABLED"] = "0"
+    manifest = load_manifest()
+    cases = [
+        case for case in manifest["cases"]
+        if not args.case or case["archive"] in args.case or case["fournisseur"] in args.case
+    ]
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for case in cases:
+            label = f"{case['archive']} → {case['fournisseur']}"
+            try:
+                duration, files = run_case(case, case_dir(work_dir, case), manifest["settings"])
+            except Exception as e:
+                print(f"❌ {label} : {type(e).__name__}: {e}")
+                results.append({**case, "status": "error", "problems": [str(e)]})
+                continue
+
+            if args.record:
+                record_case(case, files)
+                print(f"📝 {label:<70} {duration:8.3f} s  {len(files)} CSV enregistré(s)")
+                results.append({**case, "status": "recorded", "duration_s": round(duration, 4)})
+                continue
+
+            problems = compare_case(case, files, args.max_diffs)
+            status = "failed" if problems else "ok"
+            print(f"{'❌' if problems else '✅'} {label:<70} {duration:8.3f} s  {len(files)} CSV")
+            for problem in problems:
+                print(f"     {problem}")
+            results.append({**case, "status": status, "duration_s": round(duration, 4), "problems": problems})
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"results": results}, file, indent=2, ensure_ascii=False)
+
+    failed = [result for result in results if result["status"] in ("failed", "error")]
+    total = sum(result.get("duration_s", 0) for result in results)
+    print(f"{'❌' if failed else '✅'} {len(results) - len(failed)}/{len(results)} cas conformes, {total:.2f} s d'extraction")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark de bout en bout des services fournisseurs sur des packing lists synthétiques
+(benchmarks.workbooks) : pour chaque service de FOURNISSEURS_SUPPORTES et chaque taille,
+extraction complète (run_extraction : lecture Excel → CSV) dans un process neuf.
+
+Mesures : durée de l'extraction (meilleure des --repeat), pic de mémoire (RSS) du process,
+lignes/s. Le résultat est écrit en JSON, à comparer entre deux commits avec benchmarks.compare.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.run [--rows 10 1000 10000] [--suppliers Sunny Kakuzi] [--output results.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DEFAULT_ROWS = [10, 1000, 10000]
+SETTINGS = {"country_of_origin": "ZA", "forwarder": "BENCHMARK", "importer": "BENCHMARK", "archive": "Non"}
+
+
+def peak_rss_mb():
+    """Pic de RSS du process courant (ru_maxrss : Ko sous Linux, octets sous macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_once(fournisseur, file_path, output_dir):
+    """
+    Extraction dans le process courant (appelé dans un process neuf par `measure`).
+    Retourne la durée, le pic de mémoire, le nombre de fichiers et de lignes CSV produits.
+    L'import du service (pandas, openpyxl...) n'est pas compté dans la durée.
+    """
+    from app.routers.root_app import FOURNISSEURS_SUPPORTES, run_extraction
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        FOURNISSEURS_SUPPORTES.get(fournisseur)
+
+        start = time.perf_counter()
+        files = run_extraction(fournisseur, file_path, output_dir, SETTINGS) or []
+        wall = time.perf_counter() - start
+
+    csv_rows = 0
+    for csv_path in files:
+        with open(csv_path, encoding="utf-8-sig") as file:
+            csv_rows += sum(1 for _ in file) - 1
+
+    return {"wall_s": wall, "peak_rss_mb": peak_rss_mb(), "csv_files": len(files), "csv_rows": csv_rows}
+
+
+def measure(fournisseur, file_path, output_dir, workbook_cache=False):
+    """
+    Lance `run_once` dans un process neuf : imports et pic de mémoire propres à chaque mesure.
+    Le cache des classeurs analysés est désactivé sauf demande : la lecture Excel est mesurée.
+    """
+    shutil.rmtree(output_dir, ignore_errors=True)
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--child", fournisseur, file_path, output_dir],
+        capture_output=True, text=True,
+        env={**os.environ, "WORKBOOK_CACHE_ENABLED": "1" if workbook_cache else "0"},
+    )
+    if completed.returncode != 0:
+        error = (completed.stderr.strip().splitlines() or ["?"])[-1]
+        return {"error": error}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def services_to_run(registry, suppliers=None):
+    """
+    (fournisseur, classe de service) à mesurer : les fournisseurs demandés, sinon le premier
+    fournisseur de chaque service (Komati, Grosa... partagent SFAService : une seule mesure).
+    """
+    if suppliers:
+        return [(fournisseur, registry[fournisseur]) for fournisseur in suppliers]
+
+    selected = {}
+    for fournisseur in registry.keys():
+        selected.setdefault(registry[fournisseur], fournisseur)
+    return [(fournisseur, service_class) for service_class, fournisseur in selected.items()]
+
+
+def git_commit():
+    completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    return completed.stdout.strip() or None
+
+
+def run_benchmarks(sizes, suppliers=None, repeat=1, workdir=None, workbook_cache=False):
+    import pandas as pd
+
+    from app.routers.root_app import FOURNISSEURS_SUPPORTES
+    from .workbooks import workbook_for
+
+    workdir = workdir or os.path.join(tempfile.gettempdir(), "packing_list_benchmarks")
+    results = []
+
+    for fournisseur, service_class in services_to_run(FOURNISSEURS_SUPPORTES, suppliers):
+        for nb_rows in sizes:
+            file_path = workbook_for(service_class, nb_rows, os.path.join(workdir, "workbooks"))
+            output_dir = os.path.join(workdir, "outputs", service_class.__name__)
+            runs = [measure(fournisseur, file_path, output_dir, workbook_cache) for _ in range(repeat)]
+
+            entry = {"fournisseur": fournisseur, "service": service_class.__name__, "rows": nb_rows}
+            errors = [run["error"] for run in runs if "error" in run]
+            if errors:
+                entry["error"] = errors[0]
+                print(f"❌ {fournisseur:<32} {nb_rows:>8,} lignes : {errors[0]}")
+            else:
+                best = min(runs, key=lambda run: run["wall_s"])
+                entry.update({
+                    "wall_s": round(best["wall_s"], 4),
+                    "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+                    "rows_per_s": round(nb_rows / best["wall_s"], 1),
+                    "csv_files": best["csv_files"],
+                    "csv_rows": best["csv_rows"],
+                })
+                print(f"⏱️ {fournisseur:<32} {nb_rows:>8,} lignes {entry['wall_s']:>9.3f} s "
+                      f"{entry['rows_per_s']:>12,.0f} lignes/s {entry['peak_rss_mb']:>8.1f} Mo")
+            results.append(entry)
+
+    return {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "workbook_cache": workbook_cache,
+        "results": results,
+    }
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        print(json.dumps(run_once(*sys.argv[2:])))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="tailles (lignes du tableau)")
+    parser.add_argument("--suppliers", nargs="+", help="fournisseurs à mesurer (défaut : un par service)")
+    parser.add_argument("--repeat", type=int, default=1, help="mesures par taille (la meilleure est gardée)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--workdir", help="dossier des classeurs générés (réutilisés d'un lancement à l'autre)")
+    parser.add_argument("--workbook-cache", action="store_true",
+                        help="active le cache des classeurs analysés (mesure des relances)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.rows, args.suppliers, args.repeat, args.workdir, args.workbook_cache)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"✅ Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Packing lists synthétiques pour les benchmarks : un classeur .xlsx par modèle fournisseur
+(feuille "Data" SFA/Safpro, matrice palettes × calibres Kakuzi, en-tête en ligne 15 Viru,
+tableau B:P Shalimar, feuille "Manifest" CPF en-tête ligne 3...), de 10 à 100 000 lignes.
+
+Les colonnes du tableau sont celles attendues par le service (`pl_column_mapping`), remplies
+de valeurs plausibles et déterministes : 4 lignes (calibres) par palette, un container
+toutes les ROWS_PER_CONTAINER lignes. Le nombre de lignes demandé est celui du tableau
+du packing list (une ligne par palette et calibre), quel que soit le modèle.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.workbooks Kakuzi --rows 1000 --output kakuzi.xlsx
+"""
+import argparse
+import math
+import os
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+from openpyxl.utils import column_index_from_string
+
+
+ROWS_PER_PALLET = 4
+ROWS_PER_CONTAINER = 2000
+SIZES = (12, 14, 16, 18, 20, 22, 24, 26)
+BOX_WEIGHT = 4.0
+BOXES_PER_ROW = 60
+PACKING_DATE = datetime(2025, 3, 1)
+
+# Colonnes supplémentaires lues par les df_managers / calculs, absentes du mapping
+EXTRA_COLUMNS = {
+    "AlgService": ["Gross Weight"],
+    "AthosService": ["Size", "Cat"],
+    "AsicaService": ["Quantity per grower"],
+    "LaranService": ["Quantity per grower"],
+}
+
+# Kakuzi : une feuille (container) de KAKUZI_PALLETS palettes × KAKUZI_SIZES calibres,
+# le numéro de plomb en B43 sous la dernière palette
+KAKUZI_PALLETS = 25
+KAKUZI_SIZES = SIZES
+KAKUZI_FIRST_ROW = 18
+
+
+def container_number(index):
+    return f"MSCU{1000000 + index:07d}"
+
+
+def pallet_number(row):
+    return 100000 + row // ROWS_PER_PALLET
+
+
+def column_value(column, row, container=0):
+    """
+    Valeur plausible de `column` pour la ligne `row` du tableau, d'après le nom de la colonne.
+    Les tests sont faits dans l'ordre : les plus spécifiques d'abord.
+    """
+    name = " ".join(str(column).lower().split())
+
+    if "container" in name:
+        return container_number(container)
+    if name in ("nb of pallets", "pallet size", "pltqty", "plts", "pallets"):
+        return 1 / ROWS_PER_PALLET
+    if "tare" in name:
+        return 0.5
+    if "ggn" in name or "global gap" in name or "globalgap" in name:
+        return "4052852000123"
+    if "fruits" in name:
+        return SIZES[row % ROWS_PER_PALLET]
+    if "eta" in name or ("arrival" in name and ("date" in name or "time" in name)):
+        return PACKING_DATE + timedelta(days=30)
+    if "etd" in name or "date" in name or "day" in name or "departure (" in name:
+        return PACKING_DATE
+    if "per box" in name or "weight box" in name or name in ("unit_nett", "weight (kg)", "weight per box"):
+        return BOX_WEIGHT
+    if "weight" in name or "weigt" in name or "nett" in name or name == "mass":
+        return BOX_WEIGHT * BOXES_PER_ROW
+    if any(word in name for word in ("carton", "boxes", "cases", "ctn", "quantity", "peices")):
+        return BOXES_PER_ROW
+    if "pallet" in name or name in ("barcode", "palletid", "pallet_id"):
+        return pallet_number(row)
+    if "size" in name or "count" in name or "caliber" in name:
+        return SIZES[row % ROWS_PER_PALLET]
+    if name in ("class", "cat", "category", "grade", "grade code", "quality"):
+        return "I"
+    if "var" in name:
+        return "HASS"
+    if any(word in name for word in ("product", "commodity", "species", "comm", "fruit")):
+        return "AV"
+    if "ref" in name or "invoice" in name or "voyage" in name or "load_ref" in name:
+        return f"EXP{container + 1:05d}"
+    if "seal" in name or "tracabilidad" in name:
+        return f"SL{container + 1:06d}"
+    return f"{str(column).strip()[:12]} {row % 3}"
+
+
+def table_columns(service_class):
+    """
+    Colonnes Excel du tableau : candidates du mapping (dans l'ordre) puis colonnes supplémentaires.
+    Le mapping est lu sur une instance du service, pour que les classeurs se génèrent à l'identique
+    sur les anciennes révisions (comparaisons avant/après avec benchmarks.run).
+    """
+    columns = []
+    for excel_columns in service_class().pl_column_mapping.values():
+        for column in excel_columns:
+            if column and column not in columns:
+                columns.append(column)
+    for column in EXTRA_COLUMNS.get(service_class.__name__, []):
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def table_rows(columns, nb_rows, first_row=0, container=None):
+    """Lignes du tableau ; sans `container`, un nouveau container toutes les ROWS_PER_CONTAINER lignes."""
+    for row in range(first_row, first_row + nb_rows):
+        current = container if container is not None else row // ROWS_PER_CONTAINER
+        yield [column_value(column, row, current) for column in columns]
+
+
+def _cells_row(cells, width=None):
+    """{"B": valeur, "D": valeur} → ligne de feuille ([None, valeur, None, valeur])."""
+    indexes = {column_index_from_string(letter): value for letter, value in cells.items()}
+    row = [None] * max(width or 0, max(indexes, default=0))
+    for index, value in indexes.items():
+        row[index - 1] = value
+    return row
+
+
+def _metadata_rows(cells, nb_rows, width=None):
+    """{"B8": valeur, ...} → nb_rows lignes de feuille (cellules de métadonnées au-dessus du tableau)."""
+    by_row = {}
+    for coordinate, value in cells.items():
+        letters = coordinate.rstrip("0123456789")
+        by_row.setdefault(int(coordinate[len(letters):]), {})[letters] = value
+    return [_cells_row(by_row.get(number, {}), width) for number in range(1, nb_rows + 1)]
+
+
+# --- Modèles -----------------------------------------------------------------------------------
+
+def _simple_table(sheet="Sheet1", header_row=1, leading_sheets=0):
+    """Tableau classique : en-tête en `header_row`, précédé de lignes vides et de feuilles vides."""
+
+    def build(workbook, service_class, nb_rows):
+        for index in range(leading_sheets):
+            workbook.create_sheet(f"Summary{index + 1}").append(["Summary"])
+        worksheet = workbook.create_sheet(sheet)
+        columns = table_columns(service_class)
+        for _ in range(header_row - 1):
+            worksheet.append([])
+        worksheet.append(columns)
+        for row in table_rows(columns, nb_rows):
+            worksheet.append(row)
+
+    return build
+
+
+def _sheet_per_container(workbook, service_class, nb_rows):
+    """Sasini : une feuille par container, tableau avec en-tête en ligne 1."""
+    columns = table_columns(service_class)
+    for container in range(math.ceil(nb_rows / ROWS_PER_CONTAINER)):
+        first_row = container * ROWS_PER_CONTAINER
+        worksheet = workbook.create_sheet(container_number(container))
+        worksheet.append(columns)
+        for row in table_rows(columns, min(ROWS_PER_CONTAINER, nb_rows - first_row), first_row, container):
+            worksheet.append(row)
+
+
+def _kakuzi_matrix(workbook, service_class, nb_rows):
+    """
+    Kakuzi : feuille de garde puis une feuille par container. Métadonnées en B8 (container),
+    B9 (référence), B10 ("Vessel: ..."), B11 (GGN), D4, D7, D10 ; calibres en ligne 16 à partir
+    de C, poids ("4 Kgs") en ligne 17, colonne "Crtn" / "Type" pour la marque,
+    palettes à partir de la ligne 18 (n° en B, nombre de cartons par calibre).
+    """
+    workbook.create_sheet("Summary").append(["Summary"])
+    sizes_per_sheet = KAKUZI_PALLETS * len(KAKUZI_SIZES)
+
+    for container in range(math.ceil(nb_rows / sizes_per_sheet)):
+        remaining = nb_rows - container * sizes_per_sheet
+        nb_pallets = min(KAKUZI_PALLETS, math.ceil(remaining / len(KAKUZI_SIZES)))
+
+        metadata = _metadata_rows({
+            "D4": "ROTTERDAM",
+            "D7": PACKING_DATE,
+            "B8": container_number(container),
+            "B9": f"EXP{container + 1:05d}",
+            "B10": "(Vessel: MSC SYNTHETIC)",
+            "D10": PACKING_DATE + timedelta(days=30),
+            "B11": "4052852000123",
+        }, KAKUZI_FIRST_ROW - 3)
+        metadata.append([None, "Pallet", *[f"{size}'s" for size in KAKUZI_SIZES], "Crtn"])
+        metadata.append([None, None, *[f"{BOX_WEIGHT:g} Kgs" for _ in KAKUZI_SIZES], "Type"])
+
+        worksheet = workbook.create_sheet(f"Container {container + 1}")
+        for row in metadata:
+            worksheet.append(row)
+
+        for pallet in range(nb_pallets):
+            first_cell = container * sizes_per_sheet + pallet * len(KAKUZI_SIZES)
+            boxes = [
+                str(BOXES_PER_ROW) if first_cell + position < nb_rows else None
+                for position in range(len(KAKUZI_SIZES))
+            ]
+            worksheet.append([None, str(100000 + container * KAKUZI_PALLETS + pallet), *boxes, "BRAND"])
+
+        for _ in range(KAKUZI_FIRST_ROW + nb_pallets, 43):
+            worksheet.append([])
+        worksheet.append([None, f"SL{container + 1:06d}"])
+
+
+def _viru(workbook, service_class, nb_rows):
+    """Viru : métadonnées en B4:B11, E6, E7 ; en-tête en ligne 15, ligne 16 ignorée, données en ligne 17."""
+    worksheet = workbook.create_sheet("Packing List")
+    for row in _metadata_rows({
+        "B4": "VIRU S.A.", "B5": "EXP00001", "B6": container_number(0), "B8": "MSC",
+        "B9": "MSC SYNTHETIC", "B10": "PAITA", "B11": "ROTTERDAM",
+        "E6": PACKING_DATE, "E7": PACKING_DATE + timedelta(days=30),
+    }, 14):
+        worksheet.append(row)
+    columns = table_columns(service_class)
+    worksheet.append(columns)
+    worksheet.append(["(unit)" for _ in columns])
+    for row in table_rows(columns, nb_rows, container=0):
+        worksheet.append(row)
+
+
+def _athosv2(workbook, service_class, nb_rows):
+    """Athos V2 : métadonnées en D7, D10, D13, D15, D16, référence dans B1:P3 ; en-tête en ligne 19."""
+    worksheet = workbook.create_sheet("Packing List")
+    for row in _metadata_rows({
+        "B2": "PACKING LIST N° 00001", "D7": "EXPORTADORA FRUTICOLA ATHOS", "D10": "MSC",
+        "D13": container_number(0), "D15": PACKING_DATE, "D16": PACKING_DATE + timedelta(days=30),
+    }, 18):
+        worksheet.append(row)
+    columns = table_columns(service_class)
+    worksheet.append(columns)
+    for row in table_rows(columns, nb_rows, container=0):
+        worksheet.append(row)
+
+
+def _mavuno(workbook, service_class, nb_rows):
+    """Mavuno : métadonnées en B1, B3, B5:B7, K5:K6, N5:N6 ; en-tête en ligne 10."""
+    worksheet = workbook.create_sheet("Sheet1")
+    for row in _metadata_rows({
+        "B1": "MAVUNO", "B3": "EXP00001", "B5": "SL000001", "B6": "4052852000123", "B7": "COC0001",
+        "K5": "MOMBASA", "K6": "ROTTERDAM", "N5": "ETD: 01/03/2025", "N6": "ETA: 31/03/2025",
+    }, 9):
+        worksheet.append(row)
+    columns = table_columns(service_class)
+    worksheet.append(columns)
+    for row in table_rows(columns, nb_rows):
+        worksheet.append(row)
+
+
+# Colonnes B:P du tableau Shalimar (E et O vides)
+SHALIMAR_COLUMNS = [
+    "Pallet Number", "Product", "Variety", None, "Brand", "Size/Caliber", "Weight per box",
+    "Boxes per pallet", "Net weight", "Gross weight", "Packing date", "GGN", "GAP validity date",
+    None, "Track&Trace Code",
+]
+
+
+def _shalimar(workbook, service_class, nb_rows):
+    """Shalimar : métadonnées en C4:K5, C6, F6:G6 (B/L), C8 ; tableau B:P avec en-tête en ligne 16."""
+    worksheet = workbook.create_sheet("Packing List")
+    for row in _metadata_rows({
+        "C4": "MSC SYNTHETIC", "G4": PACKING_DATE, "K4": PACKING_DATE + timedelta(days=30),
+        "G5": "MUMBAI", "K5": "ROTTERDAM",
+        "C6": container_number(0), "F6": "B/L No", "G6": "EXP00001", "C8": "SL000001",
+    }, 15):
+        worksheet.append(row)
+    worksheet.append([None, *SHALIMAR_COLUMNS])
+    for row in range(nb_rows):
+        worksheet.append([None, *(column_value(column, row, 0) if column else None for column in SHALIMAR_COLUMNS)])
+
+
+# Colonnes A:Q du tableau Langplaas (lu sans en-tête à partir de la ligne 28)
+LANGPLAAS_COLUMNS = [
+    "Pallet Number", "GGN", "PUC", "Orch.", "Comm.", "Var.", "Class", "Count", "Brand", "Inventory",
+    "TM", "Packing", "Ctns.", "Pallets", "Actual Gross Weight", "Actual Nett Weight", "Temptale No.",
+]
+
+
+def _langplaas(workbook, service_class, nb_rows):
+    """Langplaas : métadonnées en O23, AK23:AK25, BB23:BB24, BV23 ; tableau sans en-tête à partir de la ligne 28."""
+    worksheet = workbook.create_sheet("Sheet1")
+    for row in _metadata_rows({
+        "O23": "MSC SYNTHETIC", "AK23": "CAPE TOWN", "AK24": "ROTTERDAM", "AK25": container_number(0),
+        "BB23": PACKING_DATE + timedelta(days=30), "BB24": PACKING_DATE, "BV23": "SL000001",
+    }, 26):
+        worksheet.append(row)
+    worksheet.append(LANGPLAAS_COLUMNS)
+    for row in table_rows(LANGPLAAS_COLUMNS, nb_rows, container=0):
+        worksheet.append(row)
+
+
+LAYOUTS = {
+    "SFAService": _simple_table(sheet="Data"),
+    "SafproService": _simple_table(sheet="Data"),
+    "AlgService": _simple_table(sheet="Sheet1"),
+    "AngonService": _simple_table(sheet="Sheet1"),
+    "CpfService": _simple_table(sheet="Manifest", header_row=3),
+    "UnifruittiService": _simple_table(sheet="Packing Data", header_row=14),
+    "HnpService": _simple_table(leading_sheets=1),
+    "SasiniService": _sheet_per_container,
+    "KakuziService": _kakuzi_matrix,
+    "ViruService": _viru,
+    "AthosV2Service": _athosv2,
+    "MavunoService": _mavuno,
+    "ShalimarService": _shalimar,
+    "LangplaasService": _langplaas,
+}
+
+
+def generate(service_class, nb_rows, file_path):
+    """Écrit le packing list synthétique de `service_class` (nb_rows lignes) dans `file_path`."""
+    workbook = Workbook(write_only=True)
+    LAYOUTS.get(service_class.__name__, _simple_table())(workbook, service_class, nb_rows)
+    workbook.save(file_path)
+    return file_path
+
+
+def workbook_for(service_class, nb_rows, directory):
+    """Chemin du classeur de `service_class` à nb_rows lignes dans `directory`, généré au premier appel."""
+    file_path = os.path.join(directory, f"{service_class.__name__}_{nb_rows}.xlsx")
+    if not os.path.exists(file_path):
+        os.makedirs(directory, exist_ok=True)
+        generate(service_class, nb_rows, file_path)
+    return file_path
+
+
+def main():
+    from app.routers.root_app import FOURNISSEURS_SUPPORTES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fournisseur", choices=sorted(FOURNISSEURS_SUPPORTES.keys()))
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    generate(FOURNISSEURS_SUPPORTES[args.fournisseur], args.rows, args.output)
+    print(f"✅ {args.output} : {args.rows:,} lignes")
+
+
+if __name__ == "__main__":
+    main()